@@ -0,0 +1,146 @@
+"""
+Synthetic Corpus - Deterministic generated data at multiples of production size
+"""
+
+import random
+from typing import Dict, List
+
+# Production sizes the scales are relative to
+PRODUCTION_VERSES = 700
+PRODUCTION_CHAPTERS = 18
+PRODUCTION_SCENARIOS = 1200
+
+WORDS = (
+    "duty action fruit mind self wisdom devotion karma yoga peace desire anger "
+    "attachment knowledge detachment steady discipline surrender heart practice "
+    "work family career stress friend decision balance purpose truth calm focus"
+).split()
+
+# Characters the validators look for, mixed into a small share of texts
+NOISE = ['‘', '’', '“', '”', '​', '﻿', '\\', '́', '—']
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    sentence = ' '.join(words).capitalize()
+    if rng.random() < 0.05:
+        position = rng.randint(0, len(sentence))
+        sentence = sentence[:position] + rng.choice(NOISE) + sentence[position:]
+    return sentence + '.'
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return ' '.join(_sentence(rng, 6, 18) for _ in range(sentences))
+
+
+def make_verses(count: int, seed: int = 1) -> List[Dict]:
+    """Verse rows shaped like gita_verses."""
+    rng = random.Random(seed)
+    chapters = max(1, round(PRODUCTION_CHAPTERS * count / PRODUCTION_VERSES))
+    return [
+        {
+            'gv_chapter_id': idx % chapters + 1,
+            'gv_verses_id': idx // chapters + 1,
+            'gv_verses': _paragraph(rng, rng.randint(1, 4))
+        }
+        for idx in range(count)
+    ]
+
+
+def make_chapters(count: int, seed: int = 2) -> List[Dict]:
+    """Chapter rows shaped like chapters."""
+    rng = random.Random(seed)
+    return [
+        {
+            'ch_chapter_id': idx + 1,
+            'ch_title': _sentence(rng, 2, 5),
+            'ch_subtitle': _sentence(rng, 3, 8),
+            'ch_summary': _paragraph(rng, rng.randint(5, 20)),
+            'ch_theme': _sentence(rng, 2, 6),
+            'ch_key_teachings': [_sentence(rng, 4, 10) for _ in range(rng.randint(2, 8))]
+        }
+        for idx in range(count)
+    ]
+
+
+def _action_steps(rng: random.Random) -> List[str]:
+    steps = []
+    for _ in range(rng.randint(3, 7)):
+        roll = rng.random()
+        if roll < 0.05:
+            # Fragmented list, as produced by bad array splitting
+            steps.extend([f"Talk to someone you trust (a {rng.choice(WORDS)}", 'mentor', 'etc.)'])
+        elif roll < 0.15:
+            steps.append(f"Take time to {rng.choice(WORDS)} your {rng.choice(WORDS)}, "
+                         "ensuring you understand the full context and implications")
+        else:
+            steps.append(_sentence(rng, 5, 16))
+    return steps
+
+
+def make_scenarios(count: int, seed: int = 3) -> List[Dict]:
+    """Scenario rows shaped like scenarios."""
+    rng = random.Random(seed)
+    return [
+        {
+            'id': f'00000000-0000-0000-0000-{idx:012d}',
+            'scenario_id': idx + 1,
+            'sc_title': _sentence(rng, 3, 8),
+            'sc_description': _paragraph(rng, rng.randint(2, 5)),
+            'sc_heart_response': _paragraph(rng, rng.randint(1, 3)),
+            'sc_duty_response': _paragraph(rng, rng.randint(1, 3)),
+            'sc_gita_wisdom': _paragraph(rng, rng.randint(1, 3)) + (' etc' if rng.random() < 0.03 else ''),
+            'sc_action_steps': _action_steps(rng)
+        }
+        for idx in range(count)
+    ]
+
+
+def make_verse_results(verses: List[Dict], seed: int = 4) -> Dict[str, Dict]:
+    """VerseValidator-shaped results for the given verses."""
+    rng = random.Random(seed)
+    results = {}
+    for verse in verses:
+        verse_key = f"{verse['gv_chapter_id']}.{verse['gv_verses_id']}"
+        results[verse_key] = {
+            'chapter_id': verse['gv_chapter_id'],
+            'verse_id': verse['gv_verses_id'],
+            'verse_key': verse_key,
+            'text': verse['gv_verses'],
+            'text_length': len(verse['gv_verses']),
+            'similarity_scores': {f'source_{i}': rng.randint(40, 100) for i in range(rng.randint(0, 4))},
+            'critical_issues': ['Low source agreement'] * (rng.random() < 0.05),
+            'warnings': ['Failed to fetch'] * (rng.random() < 0.2),
+            'passed_checks': ['Text length appropriate']
+        }
+    return results
+
+
+def make_chapter_results(chapters: List[Dict], seed: int = 5) -> Dict[int, Dict]:
+    """ChapterValidator-shaped results for the given chapters."""
+    rng = random.Random(seed)
+    return {
+        chapter['ch_chapter_id']: {
+            'chapter_id': chapter['ch_chapter_id'],
+            'title_matches': {f'source_{i}': rng.randint(50, 100) for i in range(rng.randint(0, 4))},
+            'summary_length': len(chapter['ch_summary']),
+            'key_teachings_count': len(chapter['ch_key_teachings']),
+            'critical_issues': [],
+            'warnings': ['Theme mismatch'] * (rng.random() < 0.2),
+            'passed_checks': ['Title present', 'Summary present']
+        }
+        for chapter in chapters
+    }
+
+
+def make_fix_inputs(scenarios: List[Dict]) -> List[Dict]:
+    """reconstruct_action_steps() inputs: scenarios with fragment issues."""
+    inputs = []
+    for scenario in scenarios:
+        issues = [
+            {'location': f'step {idx + 1}'}
+            for idx, step in enumerate(scenario['sc_action_steps'])
+            if len(step) < 15
+        ]
+        inputs.append({**scenario, 'issues': issues})
+    return inputs
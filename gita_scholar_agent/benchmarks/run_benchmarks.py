@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Times the hot paths on synthetic corpora at 1x/10x/100x production size
+
+Usage (from gita_scholar_agent/):
+    python -m benchmarks.run_benchmarks                      # compare with stored baselines
+    python -m benchmarks.run_benchmarks --save-baseline      # record new baselines
+    python -m benchmarks.run_benchmarks --scales 1 10 --only quality_scorer
+    python -m benchmarks.run_benchmarks --report-dir output/benchmarks   # keep the report there
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks import corpus
+
+BASELINE_FILE = Path(__file__).parent / 'baselines.json'
+
+_SCRATCH_DIR = None
+
+
+def _scratch_dir() -> Path:
+    """Temporary directory for files benchmarks write, removed at exit."""
+    global _SCRATCH_DIR
+    if _SCRATCH_DIR is None:
+        _SCRATCH_DIR = Path(tempfile.mkdtemp(prefix='benchmarks_'))
+        atexit.register(shutil.rmtree, _SCRATCH_DIR, ignore_errors=True)
+    return _SCRATCH_DIR
+
+
+def _results_for(data: Dict) -> Dict:
+    """Full validation results (scored and summarized) for the dashboard."""
+    from reporters.quality_scorer import QualityScorer
+
+    scorer = QualityScorer()
+    verse_results = data['verse_results']
+    chapter_results = data['chapter_results']
+    verse_scores = scorer.score_verses(list(verse_results.values()), {})['scores']
+    chapter_scores = scorer.score_chapters(list(chapter_results.values()), {})['scores']
+    return {
+        'validation_date': datetime.now().isoformat(),
+        'sources_used': ['source_0', 'source_1', 'source_2', 'source_3'],
+        'verses': verse_results,
+        'chapters': chapter_results,
+        'special_chars': {'verses_with_issues': [], 'chapters_with_issues': [], 'total_dangerous_chars': 0},
+        'quality_scores': {
+            'overall_score': statistics.mean(verse_scores) * 0.7 + statistics.mean(chapter_scores) * 0.3,
+            'verse_scores': dict(zip(verse_results, verse_scores)),
+            'chapter_scores': dict(zip(chapter_results, chapter_scores)),
+            'breakdown': {
+                'avg_verse_score': statistics.mean(verse_scores),
+                'avg_chapter_score': statistics.mean(chapter_scores),
+                'min_verse_score': min(verse_scores),
+                'max_verse_score': max(verse_scores)
+            }
+        },
+        'summary': {
+            'total_verses_analyzed': len(verse_results),
+            'total_chapters_analyzed': len(chapter_results),
+            'critical_issues_count': sum(len(v['critical_issues']) for v in verse_results.values()),
+            'warnings_count': sum(len(v['warnings']) for v in verse_results.values()),
+            'dangerous_chars_found': 0,
+            'verse_count_correct': len(verse_results) == 700
+        }
+    }
+
+
+# Each benchmark: data -> (callable to time, number of items it processes)
+
+def bench_special_char_validate_text(data: Dict) -> Tuple[Callable, int]:
+    from validators.special_char_validator import SpecialCharValidator
+
+    validator = SpecialCharValidator()
+    texts = [verse['gv_verses'] for verse in data['verses']]
+    return lambda: [validator.validate_text(text) for text in texts], len(texts)
+
+
+def bench_batch_char_scan(data: Dict) -> Tuple[Callable, int]:
+    from validators.batch_char_scanner import BatchCharScanner
+
+    scanner = BatchCharScanner()
+    return lambda: scanner.scan_content(data['verses'], data['chapters']), len(data['verses'])
+
+
+def bench_scenario_check(data: Dict) -> Tuple[Callable, int]:
+    from scenario_quality_checker import ScenarioQualityChecker
+
+    checker = ScenarioQualityChecker()
+    scenarios = data['scenarios']
+    return lambda: [checker.check_scenario(scenario) for scenario in scenarios], len(scenarios)
+
+
+def bench_quality_scorer(data: Dict) -> Tuple[Callable, int]:
+    from reporters.quality_scorer import QualityScorer
+
+    scorer = QualityScorer()
+    verse_results = list(data['verse_results'].values())
+    chapter_results = list(data['chapter_results'].values())
+    special_chars = {
+        'verses_with_issues': [
+            {'verse': v['verse_key'], 'issues': [{'severity': 'warning'}]} for v in verse_results[::20]
+        ],
+        'chapters_with_issues': []
+    }
+
+    def run():
+        index = scorer.build_char_index(special_chars)
+        scorer.score_verses(verse_results, special_chars, index)
+        scorer.score_chapters(chapter_results, special_chars, index)
+
+    return run, len(verse_results) + len(chapter_results)
+
+
+def bench_verse_compare(data: Dict) -> Tuple[Callable, int]:
+    from validators.verse_validator import VerseValidator
+
+    validator = VerseValidator([])
+    verses = data['verses']
+    pairs = [
+        (verse['gv_verses'], {'translation': verses[(idx + 1) % len(verses)]['gv_verses']})
+        for idx, verse in enumerate(verses)
+    ]
+    return lambda: [validator._compare_with_source(ours, theirs, 'benchmark') for ours, theirs in pairs], len(pairs)
+
+
+def bench_html_dashboard(data: Dict) -> Tuple[Callable, int]:
+    from reporters.report_generator import ReportGenerator
+
+    generator = ReportGenerator()
+    results = _results_for(data)
+    data_dir = _scratch_dir() / 'quality_dashboard_data'
+
+    # What the agent does per run: write the detail chunks, then render the page
+    def run():
+        tables = generator.write_detail_chunks(results, data_dir)
+        generator.generate_html_dashboard(results, tables)
+
+    return run, len(results['verses'])
+
+
+def bench_reconstruct_action_steps(data: Dict) -> Tuple[Callable, int]:
+    from generate_fix_sql import reconstruct_action_steps
+
+    inputs = data['fix_inputs']
+    return lambda: [reconstruct_action_steps(scenario) for scenario in inputs], len(inputs)
+
+
+_STUB_SERVER = None
+
+
+def _stub_server():
+    """Local stand-in for the Messages API, shared by the LLM benchmarks."""
+    global _STUB_SERVER
+    if _STUB_SERVER is None:
+        from pipeline.llm_stub import StubAnthropicServer, StubResponder
+
+        _STUB_SERVER = StubAnthropicServer(StubResponder(), port=0, batch_seconds=0).start()
+    return _STUB_SERVER
+
+
+def _llm_requests(data: Dict) -> List[Tuple[int, Dict]]:
+    """Rewrite requests for about one scenario in ten, roughly the share flagged for rewriting."""
+    return [
+        (scenario['scenario_id'], {
+            'model': 'stub',
+            'max_tokens': 1000,
+            'messages': [{'role': 'user', 'content': f"**Scenario #{scenario['scenario_id']}: {scenario['sc_title']}**"
+                                                     f"\n\n{scenario['sc_description']}"}]
+        })
+        for scenario in data['scenarios'][::10]
+    ]
+
+
+def bench_llm_batch_online(data: Dict) -> Tuple[Callable, int]:
+    from anthropic import AsyncAnthropic
+    from pipeline.llm_batch import LLMBatchRunner
+
+    server = _stub_server()
+    requests = _llm_requests(data)
+    output_file = _scratch_dir() / 'llm_batch_online.jsonl'
+
+    async def run_batch():
+        # The client is closed inside its own event loop
+        async with AsyncAnthropic(api_key='stub', base_url=server.url, max_retries=0) as client:
+            runner = LLMBatchRunner(client, concurrency=16, requests_per_minute=10 ** 9,
+                                    input_tokens_per_minute=10 ** 12, output_tokens_per_minute=10 ** 12)
+            await runner.run(requests, output_file)
+
+    def run():
+        asyncio.run(run_batch())
+
+    return run, len(requests)
+
+
+def bench_llm_batch_job(data: Dict) -> Tuple[Callable, int]:
+    from anthropic import AsyncAnthropic
+    from pipeline.llm_batch_job import MessageBatchRunner
+
+    server = _stub_server()
+    requests = _llm_requests(data)
+    output_file = _scratch_dir() / 'llm_batch_job.jsonl'
+
+    async def run_batch():
+        async with AsyncAnthropic(api_key='stub', base_url=server.url, max_retries=0) as client:
+            await MessageBatchRunner(client, poll_interval=0).run(requests, output_file)
+
+    def run():
+        asyncio.run(run_batch())
+
+    return run, len(requests)
+
+
+BENCHMARKS = {
+    'special_char_validate_text': bench_special_char_validate_text,
+    'batch_char_scan': bench_batch_char_scan,
+    'scenario_check': bench_scenario_check,
+    'quality_scorer': bench_quality_scorer,
+    'verse_compare': bench_verse_compare,
+    'html_dashboard': bench_html_dashboard,
+    'reconstruct_action_steps': bench_reconstruct_action_steps,
+    'llm_batch_online': bench_llm_batch_online,
+    'llm_batch_job': bench_llm_batch_job,
+}
+
+
+def build_corpus(scale: int) -> Dict:
+    """Generate all inputs at a multiple of production size."""
+    verses = corpus.make_verses(corpus.PRODUCTION_VERSES * scale)
+    chapters = corpus.make_chapters(corpus.PRODUCTION_CHAPTERS * scale)
+    scenarios = corpus.make_scenarios(corpus.PRODUCTION_SCENARIOS * scale)
+    return {
+        'verses': verses,
+        'chapters': chapters,
+        'scenarios': scenarios,
+        'verse_results': corpus.make_verse_results(verses),
+        'chapter_results': corpus.make_chapter_results(chapters),
+        'fix_inputs': corpus.make_fix_inputs(scenarios)
+    }
+
+
+def time_benchmark(run: Callable, repeat: int) -> List[float]:
+    """Wall time of each repetition (after one warm-up call)."""
+    run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def compare(results: Dict, baselines: Dict, threshold: float) -> List[Dict]:
+    """Flag benchmarks whose median grew beyond the threshold."""
+    rows = []
+    for key, result in results.items():
+        if result.get('status') != 'ok':
+            continue
+        baseline = baselines.get(key)
+        if baseline is None:
+            rows.append({'benchmark': key, 'status': 'new', 'median': result['median']})
+            continue
+        ratio = result['median'] / baseline['median'] if baseline['median'] else float('inf')
+        rows.append({
+            'benchmark': key,
+            'status': 'regression' if ratio > 1 + threshold else 'improved' if ratio < 1 - threshold else 'ok',
+            'median': result['median'],
+            'baseline_median': baseline['median'],
+            'ratio': round(ratio, 3)
+        })
+    return rows
+
+
+def main():
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description='Run performance benchmarks on synthetic corpora')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='Multiples of production size (default: 1 10 100)')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions per benchmark (default: 5)')
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help='Allowed slowdown vs. baseline before flagging a regression (default: 0.20)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baselines')
+    parser.add_argument('--no-fail', action='store_true', help='Exit 0 even when regressions are found')
+    parser.add_argument('--report-dir', type=Path,
+                        help='Where to write benchmark_report.json (default: a new temporary directory)')
+    args = parser.parse_args()
+
+    names = args.only or list(BENCHMARKS)
+    results = {}
+
+    for scale in args.scales:
+        print(f"\n📦 Building {scale}x corpus...")
+        data = build_corpus(scale)
+        # Large corpora are slow enough that fewer repetitions are still stable
+        repeat = max(1, args.repeat // (1 + scale // 50))
+
+        for name in names:
+            key = f'{name}@{scale}x'
+            try:
+                run, items = BENCHMARKS[name](data)
+            except ImportError as e:
+                results[key] = {'status': 'skipped', 'reason': f'missing dependency: {e.name}'}
+                print(f"   ⏭  {key:<40} skipped ({e.name} not installed)")
+                continue
+
+            timings = time_benchmark(run, repeat)
+            median = statistics.median(timings)
+            results[key] = {
+                'status': 'ok',
+                'items': items,
+                'repeat': repeat,
+                'min': round(min(timings), 6),
+                'median': round(median, 6),
+                'per_item_us': round(median / max(items, 1) * 1e6, 3)
+            }
+            print(f"   ⏱  {key:<40} median {median * 1000:10.2f} ms  ({results[key]['per_item_us']:.2f} µs/item)")
+
+    baselines = {}
+    if BASELINE_FILE.exists():
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            baselines = json.load(f).get('benchmarks', {})
+
+    comparison = compare(results, baselines, args.threshold)
+    regressions = [row for row in comparison if row['status'] == 'regression']
+
+    report_dir = args.report_dir or Path(tempfile.mkdtemp(prefix='benchmark_report_'))
+    report_dir.mkdir(parents=True, exist_ok=True)
+    report_file = report_dir / 'benchmark_report.json'
+    environment = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine()
+    }
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated': datetime.now().isoformat(),
+            'environment': environment,
+            'threshold': args.threshold,
+            'results': results,
+            'comparison': comparison
+        }, f, indent=2)
+    print(f"\n✅ Benchmark report saved to: {report_file}")
+
+    if comparison and baselines:
+        print(f"\n{'='*80}")
+        print(f"📊 BASELINE COMPARISON (threshold +{args.threshold:.0%})")
+        print(f"{'='*80}")
+        for row in comparison:
+            if 'ratio' in row:
+                print(f"   {row['status'].upper():<11} {row['benchmark']:<40} x{row['ratio']:.2f}")
+            else:
+                print(f"   {'NEW':<11} {row['benchmark']}")
+
+    if args.save_baseline:
+        merged = {**baselines, **{key: r for key, r in results.items() if r['status'] == 'ok'}}
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment, 'saved': datetime.now().isoformat(), 'benchmarks': merged},
+                      f, indent=2)
+            f.write('\n')
+        print(f"✅ Baselines saved to: {BASELINE_FILE}")
+        return 0
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed beyond +{args.threshold:.0%}")
+        return 0 if args.no_fail else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
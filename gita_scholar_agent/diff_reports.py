@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compare two validation or scenario quality reports and show what changed.
+
+Usage:
+    python diff_reports.py output/previous/validation_report.json output/validation_report.json
+    python diff_reports.py old/scenario_quality_report.json output/scenario_quality_report.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from reporters.report_diff import diff_reports, render_diff
+
+
+def main():
+    """Main diff function."""
+    parser = argparse.ArgumentParser(description='Diff two validation / scenario quality reports')
+    parser.add_argument('old', help='Baseline report (.json or .ndjson[.gz|.zst])')
+    parser.add_argument('new', help='Report to compare against the baseline')
+    parser.add_argument('--output-dir', default='output', help='Where to write the diff (default: output)')
+    parser.add_argument('--top', type=int, default=20, help='Regressions / improvements to list (default: 20)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 when any item regressed, gained some issues while '
+                             'losing others, or is new and has issues, or a verse / chapter is missing')
+    args = parser.parse_args()
+
+    for path in (args.old, args.new):
+        if not Path(path).exists():
+            parser.error(f'{path} not found')
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    changes_path = output_dir / 'report_diff_changes.ndjson'
+
+    diff = diff_reports(Path(args.old), Path(args.new), changes_path, args.top)
+
+    report = render_diff(diff)
+    print(report)
+
+    diff_path = output_dir / 'report_diff.json'
+    with open(diff_path, 'w', encoding='utf-8') as f:
+        json.dump(diff, f, indent=2, ensure_ascii=False)
+    with open(output_dir / 'report_diff.txt', 'w', encoding='utf-8') as f:
+        f.write(report + "\n")
+
+    print(f"\n✅ Diff saved to: {diff_path}")
+    print(f"✅ All changed items: {changes_path}")
+
+    summary = diff['summary']
+    if args.fail_on_regression and (summary['items_regressed'] or summary['items_changed']
+                                    or summary['items_added_with_issues'] or summary['items_missing']):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
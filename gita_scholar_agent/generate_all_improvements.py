@@ -7,6 +7,9 @@ This script creates human-like, caring advice that replaces robotic patterns.
 import json
 import re
 
+from pipeline.profiling import Profiler
+from reporters.sql_emitter import ACTION_STEPS_COLUMNS, DEFAULT_BATCH_SIZE, batch_size_from_argv, write_update_script
+
 
 def create_conversational_step(scenario, step_text, step_number):
     """
@@ -213,7 +216,7 @@ def create_conversational_step(scenario, step_text, step_number):
         return result
 
 
-def generate_all_improvements():
+def generate_all_improvements(batch_size=DEFAULT_BATCH_SIZE):
     """Process all 326 scenarios and generate conversational improvements."""
 
     print("="*80)
@@ -276,38 +279,32 @@ def generate_all_improvements():
     output_sql = "gita_scholar_agent/output/CONVERSATIONAL_UPDATE.sql"
     print(f"Writing SQL to: {output_sql}")
 
-    with open(output_sql, 'w', encoding='utf-8') as f:
-        f.write("-- ============================================================================\n")
-        f.write("-- CONVERSATIONAL ACTION STEPS UPDATE\n")
-        f.write("-- ============================================================================\n")
-        f.write("-- Updates 326 high-severity scenarios with conversational, comprehensive\n")
-        f.write("-- action steps that read like advice from a wise, caring friend.\n")
-        f.write("--\n")
-        f.write("-- Quality improvements:\n")
-        f.write("-- - Removed robotic 'Take time to' and 'ensuring full context' patterns\n")
-        f.write("-- - Added specific context and examples from each scenario\n")
-        f.write("-- - Made steps 60-150 characters with complete sentences\n")
-        f.write("-- - Progressive steps that build from easier to harder actions\n")
-        f.write("-- ============================================================================\n\n")
-        f.write("BEGIN;\n\n")
-
-        for improvement in improvements:
-            scenario_id = improvement['scenario_id']
-            title = improvement['title']
-            steps = improvement['improved_steps']
-
-            # Escape single quotes for SQL
-            steps_json = json.dumps(steps, ensure_ascii=False).replace("'", "''")
-
-            f.write(f"-- Scenario {scenario_id}: {title}\n")
-            f.write(f"UPDATE scenarios\n")
-            f.write(f"SET sc_action_steps = '{steps_json}'::jsonb\n")
-            f.write(f"WHERE scenario_id = {scenario_id};\n\n")
-
-        f.write("COMMIT;\n")
-        f.write("\n-- ============================================================================\n")
-        f.write(f"-- Updated {len(improvements)} scenarios successfully\n")
-        f.write("-- ============================================================================\n")
+    write_update_script(
+        output_sql,
+        header=[
+            "=" * 76,
+            "CONVERSATIONAL ACTION STEPS UPDATE",
+            "=" * 76,
+            f"Updates {len(improvements)} high-severity scenarios with conversational, comprehensive",
+            "action steps that read like advice from a wise, caring friend.",
+            "",
+            "Quality improvements:",
+            "- Removed robotic 'Take time to' and 'ensuring full context' patterns",
+            "- Added specific context and examples from each scenario",
+            "- Made steps 60-150 characters with complete sentences",
+            "- Progressive steps that build from easier to harder actions",
+            "=" * 76
+        ],
+        table='scenarios',
+        key=('scenario_id', 'integer'),
+        columns=ACTION_STEPS_COLUMNS,
+        rows=(
+            (imp['scenario_id'], {'sc_action_steps': imp['improved_steps']}, f"Scenario {imp['scenario_id']}: {imp['title']}")
+            for imp in improvements
+        ),
+        batch_size=batch_size,
+        footer=["", "=" * 76, "Updated {rows} scenarios successfully", "=" * 76]
+    )
 
     print(f"✅ SQL file created\n")
 
@@ -347,4 +344,6 @@ def generate_all_improvements():
 
 
 if __name__ == "__main__":
-    generate_all_improvements()
+    batch_size = batch_size_from_argv()
+    with Profiler.from_argv('generate_all_improvements').phase('main'):
+        generate_all_improvements(batch_size)
@@ -4,12 +4,27 @@ Generate conversational, comprehensive action steps for all high-severity scenar
 Uses AI to create helpful, detailed guidance that reads like advice from a friend.
 """
 
+import argparse
 import json
 import os
-from anthropic import Anthropic
+from pathlib import Path
 
-def generate_conversational_steps(scenario, client):
-    """Generate improved action steps using Claude API."""
+from anthropic import AsyncAnthropic
+
+from pipeline.llm_batch import add_batch_arguments
+from pipeline.llm_batch_job import add_batch_job_arguments, format_batch_status, runner_from_args
+from pipeline.llm_packing import add_packing_arguments
+from pipeline.llm_rewrite import LLMRewriter
+from reporters.sql_emitter import ACTION_STEPS_COLUMNS, write_update_script
+from validators.step_validator import ActionStepValidator
+
+CONVERSATIONAL_PROMPT_FIELDS = ('scenario_id', 'title', 'description', 'category', 'heart_response',
+                                'duty_response', 'gita_wisdom', 'current_action_steps')
+
+STEP_VALIDATOR = ActionStepValidator(min_steps=5, max_steps=5, min_chars=50, max_chars=150)
+
+def build_conversational_prompt(scenario):
+    """Prompt asking for conversational action steps for one scenario."""
 
     scenario_id = scenario['scenario_id']
     title = scenario['title']
@@ -20,7 +35,7 @@ def generate_conversational_steps(scenario, client):
     gita_wisdom = scenario['gita_wisdom']
     current_steps = scenario['current_action_steps']
 
-    prompt = f"""You are improving action steps for a Bhagavad Gita wisdom app. The current steps are too robotic and have redundant phrases.
+    return f"""You are improving action steps for a Bhagavad Gita wisdom app. The current steps are too robotic and have redundant phrases.
 
 **Scenario #{scenario_id}: {title}**
 
@@ -57,43 +72,87 @@ Rewrite these 5 action steps to be:
 **CRITICAL:** Return ONLY a JSON array of 5 strings, nothing else:
 ["Step 1 text here", "Step 2 text here", "Step 3 text here", "Step 4 text here", "Step 5 text here"]"""
 
-    try:
-        message = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1500,
-            temperature=0.7,
-            messages=[{"role": "user", "content": prompt}]
-        )
+def build_packed_conversational_prompt(group, notes):
+    """Prompt for several scenarios at once, answered as a JSON object keyed by scenario_id."""
+
+    sections = []
+    for scenario_id, scenario in group:
+        section = f"""**Scenario #{scenario_id}: {scenario['title']}**
+
+**Situation:** {scenario['description']}
+
+**Category:** {scenario['category']}
+
+**Heart Response (emotional/easy path):** {scenario['heart_response']}
+
+**Duty Response (dharmic/right path):** {scenario['duty_response']}
 
-        response_text = message.content[0].text.strip()
+**Gita Wisdom:** {scenario['gita_wisdom']}
 
-        # Remove markdown if present
-        if response_text.startswith('```'):
-            lines = response_text.split('\n')
-            response_text = '\n'.join(lines[1:-1])
-            if response_text.startswith('json'):
-                response_text = response_text[4:].strip()
+**Current Action Steps (NEED IMPROVEMENT - too terse/redundant):**
+{json.dumps(scenario['current_action_steps'], indent=2)}"""
+        if scenario_id in notes:
+            section += "\n\n**Your previous answer for this scenario was rejected:**\n" + '\n'.join(f'- {problem}' for problem in notes[scenario_id])
+        sections.append(section)
+
+    example = ', '.join(f'"{scenario_id}": ["Step 1 text here", "...", "Step 5 text here"]' for scenario_id, _ in group[:2])
+    return f"""You are improving action steps for a Bhagavad Gita wisdom app. The current steps are too robotic and have redundant phrases.
 
-        improved_steps = json.loads(response_text)
+{chr(10).join(section + chr(10) for section in sections)}
+**Your Task:**
+For EACH scenario above, rewrite its action steps as exactly 5 steps that are:
 
-        if not isinstance(improved_steps, list) or len(improved_steps) != 5:
-            print(f"⚠️  Scenario {scenario_id}: Got {len(improved_steps) if isinstance(improved_steps, list) else 'invalid'} steps, expected 5")
-            return None
+1. **Conversational** - like advice from a wise, caring friend
+2. **Comprehensive** - include context, examples, specific details (60-150 characters each, never more than 150)
+3. **Complete sentences** - not commands or fragments
+4. **Actionable** - concrete steps someone can actually do
+5. **Progressive** - build from easier to harder actions
+6. **Specific to this scenario** - reference the actual situation
 
-        return {
-            'scenario_id': scenario_id,
-            'title': title,
-            'improved_steps': improved_steps,
-            'old_steps': current_steps
-        }
+**Good Example Style:**
+"Identify your top 3-5 spending categories (like groceries, clothing, tech) and create simple decision rules for each to cut through analysis paralysis"
 
-    except Exception as e:
-        print(f"❌ Error processing scenario {scenario_id}: {e}")
+**Bad Example Style (avoid):**
+"Identify top categories" (too terse)
+"Take time to identify categories, ensuring you understand the context" (redundant)
+
+**CRITICAL:** Return ONLY a JSON object mapping each scenario number (as a string) to its array of 5 strings, nothing else:
+{{{example}}}"""
+
+def conversational_cache_fields(scenario):
+    """Every scenario field the prompts use."""
+    return {name: scenario.get(name) for name in CONVERSATIONAL_PROMPT_FIELDS}
+
+REWRITER = LLMRewriter(
+    build_conversational_prompt, build_packed_conversational_prompt, conversational_cache_fields, STEP_VALIDATOR,
+    prompt_version='conversational-1', packed_prompt_version='conversational-packed-1',
+    model='claude-sonnet-4-20250514', max_tokens=1500, temperature=0.7
+)
+
+def parse_conversational_steps(outcome):
+    """Improvement dict from a rewrite outcome, or None if unusable."""
+
+    scenario = outcome['payload']
+    if outcome['steps'] is None:
+        print(f"❌ Scenario {scenario['scenario_id']}: {'; '.join(outcome['problems'])}")
         return None
 
+    return {
+        'scenario_id': scenario['scenario_id'],
+        'title': scenario['title'],
+        'improved_steps': outcome['steps'],
+        'old_steps': scenario['current_action_steps']
+    }
+
 def main():
     """Main processing function."""
 
+    parser = argparse.ArgumentParser(description='Generate conversational action steps with Claude')
+    add_batch_arguments(parser)
+    add_packing_arguments(parser)
+    add_batch_job_arguments(parser)
+    args = parser.parse_args()
+
     # Check for API key
     api_key = os.getenv('ANTHROPIC_API_KEY')
     if not api_key:
@@ -106,31 +165,43 @@ def main():
         scenarios = json.load(f)
 
     print(f"✅ Loaded {len(scenarios)} high-severity scenarios")
-    print(f"\n🤖 Generating conversational action steps using Claude API...")
+    packing = f", {args.pack} scenarios per request" if args.pack > 1 else ""
+    print(f"\n🤖 Generating conversational action steps using Claude API ({args.concurrency} at a time{packing})...")
     print(f"   This will use API credits but produce much better quality")
 
-    # Initialize Anthropic client
-    client = Anthropic(api_key=api_key)
+    # Initialize Anthropic client; the batch runner does its own retries
+    client = AsyncAnthropic(api_key=api_key, max_retries=0)
+
+    def progress(record, done):
+        if done % 10 == 0:
+            print(f"   Progress: {done}/{len(scenarios)} scenarios processed...")
+
+    def round_progress(round_number, round_stats):
+        print(f"   Round {round_number}: {round_stats['items']} requests ({round_stats['errors']} failed)")
+
+    runner = runner_from_args(client, args,
+                              on_poll=lambda batches: print(f"   ⏳ {format_batch_status(batches)}"))
+    items = [(scenario['scenario_id'], scenario) for scenario in scenarios]
+    if args.pack > 1:
+        result = REWRITER.run_packed(runner, items, Path('gita_scholar_agent/output/CONVERSATIONAL_PACKED_RESULTS.jsonl'),
+                                     args.pack, args.max_rounds, progress=round_progress)
+    else:
+        result = REWRITER.run_single(runner, items, Path('gita_scholar_agent/output/CONVERSATIONAL_RESULTS.jsonl'),
+                                     resume=args.resume, progress=progress)
+    runner.close()
+    if result is None:
+        print("\n⏳ Message batch still processing; run the same command again to collect the results")
+        return
+    outcomes, summary = result
 
     improvements = []
     errors = []
-
-    # Process all scenarios
-    for i, scenario in enumerate(scenarios, 1):
-        result = generate_conversational_steps(scenario, client)
-
-        if result:
-            improvements.append(result)
-
-            if i % 10 == 0:
-                print(f"   Progress: {i}/{len(scenarios)} scenarios processed...")
-                # Show example
-                if len(improvements) >= 1:
-                    ex = improvements[-1]
-                    print(f"   Latest: Scenario {ex['scenario_id']} - {ex['title']}")
-                    print(f"            {ex['improved_steps'][0][:80]}...")
+    for outcome in outcomes:
+        improvement = parse_conversational_steps(outcome)
+        if improvement:
+            improvements.append(improvement)
         else:
-            errors.append(scenario['scenario_id'])
+            errors.append(outcome['key'])
 
     print(f"\n{'='*80}")
     print(f"📊 GENERATION SUMMARY")
@@ -138,6 +209,8 @@ def main():
     print(f"Total scenarios: {len(scenarios)}")
     print(f"Successfully improved: {len(improvements)}")
     print(f"Errors: {len(errors)}")
+    for line in summary:
+        print(line)
 
     # Save improvements
     output_file = 'gita_scholar_agent/output/CONVERSATIONAL_IMPROVEMENTS.json'
@@ -148,24 +221,21 @@ def main():
 
     # Generate SQL
     sql_file = 'gita_scholar_agent/output/CONVERSATIONAL_UPDATE.sql'
-    with open(sql_file, 'w', encoding='utf-8') as f:
-        f.write("-- SQL Script: Conversational Action Steps Improvements\n")
-        f.write("-- AI-generated comprehensive, conversational guidance\n")
-        f.write(f"-- Affects {len(improvements)} scenarios\n\n")
-        f.write("BEGIN;\n\n")
-
-        for improvement in improvements:
-            scenario_id = improvement['scenario_id']
-            steps = improvement['improved_steps']
-
-            steps_json = json.dumps(steps, ensure_ascii=False).replace("'", "''")
-
-            f.write(f"-- Scenario {scenario_id}: {improvement['title']}\n")
-            f.write(f"UPDATE scenarios \n")
-            f.write(f"SET sc_action_steps = '{steps_json}'::jsonb \n")
-            f.write(f"WHERE scenario_id = {scenario_id};\n\n")
-
-        f.write("COMMIT;\n")
+    write_update_script(
+        sql_file,
+        header=[
+            "SQL Script: Conversational Action Steps Improvements",
+            "AI-generated comprehensive, conversational guidance",
+            f"Affects {len(improvements)} scenarios"
+        ],
+        table='scenarios',
+        key=('scenario_id', 'integer'),
+        columns=ACTION_STEPS_COLUMNS,
+        rows=(
+            (imp['scenario_id'], {'sc_action_steps': imp['improved_steps']}, f"Scenario {imp['scenario_id']}: {imp['title']}")
+            for imp in improvements
+        )
+    )
 
     print(f"✅ SQL script: {sql_file}")
 
@@ -5,15 +5,11 @@ Generate SQL script with correct PostgreSQL text[] array syntax.
 
 import json
 
-def escape_for_postgres_array(text):
-    """Escape text for PostgreSQL array literal."""
-    # Escape single quotes by doubling them (SQL standard)
-    text = text.replace("'", "''")
-    # Escape backslashes
-    text = text.replace('\\', '\\\\')
-    return text
+from pipeline.profiling import Profiler
+from reporters.sql_emitter import (ACTION_STEPS_COLUMNS, DEFAULT_BATCH_SIZE, batch_size_from_argv,
+                                   sql_literal, write_update_script)
 
-def main():
+def main(batch_size=DEFAULT_BATCH_SIZE):
     print("🔍 Loading improvements...")
 
     with open('gita_scholar_agent/output/CONVERSATIONAL_IMPROVEMENTS.json', 'r') as f:
@@ -24,54 +20,44 @@ def main():
 
     sql_file = 'gita_scholar_agent/output/CONVERSATIONAL_UPDATE_FIXED.sql'
 
-    with open(sql_file, 'w', encoding='utf-8') as f:
-        f.write("-- ============================================================================\n")
-        f.write("-- CONVERSATIONAL ACTION STEPS UPDATE (FIXED FOR text[] column type)\n")
-        f.write("-- ============================================================================\n")
-        f.write("-- Updates 326 high-severity scenarios with conversational, comprehensive\n")
-        f.write("-- action steps that read like advice from a wise, caring friend.\n")
-        f.write("--\n")
-        f.write("-- Quality improvements:\n")
-        f.write("-- - Removed robotic 'Take time to' and 'ensuring full context' patterns\n")
-        f.write("-- - Added specific context and examples from each scenario\n")
-        f.write("-- - Made steps 60-150 characters with complete sentences\n")
-        f.write("-- - Progressive steps that build from easier to harder actions\n")
-        f.write("--\n")
-        f.write("-- Column Type: text[] (PostgreSQL text array)\n")
-        f.write("-- ============================================================================\n\n")
-        f.write("BEGIN;\n\n")
-
-        for i, improvement in enumerate(improvements, 1):
-            scenario_id = improvement['scenario_id']
-            title = improvement['title']
-            steps = improvement['improved_steps']
-
-            # Build PostgreSQL array literal with ARRAY constructor
-            # Format: ARRAY['step1', 'step2', ...]
-            escaped_steps = [escape_for_postgres_array(step) for step in steps]
-            array_literal = "ARRAY['" + "', '".join(escaped_steps) + "']"
-
-            f.write(f"-- Scenario {scenario_id}: {title}\n")
-            f.write(f"UPDATE scenarios\n")
-            f.write(f"SET sc_action_steps = {array_literal}\n")
-            f.write(f"WHERE scenario_id = {scenario_id};\n\n")
-
-            if i % 50 == 0:
-                print(f"   Progress: {i}/{len(improvements)} scenarios...")
-
-        f.write("COMMIT;\n")
+    updates = write_update_script(
+        sql_file,
+        header=[
+            "=" * 76,
+            "CONVERSATIONAL ACTION STEPS UPDATE (FIXED FOR text[] column type)",
+            "=" * 76,
+            f"Updates {len(improvements)} high-severity scenarios with conversational, comprehensive",
+            "action steps that read like advice from a wise, caring friend.",
+            "",
+            "Quality improvements:",
+            "- Removed robotic 'Take time to' and 'ensuring full context' patterns",
+            "- Added specific context and examples from each scenario",
+            "- Made steps 60-150 characters with complete sentences",
+            "- Progressive steps that build from easier to harder actions",
+            "",
+            "Column Type: text[] (PostgreSQL text array)",
+            "=" * 76
+        ],
+        table='scenarios',
+        key=('scenario_id', 'integer'),
+        columns=ACTION_STEPS_COLUMNS,
+        rows=(
+            (imp['scenario_id'], {'sc_action_steps': imp['improved_steps']}, f"Scenario {imp['scenario_id']}: {imp['title']}")
+            for imp in improvements
+        ),
+        batch_size=batch_size
+    )
 
     print(f"\n{'='*80}")
     print(f"✅ SQL script generated: {sql_file}")
     print(f"{'='*80}")
-    print(f"\nTotal scenarios: {len(improvements)}")
+    print(f"\nTotal scenarios: {updates.rows} in {updates.statements} batched UPDATE statements")
     print(f"Format: PostgreSQL text[] array with ARRAY constructor")
     print(f"\n📋 Sample SQL (first scenario):\n")
 
     # Show first example
     first = improvements[0]
-    escaped = [escape_for_postgres_array(s) for s in first['improved_steps']]
-    array_literal = "ARRAY['" + "', '".join(escaped) + "']"
+    array_literal = sql_literal(first['improved_steps'], 'text[]')
 
     print(f"-- Scenario {first['scenario_id']}: {first['title']}")
     print(f"UPDATE scenarios")
@@ -81,4 +67,6 @@ def main():
     print(f"\n✅ Ready to apply in Supabase SQL Editor!")
 
 if __name__ == "__main__":
-    main()
+    batch_size = batch_size_from_argv()
+    with Profiler.from_argv('generate_correct_sql').phase('main'):
+        main(batch_size)
@@ -6,6 +6,9 @@ import json
 import os
 from pathlib import Path
 
+from pipeline.profiling import Profiler
+from reporters.sql_emitter import ACTION_STEPS_COLUMNS, DEFAULT_BATCH_SIZE, BatchedUpdateWriter, batch_size_from_argv
+
 def load_quality_report():
     """Load the quality report JSON"""
     report_path = Path("output/scenario_quality_report.json")
@@ -70,35 +73,22 @@ def reconstruct_action_steps(scenario_data):
 
     return fixed_steps
 
-def escape_sql_string(s):
-    """Escape string for SQL"""
-    if s is None:
-        return 'NULL'
-    # Escape single quotes
-    return "'" + s.replace("'", "''") + "'"
-
-def generate_update_statement(scenario_data):
-    """Generate UPDATE statement for a scenario"""
-    scenario_id = scenario_data['id']
+def queue_update(updates, scenario_data):
+    """Queue the UPDATE row for a scenario"""
     title = scenario_data['sc_title']
 
     # Get original and fixed action steps
     original_steps = scenario_data['sc_action_steps']
     fixed_steps = reconstruct_action_steps(scenario_data)
 
-    # Format as PostgreSQL array
-    array_str = "ARRAY[" + ", ".join([escape_sql_string(step) for step in fixed_steps]) + "]"
-
-    sql = f"""-- Fix: {title}
--- Original steps: {len(original_steps)}, Fixed steps: {len(fixed_steps)}
-UPDATE scenarios
-SET sc_action_steps = {array_str},
-    updated_at = NOW()
-WHERE id = {escape_sql_string(scenario_id)};
-"""
-    return sql, original_steps, fixed_steps
+    updates.add(
+        scenario_data['id'],
+        {'sc_action_steps': fixed_steps},
+        comment=f"Fix: {title} (original steps: {len(original_steps)}, fixed steps: {len(fixed_steps)})"
+    )
+    return original_steps, fixed_steps
 
-def main():
+def main(batch_size=DEFAULT_BATCH_SIZE):
     print("="*80)
     print("SCENARIO QUALITY FIX SQL GENERATOR")
     print("="*80)
@@ -142,6 +132,12 @@ BEGIN;
 
         total_fixed = 0
 
+        # Rows are batched into UPDATE ... FROM (VALUES ...) statements
+        updates = BatchedUpdateWriter(
+            sql_out, 'scenarios', ('id', 'integer'), ACTION_STEPS_COLUMNS,
+            batch_size, extra_set={'updated_at': 'NOW()'}
+        )
+
         # Process each scenario
         for idx, scenario_data in enumerate(scenarios_with_issues, 1):
             title = scenario_data['sc_title']
@@ -151,12 +147,8 @@ BEGIN;
             print(f"{idx}. Processing: {title} ({issue_count} issues)...")
 
             try:
-                # Generate UPDATE statement
-                sql_stmt, original_steps, fixed_steps = generate_update_statement(scenario_data)
-
-                # Write to SQL file
-                sql_out.write(sql_stmt)
-                sql_out.write("\n")
+                # Queue UPDATE row
+                original_steps, fixed_steps = queue_update(updates, scenario_data)
 
                 # Write to report
                 report_out.write(f"\n{'='*80}\n")
@@ -178,9 +170,11 @@ BEGIN;
             except Exception as e:
                 error_msg = f"ERROR processing {title}: {e}"
                 print(f"  {error_msg}")
-                sql_out.write(f"-- {error_msg}\n\n")
+                updates.comment(error_msg)
                 report_out.write(f"\n⚠️ {error_msg}\n\n")
 
+        updates.close()
+
         # Write SQL footer
         sql_out.write("""
 COMMIT;
@@ -188,10 +182,10 @@ COMMIT;
 -- ============================================================================
 -- END OF FIX STATEMENTS
 -- ============================================================================
--- Successfully generated {total_fixed} UPDATE statements
+-- Successfully generated {total_fixed} row updates in {statements} UPDATE statements
 -- Review the fix_scenarios_report.txt file for before/after comparison
 -- ============================================================================
-""".format(total_fixed=total_fixed))
+""".format(total_fixed=total_fixed, statements=updates.statements))
 
         # Write report summary
         report_out.write("\n" + "="*80 + "\n")
@@ -209,4 +203,6 @@ COMMIT;
     print("="*80)
 
 if __name__ == '__main__':
-    main()
+    batch_size = batch_size_from_argv()
+    with Profiler.from_argv('generate_fix_sql').phase('main'):
+        main(batch_size)
@@ -3,7 +3,8 @@
 Generate SQL update scripts from AI-improved action steps.
 """
 
-import json
+from pipeline.profiling import Profiler
+from reporters.sql_emitter import ACTION_STEPS_COLUMNS, DEFAULT_BATCH_SIZE, batch_size_from_argv, write_update_script
 
 # Manual mapping of improved action steps (from AI review above)
 IMPROVED_STEPS = {
@@ -149,29 +150,28 @@ IMPROVED_STEPS = {
     ]
 }
 
-def main():
+def main(batch_size=DEFAULT_BATCH_SIZE):
     """Generate SQL updates."""
 
     output_file = 'gita_scholar_agent/output/UPDATE_ACTION_STEPS.sql'
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("-- SQL Script to Update Action Steps with AI-Improved Versions\n")
-        f.write("-- Generated by generate_sql_updates.py\n")
-        f.write("-- Replaces redundant templates with specific, actionable guidance\n\n")
-        f.write("BEGIN;\n\n")
-
-        for scenario_id, steps in sorted(IMPROVED_STEPS.items()):
-            # Escape single quotes for SQL
-            steps_json = json.dumps(steps, ensure_ascii=False)
-            steps_json_escaped = steps_json.replace("'", "''")
-
-            f.write(f"-- Scenario {scenario_id}\n")
-            f.write(f"UPDATE scenarios \n")
-            f.write(f"SET sc_action_steps = '{steps_json_escaped}'::jsonb \n")
-            f.write(f"WHERE scenario_id = {scenario_id};\n\n")
-
-        f.write("COMMIT;\n")
-        f.write(f"\n-- Updated {len(IMPROVED_STEPS)} scenarios\n")
+    write_update_script(
+        output_file,
+        header=[
+            "SQL Script to Update Action Steps with AI-Improved Versions",
+            "Generated by generate_sql_updates.py",
+            "Replaces redundant templates with specific, actionable guidance"
+        ],
+        table='scenarios',
+        key=('scenario_id', 'integer'),
+        columns=ACTION_STEPS_COLUMNS,
+        rows=(
+            (scenario_id, {'sc_action_steps': steps}, f"Scenario {scenario_id}")
+            for scenario_id, steps in sorted(IMPROVED_STEPS.items())
+        ),
+        batch_size=batch_size,
+        footer=["", "Updated {rows} scenarios"]
+    )
 
     print(f"✅ SQL script generated: {output_file}")
     print(f"📊 Scenarios updated: {len(IMPROVED_STEPS)}")
@@ -181,4 +181,6 @@ def main():
     print(f"   3. Run: psql -h <host> -U postgres -d postgres -f {output_file}")
 
 if __name__ == "__main__":
-    main()
+    batch_size = batch_size_from_argv()
+    with Profiler.from_argv('generate_sql_updates').phase('main'):
+        main(batch_size)
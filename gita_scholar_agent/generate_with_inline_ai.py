@@ -7,6 +7,9 @@ This script will be run in an AI environment where improvements are generated in
 import json
 import os
 
+from pipeline.profiling import Profiler
+from reporters.sql_emitter import ACTION_STEPS_COLUMNS, DEFAULT_BATCH_SIZE, batch_size_from_argv, write_update_script
+
 def load_scenarios():
     """Load all high-severity scenarios."""
     with open('gita_scholar_agent/output/ALL_HIGH_SEVERITY_SCENARIOS.json', 'r') as f:
@@ -20,32 +23,30 @@ def save_improvements(improvements):
     print(f"\n✅ Saved {len(improvements)} improvements to: {output_file}")
     return output_file
 
-def generate_sql(improvements):
+def generate_sql(improvements, batch_size=DEFAULT_BATCH_SIZE):
     """Generate SQL script from improvements."""
     sql_file = 'gita_scholar_agent/output/CONVERSATIONAL_UPDATE.sql'
-    with open(sql_file, 'w', encoding='utf-8') as f:
-        f.write("-- SQL Script: Conversational Action Steps Improvements\n")
-        f.write("-- AI-generated comprehensive, conversational guidance\n")
-        f.write(f"-- Affects {len(improvements)} scenarios\n\n")
-        f.write("BEGIN;\n\n")
-
-        for improvement in improvements:
-            scenario_id = improvement['scenario_id']
-            steps = improvement['improved_steps']
-
-            steps_json = json.dumps(steps, ensure_ascii=False).replace("'", "''")
-
-            f.write(f"-- Scenario {scenario_id}: {improvement['title']}\n")
-            f.write(f"UPDATE scenarios \n")
-            f.write(f"SET sc_action_steps = '{steps_json}'::jsonb \n")
-            f.write(f"WHERE scenario_id = {scenario_id};\n\n")
-
-        f.write("COMMIT;\n")
+    write_update_script(
+        sql_file,
+        header=[
+            "SQL Script: Conversational Action Steps Improvements",
+            "AI-generated comprehensive, conversational guidance",
+            f"Affects {len(improvements)} scenarios"
+        ],
+        table='scenarios',
+        key=('scenario_id', 'integer'),
+        columns=ACTION_STEPS_COLUMNS,
+        rows=(
+            (imp['scenario_id'], {'sc_action_steps': imp['improved_steps']}, f"Scenario {imp['scenario_id']}: {imp['title']}")
+            for imp in improvements
+        ),
+        batch_size=batch_size
+    )
 
     print(f"✅ SQL script: {sql_file}")
     return sql_file
 
-def main():
+def main(batch_size=DEFAULT_BATCH_SIZE):
     """Main processing function."""
     print("🔍 Loading scenarios...")
     scenarios = load_scenarios()
@@ -64,5 +65,15 @@ def main():
     print("\nNext: AI will generate conversational improvements for all scenarios")
     print("Format: Complete sentences, 60-150 characters, conversational tone")
 
+    # Once the inline improvements have been saved, a rerun writes the SQL
+    improvements_file = 'gita_scholar_agent/output/CONVERSATIONAL_IMPROVEMENTS.json'
+    if os.path.exists(improvements_file):
+        with open(improvements_file, 'r', encoding='utf-8') as f:
+            improvements = json.load(f)
+        print(f"\n✅ Found {len(improvements)} saved improvements")
+        generate_sql(improvements, batch_size)
+
 if __name__ == "__main__":
-    main()
+    batch_size = batch_size_from_argv()
+    with Profiler.from_argv('generate_with_inline_ai').phase('main'):
+        main(batch_size)
@@ -8,6 +8,7 @@ import asyncio
 import argparse
 import json
 import sys
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -28,8 +29,17 @@ from sources.holy_bhagavad_gita_source import HolyBhagavadGitaSource
 from validators.verse_validator import VerseValidator
 from validators.chapter_validator import ChapterValidator
 from validators.special_char_validator import SpecialCharValidator
+from validators.batch_char_scanner import BatchCharScanner
 from reporters.quality_scorer import QualityScorer
 from reporters.report_generator import ReportGenerator
+from reporters.stream_writer import COMPRESSIONS, NDJSONReader, NDJSONWriter, check_compression, stream_path
+from pipeline.phase_scheduler import PhaseScheduler
+from pipeline.deadline import RiskQueue, verse_risk, chapter_risk
+from pipeline.run_journal import RunJournal
+from pipeline.telemetry import Telemetry, InstrumentedHttp
+from pipeline.profiling import Profiler, add_profile_argument
+from pipeline.sampling import draw_sample, estimate_mean
+from pipeline.sharding import parse_shard, select_verses, select_chapters, write_shard, merge_shards
 
 
 class GitaScholarAgent:
@@ -37,13 +47,25 @@ class GitaScholarAgent:
     Main agent class for validating Bhagavad Gita content.
     """
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, journal: Optional[RunJournal] = None, offline: bool = False):
         self.config = config
-        self.supabase_source = SupabaseSource(config)
-        self.validation_sources = self._initialize_sources()
+        self.journal = journal
+        # Offline agents only score and report on saved results
+        self.supabase_source = None if offline else SupabaseSource(config)
+        self.validation_sources = [] if offline else self._initialize_sources()
+        self.telemetry = Telemetry()
+        self.prometheus_path: Optional[Path] = None
+        # validation_report as one JSON document, or as an NDJSON stream
+        self.report_format = 'json'
+        self.compression = 'none'
+        self.profiler = Profiler(None, 'gita_scholar_agent')
+        for source in self.validation_sources:
+            if hasattr(source, 'http'):
+                source.http = InstrumentedHttp(source.http, self.telemetry, source.name)
         self.verse_validator = VerseValidator(self.validation_sources)
         self.chapter_validator = ChapterValidator(self.validation_sources)
         self.special_char_validator = SpecialCharValidator()
+        self.batch_char_scanner = BatchCharScanner(self.special_char_validator)
         self.quality_scorer = QualityScorer()
         self.report_generator = ReportGenerator()
 
@@ -80,10 +102,21 @@ class GitaScholarAgent:
 
         return sources
 
-    async def validate_all(self) -> Dict:
+    async def validate_all(self, shard: Optional[Tuple[int, int]] = None, mode: str = 'full',
+                           sample: Optional[Dict] = None, deadline: Optional[Dict] = None) -> Dict:
         """
         Run full validation on verses and chapters.
 
+        Args:
+            shard: Optional (index, count) - validate only this shard's verses
+                and chapters (see pipeline.sharding)
+            mode: full, verses (skip chapters) or chapters (skip verses)
+            sample: Optional stratified sample settings - size, seed,
+                confidence and previous_scores (verse key -> score)
+            deadline: Optional time box - seconds and previous (last run's
+                results); work is ordered by risk and whatever is left when
+                time runs out is carried over from the last run
+
         Returns:
             Dict containing validation results
         """
@@ -98,120 +131,357 @@ class GitaScholarAgent:
             'chapters': {},
             'special_chars': {},
             'quality_scores': {},
-            'summary': {}
+            'summary': {},
+            'mode': mode
         }
+        if deadline:
+            deadline['deadline_at'] = time.monotonic() + deadline['seconds']
+            results['deadline'] = deadline_report = {'seconds': deadline['seconds']}
+
+        include_verses = mode in ('full', 'verses', 'sample')
+        include_chapters = mode in ('full', 'chapters', 'sample')
+
+        # Phases form a small dependency graph: both fetches -> {verses,
+        # chapters, char scan} -> scoring -> summary. Independent phases overlap.
+        async def extract_verses():
+            if not include_verses:
+                return []
+            print(f"{Fore.CYAN}Phase 1: Extracting verses from Supabase...")
+            verses_data = await self.supabase_source.fetch_all_verses()
+            print(f"{Fore.GREEN}✓ Extracted {len(verses_data)} verses")
+
+            # Check verse count
+            if len(verses_data) != 700:
+                print(f"{Fore.RED}⚠ CRITICAL: Expected 700 verses, found {len(verses_data)}")
+                results['summary']['verse_count_issue'] = True
+
+            if shard:
+                verses_data = select_verses(verses_data, *shard)
+                print(f"{Fore.CYAN}Shard {shard[0]}/{shard[1]}: {len(verses_data)} verses assigned")
+
+            if sample:
+                verses_data, plan = draw_sample(
+                    verses_data, sample['size'], sample.get('previous_scores'), sample.get('seed')
+                )
+                results['sampling'] = {'plan': plan}
+                print(f"{Fore.CYAN}Sampling {plan['sample_size']} of {plan['population_size']} verses "
+                      f"({plan['allocation']} allocation across {len(plan['strata'])} chapters)")
+            return verses_data
+
+        async def extract_chapters():
+            if not include_chapters:
+                return []
+            print(f"{Fore.CYAN}Phase 1: Extracting chapters from Supabase...")
+            chapters_data = await self.supabase_source.fetch_all_chapters()
+            print(f"{Fore.GREEN}✓ Extracted {len(chapters_data)} chapters")
+
+            if shard:
+                chapters_data = select_chapters(chapters_data, *shard)
+                print(f"{Fore.CYAN}Shard {shard[0]}/{shard[1]}: {len(chapters_data)} chapters assigned")
+            return chapters_data
+
+        async def validate_verses(verses_data):
+            if not include_verses:
+                return {}
+            print(f"\n{Fore.CYAN}Phase 2: Validating verses against {len(self.validation_sources)} sources...")
+            return await self._validate_verses(verses_data, deadline)
+
+        async def validate_chapters(chapters_data):
+            if not include_chapters:
+                return {}
+            print(f"\n{Fore.CYAN}Phase 3: Validating chapter metadata...")
+            return await self._validate_chapters(chapters_data, deadline)
+
+        async def calculate_scores(verse_results, chapter_results, special_char_results):
+            results['verses'] = verse_results
+            results['chapters'] = chapter_results
+            results['special_chars'] = special_char_results
+
+            print(f"\n{Fore.CYAN}Phase 5: Calculating quality scores...")
+            results['quality_scores'] = self._calculate_quality_scores(results)
+            if sample:
+                self._estimate_from_sample(results, sample.get('confidence', 0.95))
+
+        async def summarize(_):
+            results['summary'] = self._generate_summary(results)
+            if shard:
+                results['shard'] = {'index': shard[0], 'count': shard[1]}
+
+        scheduler = PhaseScheduler(profiler=self.profiler)
+        # Sources and the Supabase client block on network I/O: run them in threads
+        scheduler.add_phase('extract_verses', extract_verses, executor='thread')
+        scheduler.add_phase('extract_chapters', extract_chapters, executor='thread')
+        scheduler.add_phase('validate_verses', validate_verses, ['extract_verses'], executor='thread')
+        scheduler.add_phase('validate_chapters', validate_chapters, ['extract_chapters'], executor='thread')
+        # CPU-bound scan runs in a worker process
+        scheduler.add_phase('scan_special_chars', self.batch_char_scanner.scan_content,
+                            ['extract_verses', 'extract_chapters'], executor='process')
+        scheduler.add_phase('calculate_scores', calculate_scores,
+                            ['validate_verses', 'validate_chapters', 'scan_special_chars'])
+        scheduler.add_phase('summarize', summarize, ['calculate_scores'])
+
+        await scheduler.run()
+        results['phase_timings'] = scheduler.timings
+        self.telemetry.record_phases(scheduler.timings)
+
+        if deadline:
+            for kind in ('verses', 'chapters'):
+                if kind in deadline:
+                    deadline_report[kind] = deadline[kind]
+                    print(f"{Fore.YELLOW}Deadline: {deadline[kind]['validated']} {kind} validated, "
+                          f"{len(deadline[kind]['carried_over'])} carried over, "
+                          f"{len(deadline[kind]['not_validated'])} not validated")
+
+        print(f"\n{Fore.CYAN}Phase timings:")
+        for name, timing in scheduler.timings.items():
+            if name != '_total':
+                print(f"  {name}: {timing['duration_seconds']:.2f}s (started at +{timing['start_offset_seconds']:.2f}s)")
+        print(f"  total: {scheduler.timings['_total']['duration_seconds']:.2f}s")
 
-        # Phase 1: Extract data from Supabase
-        print(f"{Fore.CYAN}Phase 1: Extracting data from Supabase...")
-        verses_data = await self.supabase_source.fetch_all_verses()
-        chapters_data = await self.supabase_source.fetch_all_chapters()
+        return results
 
-        print(f"{Fore.GREEN}✓ Extracted {len(verses_data)} verses")
-        print(f"{Fore.GREEN}✓ Extracted {len(chapters_data)} chapters\n")
+    @staticmethod
+    def find_report(output_dir: Path) -> Path:
+        """
+        The most recently written validation report in any format.
 
-        # Check verse count
-        if len(verses_data) != 700:
-            print(f"{Fore.RED}⚠ CRITICAL: Expected 700 verses, found {len(verses_data)}")
-            results['summary']['verse_count_issue'] = True
+        Falls back to validation_report.json when none exists yet.
+        """
+        base = output_dir / 'validation_report'
+        candidates = [output_dir / 'validation_report.json'] + [stream_path(base, c) for c in COMPRESSIONS]
+        existing = [path for path in candidates if path.exists()]
+        if not existing:
+            return candidates[0]
+        return max(existing, key=lambda path: path.stat().st_mtime)
+
+    @staticmethod
+    def load_results(path: Path) -> Dict:
+        """
+        Load a saved validation_report (JSON document or NDJSON stream).
 
-        # Phase 2: Validate verses
-        print(f"{Fore.CYAN}Phase 2: Validating verses against {len(self.validation_sources)} sources...")
-        verse_results = await self._validate_verses(verses_data)
-        results['verses'] = verse_results
+        JSON object keys are always strings, so chapter ids are restored to
+        integers to match freshly validated results.
+        """
+        if path.suffix == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+        else:
+            results = {'verses': {}, 'chapters': {}}
+            for record in NDJSONReader(path):
+                if record['type'] == 'run':
+                    results.update(record['data'])
+                elif record['type'] == 'verse':
+                    results['verses'][record['key']] = record['result']
+                elif record['type'] == 'chapter':
+                    results['chapters'][record['key']] = record['result']
+
+        results['chapters'] = {int(k): v for k, v in results.get('chapters', {}).items()}
+        return results
 
-        # Phase 3: Validate chapters
-        print(f"\n{Fore.CYAN}Phase 3: Validating chapter metadata...")
-        chapter_results = await self._validate_chapters(chapters_data)
-        results['chapters'] = chapter_results
+    def write_results_stream(self, results: Dict, output_dir: Path) -> Path:
+        """
+        Write validation results as NDJSON: one 'run' record with everything
+        except the per-item results, then one record per verse and chapter
+        keyed 'verse:<key>' / 'chapter:<n>' in the index.
+        """
+        path = stream_path(output_dir / 'validation_report', self.compression)
+        with NDJSONWriter(path, self.compression) as writer:
+            writer.write({
+                'type': 'run',
+                'data': {k: v for k, v in results.items() if k not in ('verses', 'chapters')}
+            })
+            for key, result in results['verses'].items():
+                writer.write({'type': 'verse', 'key': key, 'result': result}, key=f'verse:{key}')
+            for key, result in results['chapters'].items():
+                writer.write({'type': 'chapter', 'key': key, 'result': result}, key=f'chapter:{key}')
+        return path
+
+    def carry_over(self, results: Dict, previous: Dict) -> Dict:
+        """
+        Fill the half a partial mode skipped (verses or chapters) from a previous run.
 
-        # Phase 4: Special character scan
-        print(f"\n{Fore.CYAN}Phase 4: Scanning for dangerous special characters...")
-        special_char_results = self._scan_special_chars(verses_data, chapters_data)
-        results['special_chars'] = special_char_results
+        Args:
+            results: Results of a verses-only or chapters-only run
+            previous: Results of an earlier run (see load_results)
 
-        # Phase 5: Calculate quality scores
-        print(f"\n{Fore.CYAN}Phase 5: Calculating quality scores...")
-        quality_scores = self._calculate_quality_scores(results)
-        results['quality_scores'] = quality_scores
+        Returns:
+            The results, with 'carried_over' listing what was reused
+        """
+        special_chars = results['special_chars']
+        previous_chars = previous.get('special_chars', {})
+        carried = []
+
+        if results.get('mode') == 'verses' and previous.get('chapters'):
+            results['chapters'] = previous['chapters']
+            special_chars['chapters_with_issues'] = previous_chars.get('chapters_with_issues', [])
+            carried.append('chapters')
+        elif results.get('mode') == 'chapters' and previous.get('verses'):
+            results['verses'] = previous['verses']
+            special_chars['verses_with_issues'] = previous_chars.get('verses_with_issues', [])
+            special_chars['char_types'] = previous_chars.get('char_types', {})
+            carried.append('verses')
+
+        if carried:
+            special_chars['total_dangerous_chars'] = sum(
+                len(entry['issues'])
+                for section in ('verses_with_issues', 'chapters_with_issues')
+                for entry in special_chars[section]
+            )
+            results['carried_over'] = carried
+            self.score_and_summarize(results)
 
-        # Generate summary
-        results['summary'] = self._generate_summary(results)
+        return results
+
+    def _estimate_from_sample(self, results: Dict, confidence: float):
+        """Estimate corpus-wide quality from a stratified verse sample."""
+        sampling = results['sampling']
+        plan = sampling['plan']
+        scores_by_chapter: Dict[int, List[float]] = {}
+        critical_by_chapter: Dict[int, List[float]] = {}
+
+        for verse_key, score in results['quality_scores']['verse_scores'].items():
+            chapter = int(verse_key.split('.')[0])
+            scores_by_chapter.setdefault(chapter, []).append(score)
+            has_critical = bool(results['verses'][verse_key].get('critical_issues'))
+            critical_by_chapter.setdefault(chapter, []).append(100.0 if has_critical else 0.0)
+
+        verse_estimate = estimate_mean(plan, scores_by_chapter, confidence)
+        sampling['verse_score'] = verse_estimate
+        sampling['critical_issue_rate_percent'] = estimate_mean(plan, critical_by_chapter, confidence)
+
+        # Chapters are all validated, so only the verse part is uncertain
+        chapter_scores = list(results['quality_scores']['chapter_scores'].values())
+        if chapter_scores:
+            chapter_avg = sum(chapter_scores) / len(chapter_scores)
+            sampling['overall_score'] = {
+                'estimate': round(verse_estimate['estimate'] * 0.7 + chapter_avg * 0.3, 2),
+                'ci_low': round(verse_estimate['ci_low'] * 0.7 + chapter_avg * 0.3, 2),
+                'ci_high': round(verse_estimate['ci_high'] * 0.7 + chapter_avg * 0.3, 2),
+                'confidence': confidence
+            }
+        else:
+            sampling['overall_score'] = verse_estimate
+        results['quality_scores']['overall_score'] = sampling['overall_score']['estimate']
 
+    def score_and_summarize(self, results: Dict) -> Dict:
+        """Calculate quality scores and the summary for existing validation results."""
+        results['quality_scores'] = self._calculate_quality_scores(results)
+        results['summary'] = self._generate_summary(results)
         return results
 
-    async def _validate_verses(self, verses_data: List[Dict]) -> Dict:
-        """Validate all verses."""
+    async def _validate_verses(self, verses_data: List[Dict], deadline: Optional[Dict] = None) -> Dict:
+        """
+        Validate all verses.
+
+        With a deadline, verses are validated highest risk first until time
+        runs out; the rest reuse the last run's result, marked carried_over.
+        """
         results = {}
+        queue = None
+        work = verses_data
+
+        if deadline:
+            previous = deadline['previous']
+            previous_verses = previous.get('verses', {})
+            previous_scores = previous.get('quality_scores', {}).get('verse_scores', {})
 
-        for verse in tqdm(verses_data, desc="Validating verses"):
+            def risk(verse):
+                verse_key = f"{verse['gv_chapter_id']}.{verse['gv_verses_id']}"
+                return verse_risk(verse, previous_verses.get(verse_key), previous_scores.get(verse_key),
+                                  previous.get('validation_date'))
+
+            queue = work = RiskQueue(verses_data, risk, deadline['deadline_at'])
+
+        for verse in tqdm(work, total=len(verses_data), desc="Validating verses"):
             chapter_id = verse['gv_chapter_id']
             verse_id = verse['gv_verses_id']
             verse_key = f"{chapter_id}.{verse_id}"
 
+            # Completed in an interrupted earlier run
+            if self.journal:
+                journaled = self.journal.get('verse', verse_key)
+                self.telemetry.record_cache('journal', journaled is not None)
+                if journaled is not None:
+                    results[verse_key] = journaled
+                    continue
+
             validation_result = await self.verse_validator.validate(verse)
             results[verse_key] = validation_result
+            if self.journal:
+                self.journal.record('verse', verse_key, validation_result)
+
+        if queue is not None:
+            carried = self._carry_over_remaining(
+                queue, results, previous_verses,
+                lambda verse: f"{verse['gv_chapter_id']}.{verse['gv_verses_id']}"
+            )
+            deadline['verses'] = {'validated': len(results) - len(carried['carried_over']), **carried}
+
+            # Report in the usual chapter/verse order
+            order = {f"{v['gv_chapter_id']}.{v['gv_verses_id']}": idx for idx, v in enumerate(verses_data)}
+            results = dict(sorted(results.items(), key=lambda item: order[item[0]]))
 
         return results
 
-    async def _validate_chapters(self, chapters_data: List[Dict]) -> Dict:
-        """Validate all chapter metadata."""
+    async def _validate_chapters(self, chapters_data: List[Dict], deadline: Optional[Dict] = None) -> Dict:
+        """Validate all chapter metadata (deadline handling as for verses)."""
         results = {}
+        queue = None
+        work = chapters_data
+
+        if deadline:
+            previous_chapters = deadline['previous'].get('chapters', {})
+            previous_scores = deadline['previous'].get('quality_scores', {}).get('chapter_scores', {})
+
+            def risk(chapter):
+                chapter_id = chapter['ch_chapter_id']
+                # Saved reports have string keys
+                previous_score = previous_scores.get(chapter_id, previous_scores.get(str(chapter_id)))
+                return chapter_risk(previous_chapters.get(chapter_id), previous_score)
 
-        for chapter in tqdm(chapters_data, desc="Validating chapters"):
+            queue = work = RiskQueue(chapters_data, risk, deadline['deadline_at'])
+
+        for chapter in tqdm(work, total=len(chapters_data), desc="Validating chapters"):
             chapter_id = chapter['ch_chapter_id']
 
+            if self.journal:
+                journaled = self.journal.get('chapter', chapter_id)
+                self.telemetry.record_cache('journal', journaled is not None)
+                if journaled is not None:
+                    results[chapter_id] = journaled
+                    continue
+
             validation_result = await self.chapter_validator.validate(chapter)
             results[chapter_id] = validation_result
+            if self.journal:
+                self.journal.record('chapter', chapter_id, validation_result)
+
+        if queue is not None:
+            carried = self._carry_over_remaining(
+                queue, results, previous_chapters, lambda chapter: chapter['ch_chapter_id']
+            )
+            deadline['chapters'] = {'validated': len(results) - len(carried['carried_over']), **carried}
+            results = dict(sorted(results.items()))
 
         return results
 
+    @staticmethod
+    def _carry_over_remaining(queue: RiskQueue, results: Dict, previous_results: Dict, key_of) -> Dict:
+        """Fill items the deadline cut off with the last run's results."""
+        carried_over = []
+        not_validated = []
+        for item in queue.remaining():
+            key = key_of(item)
+            if key in previous_results:
+                results[key] = {**previous_results[key], 'carried_over': True}
+                carried_over.append(key)
+            else:
+                not_validated.append(key)
+        return {'carried_over': carried_over, 'not_validated': not_validated}
+
     def _scan_special_chars(self, verses_data: List[Dict], chapters_data: List[Dict]) -> Dict:
         """Scan for dangerous special characters."""
-        results = {
-            'verses_with_issues': [],
-            'chapters_with_issues': [],
-            'total_dangerous_chars': 0,
-            'char_types': {}
-        }
-
-        # Scan verses
-        for verse in verses_data:
-            issues = self.special_char_validator.validate_text(verse['gv_verses'])
-            if issues:
-                verse_key = f"{verse['gv_chapter_id']}.{verse['gv_verses_id']}"
-                results['verses_with_issues'].append({
-                    'verse': verse_key,
-                    'issues': issues
-                })
-                results['total_dangerous_chars'] += len(issues)
-                for issue in issues:
-                    char_type = issue['type']
-                    results['char_types'][char_type] = results['char_types'].get(char_type, 0) + 1
-
-        # Scan chapters
-        for chapter in chapters_data:
-            fields_to_check = [
-                ('ch_title', chapter.get('ch_title', '')),
-                ('ch_subtitle', chapter.get('ch_subtitle', '')),
-                ('ch_summary', chapter.get('ch_summary', '')),
-                ('ch_theme', chapter.get('ch_theme', ''))
-            ]
-
-            chapter_issues = []
-            for field_name, field_value in fields_to_check:
-                if field_value:
-                    issues = self.special_char_validator.validate_text(field_value)
-                    if issues:
-                        chapter_issues.extend([{**issue, 'field': field_name} for issue in issues])
-
-            if chapter_issues:
-                results['chapters_with_issues'].append({
-                    'chapter_id': chapter['ch_chapter_id'],
-                    'issues': chapter_issues
-                })
-                results['total_dangerous_chars'] += len(chapter_issues)
-
-        return results
+        return self.batch_char_scanner.scan_content(verses_data, chapters_data)
 
     def _calculate_quality_scores(self, validation_results: Dict) -> Dict:
         """Calculate quality scores for all content."""
@@ -219,28 +489,47 @@ class GitaScholarAgent:
             'overall_score': 0,
             'verse_scores': {},
             'chapter_scores': {},
+            'score_matrix': {},
             'breakdown': {}
         }
 
+        # Index special character results once, then score in bulk
+        special_chars = validation_results['special_chars']
+        char_index = self.quality_scorer.build_char_index(special_chars)
+
         # Calculate verse scores
-        verse_scores = []
-        for verse_key, verse_result in validation_results['verses'].items():
-            score = self.quality_scorer.calculate_verse_score(
-                verse_result,
-                validation_results['special_chars']
-            )
-            scores['verse_scores'][verse_key] = score
-            verse_scores.append(score)
+        verse_keys = list(validation_results['verses'])
+        verse_scoring = self.quality_scorer.score_verses(
+            list(validation_results['verses'].values()),
+            special_chars,
+            char_index
+        )
+        verse_scores = verse_scoring['scores']
+        scores['verse_scores'] = dict(zip(verse_keys, verse_scores))
 
         # Calculate chapter scores
-        chapter_scores = []
-        for chapter_id, chapter_result in validation_results['chapters'].items():
-            score = self.quality_scorer.calculate_chapter_score(
-                chapter_result,
-                validation_results['special_chars']
-            )
-            scores['chapter_scores'][chapter_id] = score
-            chapter_scores.append(score)
+        chapter_ids = list(validation_results['chapters'])
+        chapter_scoring = self.quality_scorer.score_chapters(
+            list(validation_results['chapters'].values()),
+            special_chars,
+            char_index
+        )
+        chapter_scores = chapter_scoring['scores']
+        scores['chapter_scores'] = dict(zip(chapter_ids, chapter_scores))
+
+        # Per-component points for downstream reports
+        scores['score_matrix'] = {
+            'verses': {
+                'components': verse_scoring['components'],
+                'keys': verse_keys,
+                'rows': verse_scoring['matrix'].round(4).tolist()
+            },
+            'chapters': {
+                'components': chapter_scoring['components'],
+                'keys': chapter_ids,
+                'rows': chapter_scoring['matrix'].round(4).tolist()
+            }
+        }
 
         # Overall score
         if verse_scores and chapter_scores:
@@ -248,6 +537,10 @@ class GitaScholarAgent:
                 sum(verse_scores) / len(verse_scores) * 0.7 +
                 sum(chapter_scores) / len(chapter_scores) * 0.3
             )
+        elif validation_results.get('mode') == 'verses' and verse_scores:
+            scores['overall_score'] = sum(verse_scores) / len(verse_scores)
+        elif validation_results.get('mode') == 'chapters' and chapter_scores:
+            scores['overall_score'] = sum(chapter_scores) / len(chapter_scores)
 
         scores['breakdown'] = {
             'avg_verse_score': sum(verse_scores) / len(verse_scores) if verse_scores else 0,
@@ -260,13 +553,15 @@ class GitaScholarAgent:
 
     def _generate_summary(self, results: Dict) -> Dict:
         """Generate summary statistics."""
+        # A chapters-only run has no verses to count unless they were carried over
+        verses_checked = results.get('mode') != 'chapters' or 'verses' in results.get('carried_over', [])
         summary = {
             'total_verses_analyzed': len(results['verses']),
             'total_chapters_analyzed': len(results['chapters']),
             'overall_quality_score': results['quality_scores']['overall_score'],
             'critical_issues_count': 0,
             'warnings_count': 0,
-            'verse_count_correct': len(results['verses']) == 700
+            'verse_count_correct': len(results['verses']) == 700 if verses_checked else None
         }
 
         # Count issues
@@ -289,12 +584,23 @@ class GitaScholarAgent:
 
     async def generate_reports(self, results: Dict, output_dir: Path):
         """Generate all output reports."""
+        with self.profiler.phase('generate_reports'):
+            self._write_reports(results, output_dir)
+
+        # Print summary
+        self._print_summary(results['summary'], results['quality_scores'])
+
+    def _write_reports(self, results: Dict, output_dir: Path):
+        """Write the JSON, SQL, HTML and metrics files."""
         print(f"\n{Fore.CYAN}Generating reports...")
 
         # JSON report
-        json_path = output_dir / 'validation_report.json'
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        if self.report_format == 'ndjson':
+            json_path = self.write_results_stream(results, output_dir)
+        else:
+            json_path = output_dir / 'validation_report.json'
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
         print(f"{Fore.GREEN}✓ Saved: {json_path}")
 
         # SQL fix script
@@ -306,7 +612,8 @@ class GitaScholarAgent:
 
         # HTML dashboard
         html_path = output_dir / 'quality_dashboard.html'
-        html_content = self.report_generator.generate_html_dashboard(results)
+        tables = self.report_generator.write_detail_chunks(results, output_dir / 'quality_dashboard_data')
+        html_content = self.report_generator.generate_html_dashboard(results, tables)
         with open(html_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         print(f"{Fore.GREEN}✓ Saved: {html_path}")
@@ -317,8 +624,19 @@ class GitaScholarAgent:
             json.dump(results['special_chars'], f, indent=2, ensure_ascii=False)
         print(f"{Fore.GREEN}✓ Saved: {chars_path}")
 
-        # Print summary
-        self._print_summary(results['summary'], results['quality_scores'])
+        # Run metrics (only when this agent ran a validation)
+        if self.telemetry.phases:
+            self.write_metrics(output_dir)
+
+    def write_metrics(self, output_dir: Path, filename: str = 'metrics.json'):
+        """Write run telemetry as JSON, plus the Prometheus textfile if configured."""
+        metrics_path = output_dir / filename
+        self.telemetry.write_json(metrics_path)
+        print(f"{Fore.GREEN}✓ Saved: {metrics_path}")
+
+        if self.prometheus_path:
+            self.telemetry.write_prometheus(self.prometheus_path)
+            print(f"{Fore.GREEN}✓ Saved: {self.prometheus_path}")
 
     def _print_summary(self, summary: Dict, quality_scores: Dict):
         """Print validation summary to console."""
@@ -359,7 +677,9 @@ class GitaScholarAgent:
             print(f"{Fore.GREEN}Dangerous Characters: 0")
 
         # Verse count check
-        if not summary['verse_count_correct']:
+        if summary['verse_count_correct'] is None:
+            print(f"\n{Fore.YELLOW}Verse count not checked (verses not validated in this run)")
+        elif not summary['verse_count_correct']:
             print(f"\n{Fore.RED}⚠ CRITICAL: Verse count mismatch!")
         else:
             print(f"\n{Fore.GREEN}✓ Verse count correct (700 verses)")
@@ -374,9 +694,10 @@ async def main():
     )
     parser.add_argument(
         '--mode',
-        choices=['full', 'verses', 'chapters', 'report'],
+        choices=['full', 'verses', 'chapters', 'report', 'merge', 'sample'],
         default='full',
-        help='Validation mode (default: full)'
+        help='Validation mode (default: full); merge combines shard outputs, '
+             'sample estimates quality from a stratified verse sample'
     )
     parser.add_argument(
         '--output-dir',
@@ -384,9 +705,108 @@ async def main():
         default='./output',
         help='Output directory for reports (default: ./output)'
     )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted run from its journal instead of starting over'
+    )
+    parser.add_argument(
+        '--shard',
+        type=str,
+        help='Validate only shard i of N (e.g. 1/4) and write a partial result file'
+    )
+    parser.add_argument(
+        '--sample-size',
+        type=int,
+        default=70,
+        help='Number of verses to validate in sample mode (default: 70)'
+    )
+    parser.add_argument(
+        '--confidence',
+        type=float,
+        default=0.95,
+        help='Confidence level of sample mode intervals (default: 0.95)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Random seed for a reproducible sample'
+    )
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        help='Time budget in seconds: validate highest-risk items first and '
+             'carry the rest over from the last run'
+    )
+    parser.add_argument(
+        '--prometheus-textfile',
+        type=str,
+        help='Also write run metrics to this Prometheus textfile (e.g. for node_exporter)'
+    )
+    parser.add_argument(
+        '--report-format',
+        choices=['json', 'ndjson'],
+        default='json',
+        help='Write validation_report as one JSON document or as an indexed NDJSON stream (default: json)'
+    )
+    parser.add_argument(
+        '--compress',
+        choices=COMPRESSIONS,
+        default='none',
+        help='Compression of NDJSON reports (zstd needs the zstandard package; default: none)'
+    )
+    add_profile_argument(parser)
 
     args = parser.parse_args()
 
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+
+    try:
+        check_compression(args.compress)
+    except ValueError as e:
+        parser.error(str(e))
+
+    output_dir = Path(args.output_dir)
+    shard_dir = output_dir / 'shards'
+    profiler = Profiler(args.profile, 'gita_scholar_agent', output_dir / 'profiles')
+    report_path = GitaScholarAgent.find_report(output_dir)
+
+    # Regenerate reports from the last saved run (no network needed)
+    if args.mode == 'report':
+        if not report_path.exists():
+            print(f"{Fore.RED}Error: {report_path} not found - run a validation first")
+            sys.exit(1)
+
+        agent = GitaScholarAgent({}, offline=True)
+        agent.profiler = profiler
+        agent.report_format, agent.compression = args.report_format, args.compress
+        results = agent.load_results(report_path)
+        agent.score_and_summarize(results)
+        await agent.generate_reports(results, output_dir)
+        return
+
+    # Merge shard outputs into the standard reports (no network needed)
+    if args.mode == 'merge':
+        try:
+            results = merge_shards(shard_dir)
+        except ValueError as e:
+            print(f"{Fore.RED}Error: {e}")
+            sys.exit(1)
+
+        print(f"{Fore.GREEN}✓ Merged {results['shards_merged']} shards: "
+              f"{len(results['verses'])} verses, {len(results['chapters'])} chapters")
+        agent = GitaScholarAgent({}, offline=True)
+        agent.profiler = profiler
+        agent.report_format, agent.compression = args.report_format, args.compress
+        agent.score_and_summarize(results)
+        await agent.generate_reports(results, output_dir)
+        return
+
     # Load environment variables
     load_dotenv()
 
@@ -403,17 +823,82 @@ async def main():
         sys.exit(1)
 
     # Create output directory
-    output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Checkpoint journal: completed verses/chapters survive a crash
+    journal_name = f'validation_journal_shard_{shard[0]}_of_{shard[1]}.jsonl' if shard else 'validation_journal.jsonl'
+    journal = RunJournal(output_dir / journal_name, resume=args.resume)
+    if args.resume:
+        print(f"{Fore.CYAN}Resuming: {journal.count('verse')} verses and "
+              f"{journal.count('chapter')} chapters already validated")
+
     # Initialize agent
-    agent = GitaScholarAgent(config)
+    agent = GitaScholarAgent(config, journal)
+    agent.profiler = profiler
+    agent.report_format, agent.compression = args.report_format, args.compress
+    if args.prometheus_textfile:
+        agent.prometheus_path = Path(args.prometheus_textfile)
+
+    # Sample mode weights chapters by the spread of their previous scores
+    sample = None
+    if args.mode == 'sample':
+        previous_scores = {}
+        if report_path.exists():
+            previous_scores = agent.load_results(report_path).get('quality_scores', {}).get('verse_scores', {})
+        sample = {
+            'size': args.sample_size,
+            'seed': args.seed,
+            'confidence': args.confidence,
+            'previous_scores': previous_scores
+        }
+
+    deadline = None
+    if args.deadline:
+        previous = agent.load_results(report_path) if report_path.exists() else {}
+        deadline = {'seconds': args.deadline, 'previous': previous}
 
     # Run validation
-    results = await agent.validate_all()
+    try:
+        results = await agent.validate_all(shard, args.mode, sample, deadline)
+    finally:
+        journal.close()
+
+    # Samples never replace the full report
+    if sample:
+        sample_path = output_dir / 'sample_report.json'
+        with open(sample_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+        overall = results['sampling']['overall_score']
+        print(f"\n{Fore.CYAN}Estimated overall quality: {overall['estimate']:.2f}/100 "
+              f"({overall['confidence']:.0%} CI {overall['ci_low']:.2f} - {overall['ci_high']:.2f})")
+        critical_rate = results['sampling']['critical_issue_rate_percent']
+        print(f"{Fore.CYAN}Estimated verses with critical issues: {critical_rate['estimate']:.1f}% "
+              f"(CI {critical_rate['ci_low']:.1f}% - {critical_rate['ci_high']:.1f}%)")
+        print(f"{Fore.GREEN}✓ Saved: {sample_path}")
+        agent.write_metrics(output_dir, 'sample_metrics.json')
+        journal.complete()
+        return
+
+    # Shards only save partial results; reports come from the merge
+    if shard:
+        path = write_shard(results, shard_dir, *shard)
+        print(f"\n{Fore.GREEN}✓ Shard {shard[0]}/{shard[1]} saved: {path}")
+        agent.write_metrics(shard_dir, f'metrics_shard_{shard[0]}_of_{shard[1]}.json')
+        journal.complete()
+        print(f"Run with --mode merge once all {shard[1]} shards are done")
+        return
+
+    # Partial modes reuse the other half from the previous run, if any
+    if args.mode in ('verses', 'chapters') and report_path.exists():
+        agent.carry_over(results, agent.load_results(report_path))
+        if results.get('carried_over'):
+            print(f"{Fore.CYAN}Reused {', '.join(results['carried_over'])} from {report_path}")
 
     # Generate reports
     await agent.generate_reports(results, output_dir)
+    # The run is saved: a later --resume must not replay it
+    journal.complete()
 
     print(f"\n{Fore.GREEN}✓ Validation complete!")
     print(f"Reports saved to: {output_dir.absolute()}")
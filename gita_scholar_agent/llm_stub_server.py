@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Anthropic Messages and Message Batches APIs.
+
+Answers with canned or rule-generated action steps in the same
+request/response shapes as the real API, so the AI scripts (online and
+--batch-api) can be run, tested and timed without network or API keys.
+
+Usage:
+    python llm_stub_server.py --port 8089 --batch-seconds 10
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8089 ANTHROPIC_API_KEY=stub \\
+        python generate_conversational_steps.py --batch-api --poll-interval 2
+    python llm_stub_server.py --error-rate 0.1 --latency-ms 800    # exercise retries and concurrency
+    curl http://127.0.0.1:8089/stats
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from pipeline.llm_stub import StubAnthropicServer, StubResponder
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for the Anthropic Messages API')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8089, help='Port (default: 8089)')
+    parser.add_argument('--canned', type=Path,
+                        help='JSON list of {"match": substring, "text": reply} used before the generated replies')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Delay before answering each /v1/messages request (default: 0)')
+    parser.add_argument('--batch-seconds', type=float, default=5.0,
+                        help='Time until a submitted batch ends (default: 5)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Share of requests answered with 429/529, or errored in batches (default: 0)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for error injection (default: 0)')
+    args = parser.parse_args()
+
+    responder = StubResponder.from_file(args.canned, args.error_rate, args.seed)
+    server = StubAnthropicServer(responder, args.host, args.port, args.latency_ms, args.batch_seconds)
+
+    print(f"🤖 Stub Messages API listening on {server.url}")
+    print(f"   export ANTHROPIC_BASE_URL={server.url} ANTHROPIC_API_KEY=stub")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"\n📊 Served: {json.dumps(server.counters)}")
+
+
+if __name__ == '__main__':
+    main()
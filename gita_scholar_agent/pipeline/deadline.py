@@ -0,0 +1,117 @@
+"""
+Deadline - Risk-ordered work queue for time-boxed validation runs
+"""
+
+import heapq
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Most quoted verses: an error here is the most visible
+HIGH_TRAFFIC_VERSES = {
+    '2.47', '18.66', '2.20', '2.22', '2.14', '4.7', '4.8', '3.35', '6.5', '9.22', '12.13', '18.78'
+}
+
+# Risk points
+UNVALIDATED_RISK = 100
+EDITED_RISK = 50
+HIGH_TRAFFIC_RISK = 25
+CRITICAL_ISSUE_RISK = 20
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp, ignoring timezone, or return None."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def verse_risk(verse: Dict, previous_result: Optional[Dict], previous_score: Optional[float],
+               previous_date: Optional[str] = None) -> float:
+    """
+    Risk of a verse being wrong, from the last run's results.
+
+    - Never validated: UNVALIDATED_RISK, otherwise 100 - previous score
+    - Edited since the last run (text changed or updated_at newer): + EDITED_RISK
+    - High-traffic verse: + HIGH_TRAFFIC_RISK
+    - Critical issues last time: + CRITICAL_ISSUE_RISK
+
+    Args:
+        verse: Verse row from Supabase
+        previous_result: Verse result from the last run
+        previous_score: Verse quality score from the last run
+        previous_date: validation_date of the last run
+
+    Returns:
+        Risk points (higher is validated first)
+    """
+    verse_key = f"{verse['gv_chapter_id']}.{verse['gv_verses_id']}"
+    if previous_result is None or previous_score is None:
+        risk = UNVALIDATED_RISK
+    else:
+        risk = 100 - previous_score
+        if previous_result.get('critical_issues'):
+            risk += CRITICAL_ISSUE_RISK
+
+    edited = previous_result is not None and previous_result.get('text') != verse.get('gv_verses')
+    updated_at = _parse_time(verse.get('updated_at'))
+    last_run = _parse_time(previous_date)
+    if updated_at and last_run and updated_at > last_run:
+        edited = True
+    if edited:
+        risk += EDITED_RISK
+
+    if verse_key in HIGH_TRAFFIC_VERSES:
+        risk += HIGH_TRAFFIC_RISK
+
+    return risk
+
+
+def chapter_risk(previous_result: Optional[Dict], previous_score: Optional[float]) -> float:
+    """Risk of a chapter being wrong (see verse_risk)."""
+    if previous_result is None or previous_score is None:
+        return UNVALIDATED_RISK
+    risk = 100 - previous_score
+    if previous_result.get('critical_issues'):
+        risk += CRITICAL_ISSUE_RISK
+    return risk
+
+
+class RiskQueue:
+    """
+    Priority queue that hands out items highest risk first until a deadline.
+
+    Items with equal risk keep their input order.
+    """
+
+    def __init__(self, items: List[Any], risk: Callable[[Any], float],
+                 deadline_at: Optional[float] = None):
+        """
+        Args:
+            items: Work items
+            risk: Risk of an item
+            deadline_at: time.monotonic() value after which no new item starts
+        """
+        self.deadline_at = deadline_at
+        self._heap: List[Tuple[float, int, Any]] = [
+            (-risk(item), idx, item) for idx, item in enumerate(items)
+        ]
+        heapq.heapify(self._heap)
+
+    def __iter__(self) -> Iterator[Any]:
+        while self._heap and not self.expired():
+            yield heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.deadline_at is not None and time.monotonic() >= self.deadline_at
+
+    def remaining(self) -> List[Any]:
+        """Items not handed out, highest risk first."""
+        return [entry[2] for entry in sorted(self._heap)]
@@ -0,0 +1,352 @@
+"""
+LLM Batch - Runs many Messages API requests concurrently within rate limits
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from pipeline.llm_cache import DEFAULT_CACHE_FILE, ResponseCache, cache_key
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, overload, server errors
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Defaults sized for a low API usage tier; raise them to match your limits
+DEFAULT_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_MINUTE = 50
+DEFAULT_INPUT_TOKENS_PER_MINUTE = 30000
+DEFAULT_OUTPUT_TOKENS_PER_MINUTE = 8000
+DEFAULT_MAX_RETRIES = 6
+
+
+def estimate_tokens(request: Dict) -> int:
+    """Rough input token count of a request (about 4 characters per token)."""
+    chars = len(str(request.get('system', '')))
+    for message in request.get('messages', []):
+        content = message.get('content', '')
+        if isinstance(content, list):
+            chars += sum(len(block.get('text', '')) for block in content if isinstance(block, dict))
+        else:
+            chars += len(content)
+    return chars // 4 + 1
+
+
+def request_cache_key(request: Dict) -> str:
+    """Cache key of a request with no explicit one: the whole request is the input."""
+    params = {name: value for name, value in request.items() if name != 'model'}
+    return cache_key(request.get('model', ''), 'request', params)
+
+
+def extract_json(text: str) -> Any:
+    """Parse a JSON reply, tolerating a surrounding ```json code fence."""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else text[3:]
+        if text.rstrip().endswith('```'):
+            text = text.rstrip()[:-3]
+        if text.startswith('json'):
+            text = text[4:]
+    return json.loads(text)
+
+
+class RateLimiter:
+    """
+    Token bucket holding up to `per_minute` units, refilled continuously.
+
+    Waiters are served in arrival order. `adjust` corrects an earlier
+    estimate once the real cost is known, and may leave the bucket in debt.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float):
+        """Wait until `amount` units are available and take them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.level >= amount:
+                    self.level -= amount
+                    return
+                # Wake up at least every second to pick up units returned by adjust()
+                await asyncio.sleep(min(1.0, (amount - self.level) / self.rate))
+
+    def adjust(self, delta: float):
+        """Take `delta` more units (or give some back when negative)."""
+        self._refill()
+        self.level = min(self.capacity, self.level - delta)
+
+
+def add_batch_arguments(parser: argparse.ArgumentParser):
+    """Add the shared concurrency, rate limit and resume options to a parser."""
+    group = parser.add_argument_group('LLM batch')
+    group.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'Requests in flight at once (default: {DEFAULT_CONCURRENCY})')
+    group.add_argument('--rpm', type=int, default=DEFAULT_REQUESTS_PER_MINUTE,
+                       help=f'Requests per minute (default: {DEFAULT_REQUESTS_PER_MINUTE})')
+    group.add_argument('--input-tpm', type=int, default=DEFAULT_INPUT_TOKENS_PER_MINUTE,
+                       help=f'Input tokens per minute (default: {DEFAULT_INPUT_TOKENS_PER_MINUTE})')
+    group.add_argument('--output-tpm', type=int, default=DEFAULT_OUTPUT_TOKENS_PER_MINUTE,
+                       help=f'Output tokens per minute (default: {DEFAULT_OUTPUT_TOKENS_PER_MINUTE})')
+    group.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES,
+                       help=f'Retries per request on rate limit / server errors (default: {DEFAULT_MAX_RETRIES})')
+    group.add_argument('--resume', action='store_true',
+                       help='Reuse successful results from the previous results file')
+    group.add_argument('--cache-file', type=Path, default=DEFAULT_CACHE_FILE,
+                       help='Response cache (default: output/llm_cache.sqlite3)')
+    group.add_argument('--no-cache', action='store_true', help='Always call the API; do not read or write the cache')
+
+
+class LLMBatchRunner:
+    """
+    Sends Messages API requests with bounded concurrency.
+
+    - At most `concurrency` requests are in flight.
+    - Requests, input tokens and output tokens per minute are limited by
+      token buckets. Token costs are estimated up front (output at
+      max_tokens) and corrected from the usage the API reports.
+    - Rate limit, overload, timeout and 5xx errors are retried with
+      exponential backoff and jitter. A retry-after header is honoured, and
+      a 429 pauses every worker, not just the one that hit it.
+    - Results are written to a JSONL file in input order as they complete.
+      Items run at most `concurrency * 4` ahead of the oldest unfinished
+      one, so the reorder buffer stays small.
+    - With a ResponseCache, cached responses are used without calling the
+      API and new successful responses are stored.
+
+    Works with any client whose `messages.create(**request)` coroutine
+    returns an object with `content` blocks and `usage`, e.g.
+    anthropic.AsyncAnthropic(max_retries=0).
+    """
+
+    def __init__(self, client, concurrency: int = DEFAULT_CONCURRENCY,
+                 requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+                 input_tokens_per_minute: int = DEFAULT_INPUT_TOKENS_PER_MINUTE,
+                 output_tokens_per_minute: int = DEFAULT_OUTPUT_TOKENS_PER_MINUTE,
+                 max_retries: int = DEFAULT_MAX_RETRIES, base_delay: float = 1.0, max_delay: float = 60.0,
+                 cache: Optional[ResponseCache] = None):
+        self.client = client
+        self.cache = cache
+        self.concurrency = max(1, concurrency)
+        self.limits = {
+            'requests': RateLimiter(requests_per_minute),
+            'input_tokens': RateLimiter(input_tokens_per_minute),
+            'output_tokens': RateLimiter(output_tokens_per_minute)
+        }
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._paused_until = 0.0
+
+    @classmethod
+    def from_args(cls, client, args: argparse.Namespace) -> 'LLMBatchRunner':
+        """Build a runner from the options added by add_batch_arguments()."""
+        cache = None if args.no_cache else ResponseCache(args.cache_file)
+        return cls(client, args.concurrency, args.rpm, args.input_tpm, args.output_tpm, args.max_retries,
+                   cache=cache)
+
+    def close(self):
+        """Close the response cache, if any."""
+        if self.cache is not None:
+            self.cache.close()
+
+    async def run(self, items: Iterable[Tuple[Any, Dict]], output_path: Path, resume: bool = False,
+                  progress: Optional[Callable[[Dict, int], None]] = None, use_cache: bool = True) -> Dict:
+        """
+        Run every request and write one result record per item, in order.
+
+        Args:
+            items: (key, request) or (key, request, cache_key) tuples;
+                request is the keyword arguments for messages.create. Without
+                a cache_key the whole request is hashed.
+            output_path: Results file (JSONL)
+            resume: Reuse records with status 'ok' from an existing results
+                file instead of sending those requests again
+            progress: Called with each record and the number written so far
+            use_cache: Consult and fill the response cache (callers that
+                cache per item, like PromptPacker, turn this off)
+
+        Returns:
+            Stats: items, ok, errors, reused, cache hits/misses, retries,
+            tokens and seconds
+
+        Record fields: key, status ('ok' or 'error'), text, usage, attempts,
+        error, cache_key, cached
+        """
+        output_path = Path(output_path)
+        partial_path = output_path.with_name(output_path.name + '.partial')
+        reused = self._previous_results(output_path, partial_path) if resume else {}
+        cache = self.cache if use_cache else None
+
+        stats = {'items': 0, 'ok': 0, 'errors': 0, 'reused': 0, 'cache_hits': 0, 'cache_misses': 0,
+                 'retries': 0, 'input_tokens': 0, 'output_tokens': 0, 'seconds': 0.0}
+        started = time.monotonic()
+
+        pending: Dict[int, Dict] = {}
+        state = {'next_index': 0, 'written': 0, 'exhausted': False}
+        window = self.concurrency * 4
+        condition = asyncio.Condition()
+        source = iter(items)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(partial_path, 'w', encoding='utf-8') as out:
+
+            def write_ready():
+                while state['written'] in pending:
+                    record = pending.pop(state['written'])
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    state['written'] += 1
+                    stats['ok' if record['status'] == 'ok' else 'errors'] += 1
+                    if progress:
+                        progress(record, state['written'])
+                out.flush()
+
+            async def worker():
+                while True:
+                    async with condition:
+                        await condition.wait_for(
+                            lambda: state['exhausted'] or state['next_index'] - state['written'] < window)
+                        if state['exhausted']:
+                            return
+                        try:
+                            key, request, *address = next(source)
+                        except StopIteration:
+                            state['exhausted'] = True
+                            condition.notify_all()
+                            return
+                        index = state['next_index']
+                        state['next_index'] += 1
+
+                    address = address[0] if address else request_cache_key(request)
+                    if str(key) in reused:
+                        record = reused[str(key)]
+                        stats['reused'] += 1
+                    else:
+                        record = await self._cached_call(key, request, address, cache, stats)
+
+                    async with condition:
+                        pending[index] = record
+                        write_ready()
+                        condition.notify_all()
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+        os.replace(partial_path, output_path)
+        stats['items'] = state['written']
+        stats['seconds'] = round(time.monotonic() - started, 3)
+        return stats
+
+    @staticmethod
+    def _previous_results(*paths: Path) -> Dict[str, Dict]:
+        """Successful records from earlier runs (an interrupted run's partial file wins)."""
+        records = {}
+        for path in paths:
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get('status') == 'ok':
+                        records[str(record['key'])] = record
+        return records
+
+    async def _cached_call(self, key: Any, request: Dict, address: str, cache: Optional[ResponseCache],
+                           stats: Dict) -> Dict:
+        """Answer from the cache, or call the API and cache a success."""
+        entry = cache.get(address) if cache is not None else None
+        if entry is not None:
+            stats['cache_hits'] += 1
+            record = {'key': key, 'status': 'ok', 'text': entry['text'], 'usage': entry['usage'],
+                      'attempts': 0, 'error': None}
+        else:
+            if cache is not None:
+                stats['cache_misses'] += 1
+            record = await self._call(key, request, stats)
+            if cache is not None and record['status'] == 'ok':
+                cache.put(address, request.get('model', ''), record['text'], record['usage'])
+
+        record['cache_key'] = address
+        record['cached'] = entry is not None
+        return record
+
+    async def _call(self, key: Any, request: Dict, stats: Dict) -> Dict:
+        """One request with rate limiting and retries."""
+        input_estimate = estimate_tokens(request)
+        output_estimate = request.get('max_tokens', 1024)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            await self.limits['requests'].acquire(1)
+            await self.limits['input_tokens'].acquire(input_estimate)
+            await self.limits['output_tokens'].acquire(output_estimate)
+
+            try:
+                message = await self.client.messages.create(**request)
+            except Exception as e:
+                status = getattr(e, 'status_code', None)
+                retryable = status in RETRY_STATUSES or any(
+                    cls.__name__ in ('APIConnectionError', 'APITimeoutError', 'TimeoutError')
+                    for cls in type(e).__mro__
+                )
+                if not retryable or attempt > self.max_retries:
+                    return {'key': key, 'status': 'error', 'text': None, 'usage': None,
+                            'attempts': attempt, 'error': f'{type(e).__name__}: {e}'}
+
+                delay = self._retry_after(e)
+                if delay is None:
+                    delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+                if status == 429:
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                stats['retries'] += 1
+                await asyncio.sleep(delay)
+                continue
+
+            usage = getattr(message, 'usage', None)
+            input_tokens = getattr(usage, 'input_tokens', None) or 0
+            output_tokens = getattr(usage, 'output_tokens', None) or 0
+            if usage is not None:
+                self.limits['input_tokens'].adjust(input_tokens - input_estimate)
+                self.limits['output_tokens'].adjust(output_tokens - output_estimate)
+            stats['input_tokens'] += input_tokens
+            stats['output_tokens'] += output_tokens
+
+            text = ''.join(getattr(block, 'text', '') for block in message.content
+                           if getattr(block, 'type', 'text') == 'text')
+            return {'key': key, 'status': 'ok', 'text': text,
+                    'usage': {'input_tokens': input_tokens, 'output_tokens': output_tokens},
+                    'attempts': attempt, 'error': None}
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Seconds from a retry-after header on the error's response, if any."""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if not headers:
+            return None
+        try:
+            return max(0.0, float(headers.get('retry-after')))
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,309 @@
+"""
+LLM Batch Job - Runs Messages API requests offline through the Message Batches API
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pipeline.llm_batch import LLMBatchRunner, request_cache_key
+from pipeline.llm_cache import ResponseCache
+
+# Message Batches API limits per batch (the byte limit is 256 MB; stay well under it)
+MAX_BATCH_REQUESTS = 100000
+MAX_BATCH_BYTES = 200 * 1024 * 1024
+
+DEFAULT_POLL_INTERVAL = 60.0
+
+
+def add_batch_job_arguments(parser: argparse.ArgumentParser):
+    """Add the shared --batch-api / --poll-interval / --no-wait options to a parser."""
+    group = parser.add_argument_group('Message Batches API')
+    group.add_argument('--batch-api', action='store_true',
+                       help='Submit requests as a Message Batch instead of calling the API one by one; '
+                            'run the same command again to pick up a batch still in progress')
+    group.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                       help=f'Seconds between batch status checks (default: {DEFAULT_POLL_INTERVAL:.0f})')
+    group.add_argument('--no-wait', action='store_true',
+                       help='Submit (or check) the batch and exit instead of waiting for it to end')
+
+
+def format_batch_status(batches: List[Dict]) -> str:
+    """One-line summary of batch statuses saved by MessageBatchRunner, for on_poll callbacks."""
+    totals: Dict[str, int] = {}
+    for batch in batches:
+        for name, count in batch['request_counts'].items():
+            totals[name] = totals.get(name, 0) + count
+    ended = sum(batch['processing_status'] == 'ended' for batch in batches)
+    counts = ', '.join(f'{count} {name}' for name, count in totals.items() if count)
+    return f"{ended}/{len(batches)} batches ended ({counts or 'no requests'})"
+
+
+def runner_from_args(client, args: argparse.Namespace,
+                     on_poll: Optional[Callable[[List[Dict]], None]] = None):
+    """LLMBatchRunner, or MessageBatchRunner with --batch-api; both have the same run() interface."""
+    if getattr(args, 'batch_api', False):
+        return MessageBatchRunner.from_args(client, args, on_poll=on_poll)
+    return LLMBatchRunner.from_args(client, args)
+
+
+class MessageBatchRunner:
+    """
+    Sends requests through the Message Batches API: write a request file,
+    submit, poll until the batch ends, then ingest the results.
+
+    run() takes the same items and writes the same result records as
+    LLMBatchRunner.run(), so scripts can switch between the two. Items
+    answered by the response cache (or reused with `resume`) are not
+    submitted, and new successes are cached.
+
+    The job is kept next to the results file:
+    - <name>.batch_requests.jsonl: {"custom_id", "params"} per request
+    - <name>.batch_state.json: batch ids and status
+
+    The state file is tied to the exact set of requests it was prepared
+    for: until its results are ingested, running again with the same
+    requests resumes the job instead of submitting a new batch. Errored
+    items are not cached, so the next run submits only those.
+
+    Works with any client with async `messages.batches.create/retrieve/
+    results`, e.g. anthropic.AsyncAnthropic. Point ANTHROPIC_BASE_URL at
+    llm_stub_server.py to run without network or API keys.
+    """
+
+    def __init__(self, client, poll_interval: float = DEFAULT_POLL_INTERVAL, wait: bool = True,
+                 max_requests: int = MAX_BATCH_REQUESTS, max_bytes: int = MAX_BATCH_BYTES,
+                 cache: Optional[ResponseCache] = None,
+                 on_poll: Optional[Callable[[List[Dict]], None]] = None):
+        self.client = client
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.wait = wait
+        self.max_requests = max(1, max_requests)
+        self.max_bytes = max_bytes
+        self.on_poll = on_poll
+
+    @classmethod
+    def from_args(cls, client, args: argparse.Namespace,
+                  on_poll: Optional[Callable[[List[Dict]], None]] = None) -> 'MessageBatchRunner':
+        """Build a runner from the options added by add_batch_arguments() and add_batch_job_arguments()."""
+        cache = None if args.no_cache else ResponseCache(args.cache_file)
+        return cls(client, args.poll_interval, wait=not args.no_wait, cache=cache, on_poll=on_poll)
+
+    def close(self):
+        """Close the response cache, if any."""
+        if self.cache is not None:
+            self.cache.close()
+
+    async def run(self, items: Iterable[Tuple[Any, Dict]], output_path: Path, resume: bool = False,
+                  progress: Optional[Callable[[Dict, int], None]] = None, use_cache: bool = True) -> Dict:
+        """
+        Run every request as part of a batch and write one result record per item, in order.
+
+        Args and record fields: as LLMBatchRunner.run()
+
+        Returns:
+            Stats as LLMBatchRunner.run(), plus `batches` (ids) and
+            `pending`. When the runner does not wait and the batch is still
+            processing, `pending` is True and no results file is written.
+        """
+        output_path = Path(output_path)
+        requests_path = output_path.with_name(output_path.stem + '.batch_requests.jsonl')
+        state_path = output_path.with_name(output_path.stem + '.batch_state.json')
+        reused = LLMBatchRunner._previous_results(output_path) if resume else {}
+        cache = self.cache if use_cache else None
+        started = time.monotonic()
+
+        stats = {'items': 0, 'ok': 0, 'errors': 0, 'reused': 0, 'cache_hits': 0, 'cache_misses': 0,
+                 'retries': 0, 'input_tokens': 0, 'output_tokens': 0, 'seconds': 0.0,
+                 'batches': [], 'pending': False}
+
+        entries = []
+        for index, (key, request, *address) in enumerate(items):
+            address = address[0] if address else request_cache_key(request)
+            if str(key) in reused or (cache is not None and address in cache):
+                custom_id = None
+            else:
+                custom_id = f'item-{index}'
+            entries.append({'key': key, 'custom_id': custom_id, 'cache_key': address,
+                            'request': request if custom_id else None})
+
+        to_submit = [entry for entry in entries if entry['custom_id']]
+        fingerprint = hashlib.sha256(json.dumps(
+            [[entry['custom_id'], entry['cache_key']] for entry in to_submit]
+        ).encode('utf-8')).hexdigest()
+
+        state = self._load_state(state_path, fingerprint)
+        if state is None and to_submit:
+            state = self._prepare(to_submit, requests_path, state_path, fingerprint)
+
+        results: Dict[str, Dict] = {}
+        if state is not None:
+            await self._submit(state, requests_path, state_path)
+            stats['batches'] = [batch['id'] for batch in state['batches']]
+            if not await self._poll(state, state_path):
+                stats['pending'] = True
+                stats['seconds'] = round(time.monotonic() - started, 3)
+                return stats
+            results = await self._ingest(state, state_path, stats)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = output_path.with_name(output_path.name + '.partial')
+        with open(partial_path, 'w', encoding='utf-8') as out:
+            for written, entry in enumerate(entries, 1):
+                record = self._record_for(entry, reused, results, cache, stats)
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                stats['ok' if record['status'] == 'ok' else 'errors'] += 1
+                if progress:
+                    progress(record, written)
+        os.replace(partial_path, output_path)
+
+        stats['items'] = len(entries)
+        stats['seconds'] = round(time.monotonic() - started, 3)
+        return stats
+
+    @staticmethod
+    def _load_state(state_path: Path, fingerprint: str) -> Optional[Dict]:
+        """The saved, not yet ingested job for these requests, or None when there is none to resume."""
+        if not state_path.exists():
+            return None
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state['status'] == 'ingested':
+            return None
+        if state['fingerprint'] == fingerprint:
+            return state
+        if state['batches']:
+            raise ValueError(
+                f"{state_path} belongs to a batch for different requests whose results were not collected "
+                f"({', '.join(batch['id'] for batch in state['batches'])}); rerun with the same inputs or delete the file"
+            )
+        return None
+
+    def _prepare(self, to_submit: List[Dict], requests_path: Path, state_path: Path, fingerprint: str) -> Dict:
+        """Write the request file and a fresh job state; requests are split into batches by count and size."""
+        chunks = []
+        count = size = 0
+        requests_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(requests_path, 'w', encoding='utf-8') as out:
+            for number, entry in enumerate(to_submit):
+                line = json.dumps({'custom_id': entry['custom_id'], 'params': entry['request']},
+                                  ensure_ascii=False) + '\n'
+                line_size = len(line.encode('utf-8'))
+                if count and (count >= self.max_requests or size + line_size > self.max_bytes):
+                    chunks.append(number)
+                    count = size = 0
+                out.write(line)
+                count += 1
+                size += line_size
+        chunks.append(len(to_submit))
+
+        state = {'fingerprint': fingerprint, 'requests': len(to_submit), 'chunks': chunks,
+                 'batches': [], 'status': 'prepared'}
+        self._save_state(state, state_path)
+        return state
+
+    async def _submit(self, state: Dict, requests_path: Path, state_path: Path):
+        """Create the batches not created yet; ids are saved one by one so a crash cannot lose one."""
+        if len(state['batches']) >= len(state['chunks']):
+            return
+        with open(requests_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        for number in range(len(state['batches']), len(state['chunks'])):
+            start = state['chunks'][number - 1] if number else 0
+            requests = [json.loads(line) for line in lines[start:state['chunks'][number]]]
+            batch = await self.client.messages.batches.create(requests=requests)
+            state['batches'].append(self._batch_status(batch))
+            state['status'] = 'submitted'
+            self._save_state(state, state_path)
+
+    async def _poll(self, state: Dict, state_path: Path) -> bool:
+        """Refresh batch statuses until all have ended (True), or once when not waiting."""
+        while True:
+            for number, batch in enumerate(state['batches']):
+                if batch['processing_status'] != 'ended':
+                    state['batches'][number] = self._batch_status(
+                        await self.client.messages.batches.retrieve(batch['id']))
+            if all(batch['processing_status'] == 'ended' for batch in state['batches']):
+                state['status'] = 'ended'
+            self._save_state(state, state_path)
+            if self.on_poll:
+                self.on_poll(state['batches'])
+
+            if state['status'] == 'ended':
+                return True
+            if not self.wait:
+                return False
+            await asyncio.sleep(self.poll_interval)
+
+    async def _ingest(self, state: Dict, state_path: Path, stats: Dict) -> Dict[str, Dict]:
+        """Download every batch's results. Returns result fields by custom_id."""
+        results = {}
+        for batch in state['batches']:
+            async for entry in await self.client.messages.batches.results(batch['id']):
+                result = entry.result
+                if result.type == 'succeeded':
+                    message = result.message
+                    usage = {'input_tokens': getattr(message.usage, 'input_tokens', 0) or 0,
+                             'output_tokens': getattr(message.usage, 'output_tokens', 0) or 0}
+                    stats['input_tokens'] += usage['input_tokens']
+                    stats['output_tokens'] += usage['output_tokens']
+                    text = ''.join(getattr(block, 'text', '') for block in message.content
+                                   if getattr(block, 'type', 'text') == 'text')
+                    results[entry.custom_id] = {'status': 'ok', 'text': text, 'usage': usage, 'error': None}
+                else:
+                    error = getattr(getattr(getattr(result, 'error', None), 'error', None), 'message', None)
+                    results[entry.custom_id] = {'status': 'error', 'text': None, 'usage': None,
+                                                'error': f'{result.type}: {error}' if error else result.type}
+        state['status'] = 'ingested'
+        self._save_state(state, state_path)
+        return results
+
+    @staticmethod
+    def _record_for(entry: Dict, reused: Dict[str, Dict], results: Dict[str, Dict],
+                    cache: Optional[ResponseCache], stats: Dict) -> Dict:
+        """Result record for one item, from the batch results, a previous run or the cache."""
+        key, custom_id, address = entry['key'], entry['custom_id'], entry['cache_key']
+        if custom_id is None and str(key) in reused:
+            stats['reused'] += 1
+            return reused[str(key)]
+
+        if custom_id is None:
+            cached = cache.get(address)
+            if cached is not None:
+                stats['cache_hits'] += 1
+                return {'key': key, 'status': 'ok', 'text': cached['text'], 'usage': cached['usage'],
+                        'attempts': 0, 'error': None, 'cache_key': address, 'cached': True}
+            result = {'status': 'error', 'text': None, 'usage': None,
+                      'error': 'cached response disappeared before the results were written'}
+        else:
+            if cache is not None:
+                stats['cache_misses'] += 1
+            result = results.get(custom_id) or {'status': 'error', 'text': None, 'usage': None,
+                                                'error': 'missing from the batch results'}
+            if cache is not None and result['status'] == 'ok':
+                cache.put(address, entry['request'].get('model', ''), result['text'], result['usage'])
+
+        return {'key': key, **result, 'attempts': 1, 'cache_key': address, 'cached': False}
+
+    @staticmethod
+    def _batch_status(batch) -> Dict:
+        counts = batch.request_counts
+        return {
+            'id': batch.id,
+            'processing_status': batch.processing_status,
+            'request_counts': {name: getattr(counts, name, 0)
+                               for name in ('processing', 'succeeded', 'errored', 'canceled', 'expired')}
+        }
+
+    @staticmethod
+    def _save_state(state: Dict, state_path: Path):
+        temp_path = state_path.with_name(state_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, state_path)
@@ -0,0 +1,127 @@
+"""
+LLM Cache - Persistent, content-addressed cache of model responses
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_FILE = Path(__file__).parent.parent / 'output' / 'llm_cache.sqlite3'
+
+
+def cache_key(model: str, template_version: str, fields: Dict[str, Any],
+              params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Content address of a request.
+
+    Args:
+        model: Model name
+        template_version: Version of the prompt template; bump it whenever
+            the template text changes so old responses are not reused
+        fields: Inputs substituted into the template (e.g. scenario fields)
+        params: Sampling parameters that change the output (max_tokens,
+            temperature, ...)
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON of all of the above
+    """
+    payload = json.dumps(
+        {'model': model, 'template': str(template_version), 'fields': fields, 'params': params or {}},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed store of response text and usage by cache key.
+
+    Entries never expire: a changed input, model or template version gives
+    a new key. Hits, misses and stores are counted per instance.
+
+    Usage:
+        with ResponseCache(DEFAULT_CACHE_FILE) as cache:
+            key = cache_key(model, 'v2', fields)
+            entry = cache.get(key)
+            if entry is None:
+                cache.put(key, model, text, usage)
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        self._db = sqlite3.connect(self.path)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                text TEXT NOT NULL,
+                usage TEXT,
+                created REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached {'text', 'usage', 'model', 'created'} for a key, or None."""
+        row = self._db.execute(
+            'SELECT text, usage, model, created FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._db.execute('UPDATE responses SET hits = hits + 1 WHERE key = ?', (key,))
+        self._db.commit()
+        return {'text': row[0], 'usage': json.loads(row[1]) if row[1] else None, 'model': row[2], 'created': row[3]}
+
+    def put(self, key: str, model: str, text: str, usage: Optional[Dict] = None):
+        """Store (or replace) a response."""
+        self._db.execute(
+            'INSERT OR REPLACE INTO responses (key, model, text, usage, created) VALUES (?, ?, ?, ?, ?)',
+            (key, model, text, json.dumps(usage) if usage else None, time.time())
+        )
+        self._db.commit()
+        self.stores += 1
+
+    def discard(self, key: str):
+        """Drop a response, e.g. one that turned out to be unusable."""
+        self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+        self._db.commit()
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a response is stored, without counting a hit or miss."""
+        return self._db.execute('SELECT 1 FROM responses WHERE key = ?', (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def stats(self) -> Dict:
+        """Hit/miss counts for this run plus the number of stored entries."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': len(self)
+        }
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
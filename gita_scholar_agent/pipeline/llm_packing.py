@@ -0,0 +1,241 @@
+"""
+LLM Packing - Sends several items per request and re-queues only the items that fail validation
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pipeline.llm_batch import LLMBatchRunner, extract_json
+
+DEFAULT_PACK_SIZE = 5
+DEFAULT_MAX_ROUNDS = 3
+
+
+def add_packing_arguments(parser: argparse.ArgumentParser):
+    """Add the shared --pack / --max-rounds options to a parser."""
+    group = parser.add_argument_group('Prompt packing')
+    group.add_argument('--pack', type=int, default=1, metavar='K',
+                       help=f'Scenarios per request; 1 sends one request per scenario '
+                            f'(default: 1, try {DEFAULT_PACK_SIZE})')
+    group.add_argument('--max-rounds', type=int, default=DEFAULT_MAX_ROUNDS,
+                       help=f'Rounds for re-sending items that fail validation when packing '
+                            f'(default: {DEFAULT_MAX_ROUNDS})')
+
+
+def parse_packed_response(text: str, ids: List[str]) -> Dict[str, Any]:
+    """
+    Values per item id from a reply shaped like {"<id>": <value>, ...}.
+
+    Ids not in `ids` are ignored; ids missing from the reply are absent
+    from the result.
+
+    Raises:
+        ValueError: when the reply is not a JSON object
+    """
+    data = extract_json(text)
+    if not isinstance(data, dict):
+        raise ValueError(f'expected a JSON object keyed by id, got {type(data).__name__}')
+    wanted = set(ids)
+    return {str(key): value for key, value in data.items() if str(key) in wanted}
+
+
+class PromptPacker:
+    """
+    Packs up to `pack_size` items into each request.
+
+    The script supplies two callbacks:
+    - build_request(group, notes): Messages API request for a list of
+      (item_id, payload) pairs. `notes` maps item ids to the problems
+      found in their previous answer, so the prompt can ask for a fix.
+    - validate(item_id, payload, value): list of problems with one item's
+      value; empty when it is acceptable.
+
+    Replies must be JSON objects keyed by item id. Each item is validated
+    on its own: accepted items are kept (and cached per item), while
+    failed or missing ones are packed again into the next round, up to
+    `max_rounds` rounds. Because the cache is keyed per item rather than
+    per request, a rerun only sends the items whose inputs changed,
+    whatever packs they end up in.
+    """
+
+    def __init__(self, runner: LLMBatchRunner, build_request: Callable[[List[Tuple[Any, Any]], Dict], Dict],
+                 validate: Callable[[Any, Any, Any], List[str]], pack_size: int = DEFAULT_PACK_SIZE,
+                 max_rounds: int = DEFAULT_MAX_ROUNDS):
+        self.runner = runner
+        self.build_request = build_request
+        self.validate = validate
+        self.pack_size = max(1, pack_size)
+        self.max_rounds = max(1, max_rounds)
+
+    async def run(self, items: List[Tuple[Any, Any, Optional[str]]], output_path: Path,
+                  progress: Optional[Callable[[int, Dict], None]] = None) -> Dict:
+        """
+        Process every item and write one result record per item, in order.
+
+        Args:
+            items: (item_id, payload, cache_key) tuples; cache_key may be None
+            output_path: Per-item results (JSONL). Raw replies of each round
+                go to <name>.round<N>.jsonl next to it.
+            progress: Called with the round number and its runner stats
+
+        Returns:
+            Stats: items, cached, requests, rounds, accepted, failed,
+            requeued, retries, tokens, seconds and pending. With a
+            MessageBatchRunner that does not wait, a round still processing
+            stops the run with `pending` True and no results file; running
+            again resumes that round.
+
+        Record fields: key, status ('ok' or 'failed'), value, problems,
+        round (0 when served from the cache), cached
+        """
+        output_path = Path(output_path)
+        cache = self.runner.cache
+        started = time.monotonic()
+        stats = {'items': len(items), 'cached': 0, 'requests': 0, 'rounds': 0, 'accepted': 0, 'failed': 0,
+                 'requeued': 0, 'retries': 0, 'input_tokens': 0, 'output_tokens': 0, 'seconds': 0.0,
+                 'pending': False}
+
+        pending_path = output_path.with_name(output_path.stem + '.pending.json')
+        saved = self._load_pending(pending_path, items)
+        if saved is not None:
+            # An earlier run stopped at a round still being processed as a batch
+            results, notes, first_round = saved['results'], saved['notes'], saved['round']
+            by_id = {str(item[0]): item for item in items}
+            queue = [by_id[item_id] for item_id in saved['queue']]
+            stats.update(saved['stats'])
+        else:
+            results, notes, first_round = {}, {}, 1
+            queue = []
+            for item_id, payload, address in items:
+                entry = cache.get(address) if cache is not None and address else None
+                if entry is not None:
+                    value = json.loads(entry['text'])
+                    if not self.validate(item_id, payload, value):
+                        results[str(item_id)] = self._record(item_id, 'ok', value, [], 0, True)
+                        stats['cached'] += 1
+                        continue
+                    cache.discard(address)
+                queue.append((item_id, payload, address))
+
+        for round_number in range(first_round, self.max_rounds + 1):
+            if not queue:
+                break
+            if round_number > stats['rounds']:
+                stats['rounds'] = round_number
+                if round_number > 1:
+                    stats['requeued'] += len(queue)
+
+            groups = [queue[start:start + self.pack_size] for start in range(0, len(queue), self.pack_size)]
+            requests = [
+                self.build_request([(item_id, payload) for item_id, payload, _ in group],
+                                   {item_id: notes[item_id] for item_id, _, _ in group if item_id in notes})
+                for group in groups
+            ]
+            round_path = output_path.with_name(f'{output_path.stem}.round{round_number}{output_path.suffix}')
+            round_stats = await self.runner.run(
+                ((f'round{round_number}-pack{number}', request) for number, request in enumerate(requests, 1)),
+                round_path, use_cache=False
+            )
+
+            if round_stats.get('pending'):
+                self._save_pending(pending_path, items, round_number, queue, results, notes, stats)
+                stats['pending'] = True
+                stats['seconds'] = round(time.monotonic() - started, 3)
+                return stats
+
+            stats['requests'] += round_stats['items']
+            for name in ('retries', 'input_tokens', 'output_tokens'):
+                stats[name] += round_stats[name]
+            if progress:
+                progress(round_number, round_stats)
+
+            queue = []
+            with open(round_path, 'r', encoding='utf-8') as f:
+                for group, request, line in zip(groups, requests, f):
+                    queue.extend(self._check_group(group, request.get('model', ''), json.loads(line),
+                                                   round_number, results, notes))
+
+        with open(output_path, 'w', encoding='utf-8') as out:
+            for item_id, _, _ in items:
+                record = results[str(item_id)]
+                stats['accepted' if record['status'] == 'ok' else 'failed'] += 1
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        if pending_path.exists():
+            pending_path.unlink()
+
+        stats['seconds'] = round(time.monotonic() - started, 3)
+        return stats
+
+    def _check_group(self, group: List[Tuple[Any, Any, Optional[str]]], model: str, record: Dict,
+                     round_number: int, results: Dict[str, Dict],
+                     notes: Dict[Any, List[str]]) -> List[Tuple[Any, Any, Optional[str]]]:
+        """Validate each item of one packed reply; returns the items to retry."""
+        cache = self.runner.cache
+        values: Dict[str, Any] = {}
+        group_problem = None
+        if record['status'] != 'ok':
+            group_problem = f"request failed: {record['error']}"
+        else:
+            try:
+                values = parse_packed_response(record['text'], [str(item_id) for item_id, _, _ in group])
+            except ValueError as e:
+                group_problem = f'reply was not a JSON object keyed by id: {e}'
+
+        retry = []
+        for item_id, payload, address in group:
+            if str(item_id) in values:
+                value = values[str(item_id)]
+                problems = self.validate(item_id, payload, value)
+            else:
+                value = None
+                problems = [group_problem or 'missing from the reply']
+
+            if problems:
+                notes[item_id] = problems
+                results[str(item_id)] = self._record(item_id, 'failed', value, problems, round_number, False)
+                retry.append((item_id, payload, address))
+            else:
+                results[str(item_id)] = self._record(item_id, 'ok', value, [], round_number, False)
+                if cache is not None and address:
+                    cache.put(address, model, json.dumps(value, ensure_ascii=False))
+        return retry
+
+    @staticmethod
+    def _fingerprint(items: List[Tuple[Any, Any, Optional[str]]]) -> List[List]:
+        return [[str(item_id), address] for item_id, _, address in items]
+
+    def _save_pending(self, path: Path, items: List[Tuple[Any, Any, Optional[str]]], round_number: int,
+                      queue: List[Tuple[Any, Any, Optional[str]]], results: Dict[str, Dict],
+                      notes: Dict[Any, List[str]], stats: Dict):
+        """Keep the progress of a run stopped at a pending round, so the next run resumes it."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'items': self._fingerprint(items),
+                'round': round_number,
+                'queue': [str(item_id) for item_id, _, _ in queue],
+                'results': results,
+                'notes': [[str(item_id), problems] for item_id, problems in notes.items()],
+                'stats': {name: stats[name] for name in ('cached', 'rounds', 'requeued', 'requests', 'retries',
+                                                         'input_tokens', 'output_tokens')}
+            }, f, ensure_ascii=False)
+
+    def _load_pending(self, path: Path, items: List[Tuple[Any, Any, Optional[str]]]) -> Optional[Dict]:
+        """Progress saved by _save_pending() for these same items, or None."""
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        if saved['items'] != self._fingerprint(items):
+            return None
+        ids = {str(item_id): item_id for item_id, _, _ in items}
+        saved['notes'] = {ids[item_id]: problems for item_id, problems in saved['notes']}
+        return saved
+
+    @staticmethod
+    def _record(item_id: Any, status: str, value: Any, problems: List[str], round_number: int,
+                cached: bool) -> Dict:
+        return {'key': item_id, 'status': status, 'value': value, 'problems': problems,
+                'round': round_number, 'cached': cached}
@@ -0,0 +1,177 @@
+"""
+LLM Rewrite - Shared single / packed request flow for the action-step rewrite scripts
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pipeline.llm_batch import extract_json
+from pipeline.llm_cache import cache_key
+from pipeline.llm_packing import DEFAULT_MAX_ROUNDS, DEFAULT_PACK_SIZE, PromptPacker
+
+# Output budget per item in a packed request (5 steps of up to 150 characters plus JSON)
+PACKED_TOKENS_PER_ITEM = 500
+
+
+class LLMRewriter:
+    """
+    Sends rewrite prompts one item per request, or packed several per
+    request, and checks every answer with the same validator.
+
+    The script supplies the prompts and what goes into the cache key:
+    - build_prompt(payload): prompt text for one item
+    - build_packed_prompt(group, notes): prompt text for a list of
+      (item_id, payload) pairs (see PromptPacker for `notes`)
+    - cache_fields(payload): every input the prompts use
+
+    Request parameters, per-item cache keys, validation and reading the
+    results back are shared. Bump a prompt version whenever its prompt
+    changes, so cached answers to the old prompt are not reused.
+
+    Usage:
+        rewriter = LLMRewriter(build_prompt, build_packed_prompt, cache_fields, STEP_VALIDATOR,
+                               'review-1', 'review-packed-1', model='claude-sonnet-4-20250514',
+                               max_tokens=1000, temperature=0.7)
+        result = rewriter.run_single(runner, items, Path('output/results.jsonl'))
+    """
+
+    def __init__(self, build_prompt: Callable[[Any], str],
+                 build_packed_prompt: Callable[[List[Tuple[Any, Any]], Dict], str],
+                 cache_fields: Callable[[Any], Dict], validator, prompt_version: str, packed_prompt_version: str,
+                 model: str, max_tokens: int, temperature: float,
+                 packed_tokens_per_item: int = PACKED_TOKENS_PER_ITEM):
+        """
+        Args:
+            build_prompt, build_packed_prompt, cache_fields: See above
+            validator: Object with problems(steps) -> list of problems
+                (e.g. validators.step_validator.ActionStepValidator)
+            prompt_version: Version of the single-item prompt
+            packed_prompt_version: Version of the packed prompt
+            model, max_tokens, temperature: Request parameters
+            packed_tokens_per_item: Output budget per item when packing
+        """
+        self.build_prompt = build_prompt
+        self.build_packed_prompt = build_packed_prompt
+        self.cache_fields = cache_fields
+        self.validator = validator
+        self.prompt_version = prompt_version
+        self.packed_prompt_version = packed_prompt_version
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.packed_tokens_per_item = packed_tokens_per_item
+
+    def request(self, payload) -> Dict:
+        """Messages API request for one item."""
+        return self._request(self.build_prompt(payload), self.max_tokens)
+
+    def packed_request(self, group: List[Tuple[Any, Any]], notes: Dict) -> Dict:
+        """Messages API request for several items, answered as a JSON object keyed by item id."""
+        return self._request(self.build_packed_prompt(group, notes), self.packed_tokens_per_item * len(group))
+
+    def _request(self, prompt: str, max_tokens: int) -> Dict:
+        return {
+            'model': self.model,
+            'max_tokens': max_tokens,
+            'temperature': self.temperature,
+            'messages': [{'role': 'user', 'content': prompt}]
+        }
+
+    def cache_key(self, payload) -> str:
+        """Cache key of one item's single-item request."""
+        params = {'max_tokens': self.max_tokens, 'temperature': self.temperature}
+        return cache_key(self.model, self.prompt_version, self.cache_fields(payload), params)
+
+    def packed_cache_key(self, payload) -> str:
+        """Per-item cache key for packed runs; independent of which other items share the request."""
+        return cache_key(self.model, self.packed_prompt_version, self.cache_fields(payload),
+                         {'temperature': self.temperature})
+
+    def problems(self, value) -> List[str]:
+        """Problems with one item's answer; empty when it is acceptable."""
+        return self.validator.problems(value)
+
+    def run_single(self, runner, items: Sequence[Tuple[Any, Any]], results_file: Path, resume: bool = False,
+                   progress: Optional[Callable[[Dict, int], None]] = None) -> Optional[Tuple[List[Dict], List[str]]]:
+        """
+        One request per item (or one Message Batch with a MessageBatchRunner).
+
+        Args:
+            runner: LLMBatchRunner or MessageBatchRunner
+            items: (item_id, payload) pairs
+            results_file: Raw results (JSONL), one record per item
+            resume: Reuse successful results already in results_file
+            progress: Passed on to the runner
+
+        Returns:
+            (outcomes, summary lines), or None while a batch is still
+            processing. Outcomes are in item order, each with key, payload,
+            steps (None when unusable) and problems. Unusable answers are
+            dropped from the response cache.
+        """
+        requests = ((item_id, self.request(payload), self.cache_key(payload)) for item_id, payload in items)
+        stats = asyncio.run(runner.run(requests, Path(results_file), resume=resume, progress=progress))
+        if stats.get('pending'):
+            return None
+
+        outcomes = []
+        with open(results_file, 'r', encoding='utf-8') as f:
+            for (item_id, payload), line in zip(items, f):
+                record = json.loads(line)
+                steps, problems = None, []
+                if record['status'] != 'ok':
+                    problems = [record['error']]
+                else:
+                    try:
+                        steps = extract_json(record['text'])
+                        problems = self.problems(steps)
+                    except ValueError as e:
+                        problems = [str(e)]
+                    if problems:
+                        steps = None
+                        if runner.cache is not None and record.get('cache_key'):
+                            # Don't keep serving an unusable response on the next run
+                            runner.cache.discard(record['cache_key'])
+                outcomes.append({'key': item_id, 'payload': payload, 'steps': steps, 'problems': problems})
+
+        summary = [
+            f"Requests: {stats['items']} ({stats['reused']} reused, {stats['retries']} retries)",
+            f"Response cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses",
+            f"Tokens: {stats['input_tokens']} in / {stats['output_tokens']} out in {stats['seconds']:.1f}s"
+        ]
+        if stats.get('batches'):
+            summary.append(f"Message batches: {', '.join(stats['batches'])}")
+        return outcomes, summary
+
+    def run_packed(self, runner, items: Sequence[Tuple[Any, Any]], results_file: Path,
+                   pack_size: int = DEFAULT_PACK_SIZE, max_rounds: int = DEFAULT_MAX_ROUNDS,
+                   progress: Optional[Callable[[int, Dict], None]] = None) -> Optional[Tuple[List[Dict], List[str]]]:
+        """
+        Several items per request; only items whose answers fail validation
+        are sent again. Arguments and return value as run_single, plus the
+        PromptPacker pack size and rounds.
+        """
+        packer = PromptPacker(runner, self.packed_request, lambda item_id, payload, value: self.problems(value),
+                              pack_size=pack_size, max_rounds=max_rounds)
+        packed_items = [(item_id, payload, self.packed_cache_key(payload)) for item_id, payload in items]
+        stats = asyncio.run(packer.run(packed_items, Path(results_file), progress=progress))
+        if stats.get('pending'):
+            return None
+
+        outcomes = []
+        with open(results_file, 'r', encoding='utf-8') as f:
+            for (item_id, payload), line in zip(items, f):
+                record = json.loads(line)
+                ok = record['status'] == 'ok'
+                outcomes.append({'key': item_id, 'payload': payload, 'steps': record['value'] if ok else None,
+                                 'problems': record['problems']})
+
+        summary = [
+            f"Requests: {stats['requests']} over {stats['rounds']} rounds, {stats['requeued']} items re-sent, "
+            f"{stats['retries']} retries",
+            f"Response cache: {stats['cached']} items served from cache",
+            f"Tokens: {stats['input_tokens']} in / {stats['output_tokens']} out in {stats['seconds']:.1f}s"
+        ]
+        return outcomes, summary
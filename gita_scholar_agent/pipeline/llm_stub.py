@@ -0,0 +1,291 @@
+"""
+LLM Stub - Local stand-in for the Messages and Message Batches APIs
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Scenario headers used by the action-step prompts ("Scenario #12: Title" / "### Scenario 12")
+SCENARIO_HEADER = re.compile(r'(?:Scenario #|### Scenario )(\d+)(?::[ \t]*(.+?))?\**[ \t]*$', re.MULTILINE)
+TITLE_LINE = re.compile(r'\*\*Title:\*\*[ \t]*(.+)$', re.MULTILINE)
+
+# Rule-generated steps: 50-150 characters each, no banned template phrasing
+STEP_TEMPLATES = (
+    "Write down in two or three sentences what worries you most about {topic}",
+    "Talk it through with one person you trust this week and ask what they would do about {topic}",
+    "Pick one small, concrete action on {topic} that you can finish within the next three days",
+    "Notice which option you lean toward out of fear and compare it with what your duty asks of you",
+    "Set a date two weeks from now to review how {topic} is going and adjust your plan",
+)
+
+
+def _topic(title: Optional[str]) -> str:
+    if not title:
+        return 'this situation'
+    title = title.strip().strip('*').strip()
+    return title[:40].rstrip().lower() if title else 'this situation'
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class StubResponder:
+    """
+    Answers a Messages API request without a model.
+
+    A canned reply is used when one of its `match` substrings occurs in
+    the prompt (first match wins). Otherwise the reply follows the prompt's
+    requested shape: a JSON object of steps keyed by scenario number for
+    packed prompts, a JSON array of steps for single-scenario ones.
+    `error_rate` is the share of requests answered with an error.
+    """
+
+    def __init__(self, canned: Optional[List[Dict]] = None, error_rate: float = 0.0, seed: int = 0):
+        self.canned = canned or []
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: Optional[Path], error_rate: float = 0.0, seed: int = 0) -> 'StubResponder':
+        """Responder with canned replies from a JSON list of {"match", "text"} objects."""
+        canned = []
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                canned = json.load(f)
+        return cls(canned, error_rate, seed)
+
+    def fails(self) -> bool:
+        """Whether this request should get an error (thread-safe)."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+    def reply_text(self, prompt: str) -> str:
+        for reply in self.canned:
+            if reply['match'] in prompt:
+                return reply['text']
+
+        scenarios = [(number, title) for number, title in SCENARIO_HEADER.findall(prompt)]
+        if not scenarios:
+            title = TITLE_LINE.search(prompt)
+            scenarios = [('0', title.group(1) if title else None)]
+
+        def steps(title):
+            return [template.format(topic=_topic(title)) for template in STEP_TEMPLATES]
+
+        if 'JSON object' in prompt:
+            return json.dumps({number: steps(title) for number, title in scenarios}, ensure_ascii=False)
+        return json.dumps(steps(scenarios[0][1]), ensure_ascii=False)
+
+    def message(self, request: Dict) -> Dict:
+        """Messages API response body for a request."""
+        prompt = '\n'.join(
+            message['content'] if isinstance(message.get('content'), str)
+            else ''.join(block.get('text', '') for block in message.get('content', []))
+            for message in request.get('messages', [])
+        )
+        text = self.reply_text(prompt)
+        return {
+            'id': f'msg_stub_{uuid.uuid4().hex[:24]}',
+            'type': 'message',
+            'role': 'assistant',
+            'model': request.get('model', 'stub'),
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': 'end_turn',
+            'stop_sequence': None,
+            'usage': {'input_tokens': len(prompt) // 4 + 1, 'output_tokens': len(text) // 4 + 1}
+        }
+
+
+class StubAnthropicServer:
+    """
+    HTTP server implementing the request/response shapes the scripts use:
+
+    - POST /v1/messages
+    - POST /v1/messages/batches, GET /v1/messages/batches/{id},
+      GET /v1/messages/batches/{id}/results
+    - GET /stats: requests served, batches created, errors injected
+
+    Batches end `batch_seconds` after creation. Failed single requests get
+    a 429 or 529 with retry-after; failed batch items come back 'errored'.
+
+    Usage:
+        with StubAnthropicServer(StubResponder(), port=0) as server:
+            os.environ['ANTHROPIC_BASE_URL'] = server.url
+    """
+
+    def __init__(self, responder: StubResponder, host: str = '127.0.0.1', port: int = 8089,
+                 latency_ms: float = 0.0, batch_seconds: float = 5.0):
+        self.responder = responder
+        self.latency_ms = latency_ms
+        self.batch_seconds = batch_seconds
+        self.batches: Dict[str, Dict] = {}
+        self.counters = {'messages': 0, 'batches': 0, 'batch_requests': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def start(self) -> 'StubAnthropicServer':
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def create_message(self, request: Dict) -> Tuple[int, Dict, Dict]:
+        """(status, body, extra headers) for POST /v1/messages."""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        self._count('messages')
+        if self.responder.fails():
+            self._count('errors')
+            if self.counters['errors'] % 2:
+                return 429, self._error('rate_limit_error', 'Stub rate limit'), {'retry-after': '1'}
+            return 529, self._error('overloaded_error', 'Stub overloaded'), {}
+        return 200, self.responder.message(request), {}
+
+    def create_batch(self, body: Dict, base_url: Optional[str] = None) -> Dict:
+        """Answer every request up front; they are released once the batch ends."""
+        results = []
+        for item in body.get('requests', []):
+            if self.responder.fails():
+                self._count('errors')
+                result = {'type': 'errored', 'error': self._error('api_error', 'Stub batch item error')}
+            else:
+                result = {'type': 'succeeded', 'message': self.responder.message(item['params'])}
+            results.append({'custom_id': item['custom_id'], 'result': result})
+
+        batch_id = f'msgbatch_stub_{uuid.uuid4().hex[:24]}'
+        created = datetime.now(timezone.utc)
+        with self._lock:
+            self.batches[batch_id] = {
+                'created': created,
+                'ends': time.monotonic() + self.batch_seconds,
+                'results': results
+            }
+        self._count('batches')
+        self._count('batch_requests', len(results))
+        return self.batch(batch_id, base_url)
+
+    def batch(self, batch_id: str, base_url: Optional[str]) -> Optional[Dict]:
+        """Message batch object, or None for an unknown id."""
+        with self._lock:
+            job = self.batches.get(batch_id)
+        if job is None:
+            return None
+        ended = time.monotonic() >= job['ends']
+        counts = {'processing': 0, 'succeeded': 0, 'errored': 0, 'canceled': 0, 'expired': 0}
+        if ended:
+            for entry in job['results']:
+                counts[entry['result']['type']] += 1
+        else:
+            counts['processing'] = len(job['results'])
+        return {
+            'id': batch_id,
+            'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': counts,
+            'created_at': job['created'].isoformat(),
+            'expires_at': (job['created'] + timedelta(hours=24)).isoformat(),
+            'ended_at': _now() if ended else None,
+            'cancel_initiated_at': None,
+            'archived_at': None,
+            'results_url': f'{base_url or self.url}/v1/messages/batches/{batch_id}/results' if ended else None
+        }
+
+    @staticmethod
+    def _error(kind: str, message: str) -> Dict:
+        return {'type': 'error', 'error': {'type': kind, 'message': message}}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body, headers: Optional[Dict] = None, content_type='application/json'):
+                data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.send_header('request-id', f'req_stub_{uuid.uuid4().hex[:16]}')
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> Dict:
+                length = int(self.headers.get('Content-Length') or 0)
+                return json.loads(self.rfile.read(length) or b'{}')
+
+            def _base_url(self) -> str:
+                return f"http://{self.headers.get('Host') or server.url.split('//', 1)[1]}"
+
+            def do_POST(self):
+                path = self.path.split('?', 1)[0].rstrip('/')
+                if path == '/v1/messages':
+                    status, body, headers = server.create_message(self._body())
+                    self._send(status, body, headers)
+                elif path == '/v1/messages/batches':
+                    self._send(200, server.create_batch(self._body(), self._base_url()))
+                else:
+                    self._send(404, server._error('not_found_error', f'No route for POST {path}'))
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0].rstrip('/')
+                parts = path.split('/')
+                if path == '/stats':
+                    with server._lock:
+                        self._send(200, dict(server.counters))
+                elif len(parts) in (5, 6) and parts[1:4] == ['v1', 'messages', 'batches']:
+                    batch = server.batch(parts[4], self._base_url())
+                    if batch is None:
+                        self._send(404, server._error('not_found_error', f'No batch {parts[4]}'))
+                    elif len(parts) == 5:
+                        self._send(200, batch)
+                    elif batch['processing_status'] != 'ended':
+                        self._send(400, server._error('invalid_request_error', 'Batch has not ended'))
+                    else:
+                        lines = ''.join(json.dumps(entry, ensure_ascii=False) + '\n'
+                                        for entry in server.batches[parts[4]]['results'])
+                        self._send(200, lines.encode('utf-8'), content_type='application/binary')
+                else:
+                    self._send(404, server._error('not_found_error', f'No route for GET {path}'))
+
+        return Handler
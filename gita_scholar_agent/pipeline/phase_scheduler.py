@@ -0,0 +1,162 @@
+"""
+Phase Scheduler - Runs validation phases as a dependency graph
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class PhaseScheduler:
+    """
+    Runs named phases as soon as the phases they depend on have finished.
+
+    Each phase is a callable that receives the outputs of its dependencies
+    as positional arguments, in depends_on order. Phases run as:
+    - async:   coroutine function awaited on the event loop
+    - thread:  blocking function (or coroutine function, run on its own
+               event loop) in a thread pool - for blocking I/O
+    - process: picklable function in a process pool - for CPU-bound work
+    """
+
+    EXECUTORS = ('async', 'thread', 'process')
+
+    def __init__(self, max_threads: int = 4, max_processes: int = 1, profiler=None):
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        # Optional pipeline.profiling.Profiler; every phase is profiled separately
+        self.profiler = profiler
+        self.phases: Dict[str, Dict] = {}
+        self.timings: Dict[str, Dict] = {}
+
+    def add_phase(self, name: str, func: Callable, depends_on: Optional[List[str]] = None,
+                  executor: str = 'async'):
+        """
+        Register a phase.
+
+        Args:
+            name: Unique phase name
+            func: Phase function, called with dependency outputs as arguments
+            depends_on: Names of phases that must finish first
+            executor: async, thread or process
+        """
+        if name in self.phases:
+            raise ValueError(f"Phase already registered: {name}")
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}' for phase {name}")
+
+        self.phases[name] = {
+            'func': func,
+            'depends_on': list(depends_on or []),
+            'executor': executor
+        }
+
+    def _check_graph(self):
+        """Reject unknown dependencies and cycles."""
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Phase dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dependency in self.phases[name]['depends_on']:
+                if dependency not in self.phases:
+                    raise ValueError(f"Phase {name} depends on unknown phase {dependency}")
+                visit(dependency, path + [name])
+            state[name] = 'done'
+
+        for name in self.phases:
+            visit(name, [])
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every phase, overlapping phases that do not depend on each other.
+
+        Returns:
+            Mapping of phase name -> phase output
+        """
+        self._check_graph()
+        self.timings = {}
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        thread_pool = ThreadPoolExecutor(max_workers=self.max_threads)
+        process_pool: Optional[Executor] = None
+        if any(phase['executor'] == 'process' for phase in self.phases.values()):
+            process_pool = ProcessPoolExecutor(max_workers=self.max_processes)
+
+        # cProfile allows one active profiler per process, so phases run one
+        # at a time while it is on
+        serial = asyncio.Lock() if self.profiler is not None and self.profiler.exclusive else None
+
+        async def run_phase(name: str):
+            inputs = [await tasks[dependency] for dependency in self.phases[name]['depends_on']]
+            if serial is None:
+                return await execute_phase(name, inputs)
+            async with serial:
+                return await execute_phase(name, inputs)
+
+        async def execute_phase(name: str, inputs: List):
+            phase = self.phases[name]
+            phase_start = time.perf_counter()
+            func = phase['func']
+            if self.profiler is not None:
+                func = self.profiler.wrap(name, func)
+            if phase['executor'] == 'async':
+                # Includes CPU of other coroutines interleaved on the loop
+                cpu_start = time.thread_time()
+                output = await func(*inputs)
+                cpu_seconds = time.thread_time() - cpu_start
+            elif phase['executor'] == 'thread':
+                output, cpu_seconds = await loop.run_in_executor(
+                    thread_pool, lambda: self._call_blocking(func, inputs)
+                )
+            else:
+                output, cpu_seconds = await loop.run_in_executor(process_pool, _call_timed, func, *inputs)
+            phase_end = time.perf_counter()
+
+            self.timings[name] = {
+                'executor': phase['executor'],
+                'depends_on': phase['depends_on'],
+                'start_offset_seconds': round(phase_start - started, 3),
+                'duration_seconds': round(phase_end - phase_start, 3),
+                'cpu_seconds': round(cpu_seconds, 3)
+            }
+            return output
+
+        try:
+            for name in self.phases:
+                tasks[name] = asyncio.ensure_future(run_phase(name))
+            outputs = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        finally:
+            thread_pool.shutdown(wait=False)
+            if process_pool is not None:
+                process_pool.shutdown(wait=False)
+
+        self.timings['_total'] = {'duration_seconds': round(time.perf_counter() - started, 3)}
+        return dict(zip(tasks, outputs))
+
+    @staticmethod
+    def _call_blocking(func: Callable, inputs: List) -> Tuple[Any, float]:
+        """Call a phase function in a worker thread; returns (output, CPU seconds)."""
+        cpu_start = time.thread_time()
+        if asyncio.iscoroutinefunction(func):
+            output = asyncio.run(func(*inputs))
+        else:
+            output = func(*inputs)
+        return output, time.thread_time() - cpu_start
+
+
+def _call_timed(func: Callable, *inputs) -> Tuple[Any, float]:
+    """Call a phase function in a worker process; returns (output, CPU seconds)."""
+    cpu_start = time.process_time()
+    output = func(*inputs)
+    return output, time.process_time() - cpu_start
@@ -0,0 +1,225 @@
+"""
+Profiling - Shared --profile support (cProfile, tracemalloc, sampling) for entry points
+"""
+
+import argparse
+import asyncio
+import cProfile
+import functools
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+PROFILE_MODES = ('cprofile', 'tracemalloc', 'sampling')
+DEFAULT_PROFILE_DIR = Path('output') / 'profiles'
+
+# tracemalloc is process-wide: keep it running while any phase needs it
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+# cProfile allows one enabled profiler per process
+_cprofile_lock = threading.Lock()
+_cprofile_active = False
+
+
+def add_profile_argument(parser: argparse.ArgumentParser):
+    """Add the shared --profile option to an entry point's parser."""
+    parser.add_argument(
+        '--profile',
+        choices=PROFILE_MODES,
+        help='Profile each phase and write results to output/profiles/ (cprofile runs phases one at a time)'
+    )
+
+
+class Profiler:
+    """
+    Per-phase profiler shared by all entry points.
+
+    Modes (one file set per phase, named <entry point>.<phase>.*):
+    - cprofile:    deterministic call profile -> .pstats and a .txt top list
+    - tracemalloc: allocation growth by line -> .alloc.txt (top sites, peak)
+    - sampling:    wall-clock stack samples of the phase's thread ->
+                   .collapsed (flamegraph.pl / speedscope ready)
+
+    With mode None every method is a cheap no-op.
+
+    cProfile allows only one enabled profiler per process (enabling a
+    second raises on Python 3.12+), so cprofile phases must not overlap:
+    the phase scheduler runs phases one at a time when `exclusive` is set,
+    and a phase started while another is being profiled is left out (its
+    calls already show up in the outer phase's profile).
+    """
+
+    SAMPLE_INTERVAL = 0.005
+    TOP_ENTRIES = 30
+
+    def __init__(self, mode: Optional[str], name: str, output_dir: Path = DEFAULT_PROFILE_DIR):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        self.mode = mode
+        self.name = name
+        self.output_dir = Path(output_dir)
+        self._active: Dict[str, object] = {}
+
+    @classmethod
+    def from_argv(cls, name: str, output_dir: Path = DEFAULT_PROFILE_DIR) -> 'Profiler':
+        """
+        Build a profiler from --profile in sys.argv, for scripts without an
+        argument parser. The option is removed from sys.argv.
+        """
+        parser = argparse.ArgumentParser(add_help=False)
+        add_profile_argument(parser)
+        args, remaining = parser.parse_known_args(sys.argv[1:])
+        sys.argv[1:] = remaining
+        return cls(args.profile, name, output_dir)
+
+    @property
+    def exclusive(self) -> bool:
+        """Whether phases must run one at a time for this mode."""
+        return self.mode == 'cprofile'
+
+    def __getstate__(self):
+        # Phases running in worker processes get a fresh, idle profiler
+        return {'mode': self.mode, 'name': self.name, 'output_dir': self.output_dir, '_active': {}}
+
+    def _path(self, phase: str, suffix: str) -> Path:
+        safe_phase = re.sub(r'[^A-Za-z0-9_.-]+', '_', phase)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return self.output_dir / f'{self.name}.{safe_phase}{suffix}'
+
+    @contextmanager
+    def phase(self, phase: str):
+        """Profile the enclosed block as one phase."""
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.stop(phase)
+
+    def start(self, phase: str):
+        """Start profiling a phase (for code that cannot use a with block)."""
+        if self.mode == 'cprofile':
+            global _cprofile_active
+            with _cprofile_lock:
+                if _cprofile_active:
+                    return
+                _cprofile_active = True
+            profile = cProfile.Profile()
+            self._active[phase] = profile
+            profile.enable()
+        elif self.mode == 'tracemalloc':
+            global _tracemalloc_users
+            with _tracemalloc_lock:
+                if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start(25)
+                _tracemalloc_users += 1
+            tracemalloc.reset_peak()
+            self._active[phase] = tracemalloc.take_snapshot()
+        elif self.mode == 'sampling':
+            sampler = _StackSampler(threading.get_ident(), self.SAMPLE_INTERVAL)
+            self._active[phase] = sampler
+            sampler.start()
+
+    def stop(self, phase: str):
+        """Stop profiling a phase and write its profile files."""
+        state = self._active.pop(phase, None)
+        if state is None:
+            return
+
+        if self.mode == 'cprofile':
+            global _cprofile_active
+            state.disable()
+            with _cprofile_lock:
+                _cprofile_active = False
+            state.dump_stats(self._path(phase, '.pstats'))
+            with open(self._path(phase, '.txt'), 'w', encoding='utf-8') as f:
+                stats = pstats.Stats(state, stream=f)
+                stats.sort_stats('cumulative').print_stats(self.TOP_ENTRIES)
+                stats.sort_stats('tottime').print_stats(self.TOP_ENTRIES)
+
+        elif self.mode == 'tracemalloc':
+            global _tracemalloc_users
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            top = after.compare_to(state, 'lineno')[:self.TOP_ENTRIES]
+            with open(self._path(phase, '.alloc.txt'), 'w', encoding='utf-8') as f:
+                f.write(f"# {self.name} / {phase}\n")
+                f.write(f"# Peak traced memory: {peak / 1024 / 1024:.2f} MiB "
+                        f"(process-wide; overlapping phases share it)\n")
+                f.write(f"# Top {len(top)} allocation sites by growth\n\n")
+                for stat in top:
+                    f.write(f"{stat}\n")
+            with _tracemalloc_lock:
+                _tracemalloc_users -= 1
+                if _tracemalloc_users == 0:
+                    tracemalloc.stop()
+
+        elif self.mode == 'sampling':
+            state.stop()
+            with open(self._path(phase, '.collapsed'), 'w', encoding='utf-8') as f:
+                for stack, count in sorted(state.counts.items()):
+                    f.write(f"{stack} {count}\n")
+
+    def wrap(self, phase: str, func: Callable) -> Callable:
+        """Wrap a function so every call is profiled as the given phase."""
+        if self.mode is None:
+            return func
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def profiled_async(*args, **kwargs):
+                with self.phase(phase):
+                    return await func(*args, **kwargs)
+            return profiled_async
+        return _ProfiledCall(self, phase, func)
+
+
+class _ProfiledCall:
+    """Picklable profiled call, so wrapped phases can run in worker processes."""
+
+    def __init__(self, profiler: Profiler, phase: str, func: Callable):
+        self.profiler = profiler
+        self.phase = phase
+        self.func = func
+
+    def __call__(self, *args, **kwargs):
+        # Worker processes write their own files; tag them to avoid clashes
+        phase = self.phase if os.getpid() == _MAIN_PID else f'{self.phase}.pid{os.getpid()}'
+        with self.profiler.phase(phase):
+            return self.func(*args, **kwargs)
+
+
+_MAIN_PID = os.getpid()
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            key = ';'.join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
@@ -0,0 +1,105 @@
+"""
+Run Journal - Append-only checkpoint log for resumable validation runs
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class RunJournal:
+    """
+    Append-only JSONL journal of completed work items.
+
+    Every completed verse or chapter is written as one line and flushed to
+    disk immediately, so an interrupted run loses at most the item in
+    progress. Replaying the journal returns the completed results per kind.
+    A truncated last line (crash mid-write) is ignored on replay. Once the
+    run's output is saved, complete() removes the journal so a later resume
+    starts fresh instead of replaying a finished run.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        """
+        Open a journal.
+
+        Args:
+            path: Journal file (JSONL)
+            resume: Keep and replay existing records; otherwise start fresh
+        """
+        self.path = Path(path)
+        self.completed: Dict[str, Dict[Any, Dict]] = {}
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists():
+            self._replay()
+            mode = 'a'
+        else:
+            mode = 'w'
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, mode, encoding='utf-8')
+        if mode == 'a' and self._file.tell() > 0 and not self._ends_with_newline():
+            # Terminate a line cut short by a crash so new records stay parseable
+            self._file.write('\n')
+        self._write({'kind': 'run', 'started': datetime.now().isoformat(), 'resumed': resume})
+
+    def _replay(self):
+        """Load completed records from an existing journal."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('kind') == 'run':
+                    continue
+                self.completed.setdefault(record['kind'], {})[record['key']] = record['result']
+
+    def _ends_with_newline(self) -> bool:
+        """Whether the existing journal ends with a complete line."""
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _write(self, record: Dict):
+        """Append one record and flush it to disk."""
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def get(self, kind: str, key: Any) -> Optional[Dict]:
+        """Result of an item completed in a previous run, if any."""
+        return self.completed.get(kind, {}).get(key)
+
+    def record(self, kind: str, key: Any, result: Dict):
+        """
+        Record a completed item.
+
+        Args:
+            kind: Item kind (verse / chapter)
+            key: Item key (verse key or chapter id)
+            result: Validation result for the item
+        """
+        self._write({'kind': kind, 'key': key, 'result': result})
+        self.completed.setdefault(kind, {})[key] = result
+
+    def count(self, kind: str) -> int:
+        """Number of completed items of a kind."""
+        return len(self.completed.get(kind, {}))
+
+    def close(self):
+        """Close the journal file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def complete(self):
+        """Close and remove the journal once the run's results are saved."""
+        self.close()
+        self.path.unlink(missing_ok=True)
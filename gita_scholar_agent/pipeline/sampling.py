@@ -0,0 +1,166 @@
+"""
+Sampling - Stratified verse sampling and corpus-wide quality estimates
+"""
+
+import math
+import random
+import statistics
+from typing import Dict, List, Optional, Tuple
+
+
+def allocate(stratum_sizes: Dict[int, int], sample_size: int,
+             stddevs: Optional[Dict[int, float]] = None) -> Dict[int, int]:
+    """
+    Split a sample size across strata (Neyman allocation).
+
+    Each stratum gets a share proportional to size x standard deviation of
+    previous scores, so chapters whose quality varies more are sampled more.
+    Without previous scores every stratum has the same deviation, which is
+    proportional allocation. Every stratum gets at least two items (one, or
+    none, when the sample is too small) so its variance can be estimated.
+
+    Args:
+        stratum_sizes: Stratum -> number of items
+        sample_size: Total sample size
+        stddevs: Stratum -> standard deviation of previous scores
+
+    Returns:
+        Stratum -> number of items to sample
+    """
+    strata = sorted(stratum_sizes)
+    total = sum(stratum_sizes.values())
+    sample_size = min(sample_size, total)
+    if sample_size >= 2 * len(strata):
+        minimum = 2
+    elif sample_size >= len(strata):
+        minimum = 1
+    else:
+        minimum = 0
+
+    allocation = {h: min(stratum_sizes[h], minimum) for h in strata}
+    remaining = sample_size - sum(allocation.values())
+
+    # Floor of 1.0 keeps strata with uniform past scores from being starved
+    weights = {h: stratum_sizes[h] * max((stddevs or {}).get(h, 1.0), 1.0) for h in strata}
+
+    while remaining > 0:
+        open_strata = [h for h in strata if allocation[h] < stratum_sizes[h]]
+        if not open_strata:
+            break
+        weight_sum = sum(weights[h] for h in open_strata)
+        shares = {h: remaining * weights[h] / weight_sum for h in open_strata}
+
+        # Largest remainder rounding, capped at the stratum size
+        granted = {h: min(int(shares[h]), stratum_sizes[h] - allocation[h]) for h in open_strata}
+        leftover = remaining - sum(granted.values())
+        for h in sorted(open_strata, key=lambda h: (-(shares[h] - int(shares[h])), h)):
+            if leftover <= 0:
+                break
+            if allocation[h] + granted[h] < stratum_sizes[h]:
+                granted[h] += 1
+                leftover -= 1
+
+        if not any(granted.values()):
+            break
+        for h, extra in granted.items():
+            allocation[h] += extra
+        remaining = sample_size - sum(allocation.values())
+
+    return allocation
+
+
+def draw_sample(verses_data: List[Dict], sample_size: int,
+                previous_scores: Optional[Dict[str, float]] = None,
+                seed: Optional[int] = None) -> Tuple[List[Dict], Dict]:
+    """
+    Draw a stratified random sample of verses (one stratum per chapter).
+
+    Args:
+        verses_data: All verse rows
+        sample_size: Number of verses to sample
+        previous_scores: Verse key -> score from an earlier run
+        seed: Random seed for a reproducible sample
+
+    Returns:
+        (sampled verse rows in input order, sampling plan)
+    """
+    strata: Dict[int, List[int]] = {}
+    for idx, verse in enumerate(verses_data):
+        strata.setdefault(verse['gv_chapter_id'], []).append(idx)
+
+    stddevs = {}
+    if previous_scores:
+        for chapter, indices in strata.items():
+            scores = [
+                previous_scores[key] for key in (
+                    f"{verses_data[i]['gv_chapter_id']}.{verses_data[i]['gv_verses_id']}" for i in indices
+                ) if key in previous_scores
+            ]
+            if len(scores) >= 2:
+                stddevs[chapter] = statistics.stdev(scores)
+
+    sizes = {chapter: len(indices) for chapter, indices in strata.items()}
+    allocation = allocate(sizes, sample_size, stddevs)
+
+    rng = random.Random(seed)
+    chosen = []
+    for chapter in sorted(strata):
+        chosen.extend(rng.sample(strata[chapter], allocation[chapter]))
+    chosen.sort()
+
+    plan = {
+        'sample_size': len(chosen),
+        'population_size': len(verses_data),
+        'seed': seed,
+        'allocation': 'neyman' if stddevs else 'proportional',
+        'strata': {
+            chapter: {'population': sizes[chapter], 'sampled': allocation[chapter]}
+            for chapter in sorted(strata)
+        }
+    }
+    return [verses_data[i] for i in chosen], plan
+
+
+def estimate_mean(plan: Dict, values_by_stratum: Dict[int, List[float]],
+                  confidence: float = 0.95) -> Dict:
+    """
+    Stratified estimate of the population mean with a confidence interval.
+
+    Uses the stratified mean sum(W_h * mean_h) and its variance
+    sum(W_h^2 * (1 - n_h/N_h) * s_h^2 / n_h), with a normal critical value.
+
+    Args:
+        plan: Sampling plan from draw_sample
+        values_by_stratum: Stratum -> observed values of the sampled items
+        confidence: Confidence level (0-1)
+
+    Returns:
+        Dictionary with estimate, standard_error, ci_low, ci_high, confidence
+    """
+    # Strata left out of a very small sample are excluded from the weights
+    population = sum(
+        info['population'] for stratum, info in plan['strata'].items()
+        if values_by_stratum.get(stratum)
+    ) or 1
+    mean = 0.0
+    variance = 0.0
+
+    for stratum, info in plan['strata'].items():
+        values = values_by_stratum.get(stratum, [])
+        if not values:
+            continue
+        weight = info['population'] / population
+        mean += weight * (sum(values) / len(values))
+        if len(values) >= 2:
+            finite_population = 1 - len(values) / info['population']
+            variance += weight ** 2 * finite_population * statistics.variance(values) / len(values)
+
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    standard_error = math.sqrt(variance)
+    return {
+        'estimate': round(mean, 2),
+        'standard_error': round(standard_error, 3),
+        'ci_low': round(mean - z * standard_error, 2),
+        'ci_high': round(mean + z * standard_error, 2),
+        'confidence': confidence
+    }
@@ -0,0 +1,192 @@
+"""
+Sharding - Deterministic split of validation work across workers, and merge of shard outputs
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Fixed per-verse overhead (source round trips) relative to per-character
+# comparison cost, used when balancing shards.
+VERSE_BASE_COST = 400
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard spec like '2/4' (1-based index / shard count).
+
+    Returns:
+        (index, count)
+    """
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d+)\s*', spec or '')
+    if not match:
+        raise ValueError(f"Invalid shard '{spec}', expected i/N (e.g. 1/4)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', index must be between 1 and {max(count, 1)}")
+    return index, count
+
+
+def verse_cost(verse: Dict) -> int:
+    """Expected validation cost of a verse (fetches + text comparison)."""
+    return VERSE_BASE_COST + len(verse.get('gv_verses') or '')
+
+
+def chapter_cost(chapter: Dict) -> int:
+    """Expected validation cost of a chapter's metadata."""
+    return VERSE_BASE_COST + len(chapter.get('ch_summary') or '')
+
+
+def assign_shards(items: Sequence[Dict], shard_count: int, cost: Callable[[Dict], int],
+                  key: Callable[[Dict], Tuple], group: Callable[[Dict], object] = None) -> List[int]:
+    """
+    Assign items to shards, balancing groups and expected cost.
+
+    Items are placed most expensive first (ties broken by key) on the shard
+    with the fewest items of the same group, then the lowest total cost, then
+    the lowest index. The result depends only on the items, so every worker
+    computes the same assignment independently.
+
+    Args:
+        items: Work items
+        shard_count: Number of shards
+        cost: Expected cost of an item
+        key: Stable sort key of an item
+        group: Group of an item (e.g. chapter) to spread evenly
+
+    Returns:
+        Zero-based shard index per item, in input order
+    """
+    order = sorted(range(len(items)), key=lambda i: (-cost(items[i]), key(items[i])))
+    loads = [0] * shard_count
+    group_counts: Dict[object, List[int]] = {}
+    assignment = [0] * len(items)
+
+    for i in order:
+        item = items[i]
+        counts = group_counts.setdefault(group(item) if group else None, [0] * shard_count)
+        shard = min(range(shard_count), key=lambda s: (counts[s], loads[s], s))
+        assignment[i] = shard
+        loads[shard] += cost(item)
+        counts[shard] += 1
+
+    return assignment
+
+
+def select_verses(verses_data: List[Dict], index: int, count: int) -> List[Dict]:
+    """Verses belonging to shard index/count (1-based index), in input order."""
+    assignment = assign_shards(
+        verses_data, count, verse_cost,
+        key=lambda v: (v['gv_chapter_id'], v['gv_verses_id']),
+        group=lambda v: v['gv_chapter_id']
+    )
+    return [verse for verse, shard in zip(verses_data, assignment) if shard == index - 1]
+
+
+def select_chapters(chapters_data: List[Dict], index: int, count: int) -> List[Dict]:
+    """Chapters belonging to shard index/count (1-based index), in input order."""
+    assignment = assign_shards(
+        chapters_data, count, chapter_cost,
+        key=lambda c: (c['ch_chapter_id'],)
+    )
+    return [chapter for chapter, shard in zip(chapters_data, assignment) if shard == index - 1]
+
+
+def shard_path(shard_dir: Path, index: int, count: int) -> Path:
+    """Partial result file of one shard."""
+    return Path(shard_dir) / f'shard_{index}_of_{count}.json'
+
+
+def write_shard(results: Dict, shard_dir: Path, index: int, count: int) -> Path:
+    """Save one shard's partial results."""
+    path = shard_path(shard_dir, index, count)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = {
+        'shard': {'index': index, 'count': count},
+        'validation_date': results['validation_date'],
+        'sources_used': results['sources_used'],
+        'verses': results['verses'],
+        'chapters': results['chapters'],
+        'special_chars': results['special_chars']
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(partial, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def merge_shards(shard_dir: Path) -> Dict:
+    """
+    Combine all shard files of a run into one set of validation results.
+
+    Args:
+        shard_dir: Directory holding shard_<i>_of_<N>.json files
+
+    Returns:
+        Results dict in the validate_all() layout, without scores and summary
+
+    Raises:
+        ValueError: When shards are missing or belong to different runs
+    """
+    paths = sorted(Path(shard_dir).glob('shard_*_of_*.json'))
+    if not paths:
+        raise ValueError(f"No shard files found in {shard_dir}")
+
+    shards = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            shards.append(json.load(f))
+
+    counts = {shard['shard']['count'] for shard in shards}
+    if len(counts) != 1:
+        raise ValueError(f"Shard files from different splits found: N = {sorted(counts)}")
+    count = counts.pop()
+    found = {shard['shard']['index'] for shard in shards}
+    missing = sorted(set(range(1, count + 1)) - found)
+    if missing:
+        raise ValueError(f"Missing shards {missing} of {count}")
+
+    shards.sort(key=lambda shard: shard['shard']['index'])
+    results = {
+        'validation_date': max(shard['validation_date'] for shard in shards),
+        'sources_used': [],
+        'verses': {},
+        'chapters': {},
+        'special_chars': {
+            'verses_with_issues': [],
+            'chapters_with_issues': [],
+            'total_dangerous_chars': 0,
+            'char_types': {}
+        },
+        'quality_scores': {},
+        'summary': {},
+        'shards_merged': count
+    }
+
+    for shard in shards:
+        for source in shard['sources_used']:
+            if source not in results['sources_used']:
+                results['sources_used'].append(source)
+        results['verses'].update(shard['verses'])
+        # JSON turns chapter ids into strings; restore them
+        results['chapters'].update({int(k): v for k, v in shard['chapters'].items()})
+
+        special_chars = shard['special_chars']
+        merged_chars = results['special_chars']
+        merged_chars['verses_with_issues'].extend(special_chars['verses_with_issues'])
+        merged_chars['chapters_with_issues'].extend(special_chars['chapters_with_issues'])
+        merged_chars['total_dangerous_chars'] += special_chars['total_dangerous_chars']
+        for char_type, char_count in special_chars['char_types'].items():
+            merged_chars['char_types'][char_type] = merged_chars['char_types'].get(char_type, 0) + char_count
+
+    # Restore natural order (chapter, verse) regardless of shard layout
+    def verse_order(key: str):
+        chapter, _, verse = key.partition('.')
+        return (int(chapter), int(verse)) if chapter.isdigit() and verse.isdigit() else (0, 0)
+
+    results['verses'] = dict(sorted(results['verses'].items(), key=lambda item: verse_order(item[0])))
+    results['chapters'] = dict(sorted(results['chapters'].items()))
+    results['special_chars']['verses_with_issues'].sort(key=lambda v: verse_order(v['verse']))
+    results['special_chars']['chapters_with_issues'].sort(key=lambda c: c['chapter_id'])
+
+    return results
@@ -0,0 +1,228 @@
+"""
+Telemetry - Per-phase and per-source metrics for validation runs
+"""
+
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Prometheus histogram buckets for source request latency (seconds)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Telemetry:
+    """
+    Thread-safe collector for run metrics.
+
+    - Phases: wall and CPU time (from PhaseScheduler timings)
+    - Sources: HTTP request counts, latencies, bytes, errors and retries
+    - Caches: hits and misses per cache (e.g. the resume journal)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.phases: Dict[str, Dict] = {}
+        self.sources: Dict[str, Dict] = {}
+        self.caches: Dict[str, Dict[str, int]] = {}
+        self._seen_urls: Dict[str, set] = {}
+
+    def _source(self, name: str) -> Dict:
+        """Metrics bucket of a source (call with the lock held)."""
+        if name not in self.sources:
+            self.sources[name] = {
+                'requests': 0,
+                'errors': 0,
+                'retries': 0,
+                'bytes_received': 0,
+                'latencies': []
+            }
+            self._seen_urls[name] = set()
+        return self.sources[name]
+
+    def record_request(self, source: str, url: str, seconds: float,
+                       bytes_received: int = 0, error: bool = False):
+        """
+        Record one HTTP request made by a source.
+
+        A request for a URL the source already fetched in this run counts as
+        a retry.
+        """
+        with self._lock:
+            metrics = self._source(source)
+            metrics['requests'] += 1
+            metrics['latencies'].append(seconds)
+            metrics['bytes_received'] += bytes_received
+            if error:
+                metrics['errors'] += 1
+            if url in self._seen_urls[source]:
+                metrics['retries'] += 1
+            self._seen_urls[source].add(url)
+
+    def record_cache(self, cache: str, hit: bool):
+        """Record a cache lookup."""
+        with self._lock:
+            counts = self.caches.setdefault(cache, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def record_phases(self, timings: Dict[str, Dict]):
+        """Take per-phase wall/CPU times from PhaseScheduler.timings."""
+        with self._lock:
+            for name, timing in timings.items():
+                if name == '_total':
+                    continue
+                self.phases[name] = {
+                    'wall_seconds': timing.get('duration_seconds', 0.0),
+                    'cpu_seconds': timing.get('cpu_seconds'),
+                    'executor': timing.get('executor')
+                }
+
+    def snapshot(self) -> Dict:
+        """All metrics as a JSON-serializable dict."""
+        with self._lock:
+            sources = {}
+            for name, metrics in self.sources.items():
+                latencies = sorted(metrics['latencies'])
+                sources[name] = {
+                    'requests': metrics['requests'],
+                    'errors': metrics['errors'],
+                    'error_rate': round(metrics['errors'] / metrics['requests'], 4) if metrics['requests'] else 0.0,
+                    'retries': metrics['retries'],
+                    'bytes_received': metrics['bytes_received'],
+                    'latency_seconds': {
+                        'p50': round(percentile(latencies, 0.50), 4),
+                        'p95': round(percentile(latencies, 0.95), 4),
+                        'p99': round(percentile(latencies, 0.99), 4),
+                        'max': round(latencies[-1], 4) if latencies else 0.0,
+                        'total': round(sum(latencies), 3)
+                    },
+                    'latency_histogram': {
+                        **{str(bound): sum(1 for v in latencies if v <= bound) for bound in LATENCY_BUCKETS},
+                        '+Inf': len(latencies)
+                    }
+                }
+
+            caches = {
+                name: {
+                    **counts,
+                    'hit_ratio': round(counts['hits'] / (counts['hits'] + counts['misses']), 4)
+                    if counts['hits'] + counts['misses'] else 0.0
+                }
+                for name, counts in self.caches.items()
+            }
+
+            return {
+                'run_started': self.started,
+                'run_seconds': round(time.time() - self.started, 3),
+                'phases': dict(self.phases),
+                'sources': sources,
+                'caches': caches
+            }
+
+    def write_json(self, path: Path):
+        """Write metrics.json."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def write_prometheus(self, path: Path):
+        """
+        Write metrics in the Prometheus text exposition format, for the
+        node_exporter textfile collector. Written to a temp file and renamed
+        so the collector never reads a partial file.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            '# HELP gita_phase_wall_seconds Wall time per validation phase',
+            '# TYPE gita_phase_wall_seconds gauge',
+        ]
+        for name, phase in snapshot['phases'].items():
+            lines.append(f'gita_phase_wall_seconds{{phase="{name}"}} {phase["wall_seconds"]}')
+        lines += [
+            '# HELP gita_phase_cpu_seconds CPU time per validation phase',
+            '# TYPE gita_phase_cpu_seconds gauge',
+        ]
+        for name, phase in snapshot['phases'].items():
+            if phase['cpu_seconds'] is not None:
+                lines.append(f'gita_phase_cpu_seconds{{phase="{name}"}} {phase["cpu_seconds"]}')
+
+        for metric, key, help_text in (
+            ('gita_source_requests_total', 'requests', 'HTTP requests per source'),
+            ('gita_source_errors_total', 'errors', 'Failed HTTP requests per source'),
+            ('gita_source_retries_total', 'retries', 'Repeated HTTP requests per source'),
+            ('gita_source_bytes_total', 'bytes_received', 'Response bytes per source'),
+        ):
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+            for name, source in snapshot['sources'].items():
+                lines.append(f'{metric}{{source="{_escape(name)}"}} {source[key]}')
+
+        lines += [
+            '# HELP gita_source_latency_seconds HTTP request latency per source',
+            '# TYPE gita_source_latency_seconds histogram',
+        ]
+        for name, source in snapshot['sources'].items():
+            label = _escape(name)
+            for bound, count in source['latency_histogram'].items():
+                lines.append(f'gita_source_latency_seconds_bucket{{source="{label}",le="{bound}"}} {count}')
+            lines.append(f'gita_source_latency_seconds_sum{{source="{label}"}} {source["latency_seconds"]["total"]}')
+            lines.append(f'gita_source_latency_seconds_count{{source="{label}"}} {source["requests"]}')
+
+        lines += [
+            '# HELP gita_cache_hit_ratio Cache hit ratio',
+            '# TYPE gita_cache_hit_ratio gauge',
+        ]
+        for name, cache in snapshot['caches'].items():
+            lines.append(f'gita_cache_hit_ratio{{cache="{name}"}} {cache["hit_ratio"]}')
+
+        path = Path(path)
+        temp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        temp_path.replace(path)
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class InstrumentedHttp:
+    """
+    Drop-in for the `requests` module functions used by sources (get/post)
+    that records every request in Telemetry under the source's name.
+    """
+
+    def __init__(self, http, telemetry: Telemetry, source_name: str):
+        self._http = http
+        self.telemetry = telemetry
+        self.source_name = source_name
+
+    def _request(self, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = getattr(self._http, method)(url, **kwargs)
+        except Exception:
+            self.telemetry.record_request(self.source_name, url, time.perf_counter() - start, error=True)
+            raise
+        self.telemetry.record_request(
+            self.source_name, url, time.perf_counter() - start,
+            bytes_received=len(response.content or b''),
+            error=response.status_code >= 400
+        )
+        return response
+
+    def get(self, url: str, **kwargs):
+        return self._request('get', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self._request('post', url, **kwargs)
@@ -10,9 +10,12 @@ from datetime import datetime
 from dotenv import load_dotenv
 from supabase import create_client
 from validators.special_char_validator import SpecialCharValidator
+from validators.batch_char_scanner import BatchCharScanner
+from reporters.sql_emitter import BatchedUpdateWriter, batch_size_from_argv
 
 # Load environment
 load_dotenv()
+batch_size = batch_size_from_argv()
 
 supabase_url = os.getenv('SUPABASE_URL')
 supabase_key = os.getenv('SUPABASE_KEY')
@@ -25,6 +28,7 @@ print()
 # Initialize
 client = create_client(supabase_url, supabase_key)
 char_validator = SpecialCharValidator()
+char_scanner = BatchCharScanner(char_validator)
 
 # Fetch all data
 print("📊 Fetching data from Supabase...")
@@ -73,18 +77,17 @@ print()
 
 # Check 3: Special characters in ALL verses
 print("🔍 Check 3: Scanning ALL verses for dangerous characters...")
-verses_with_issues = 0
-for verse in verses:
-    verse_text = verse.get('gv_verses', '')
-    issues = char_validator.validate_text(verse_text)
-    if issues:
-        verses_with_issues += 1
-        verse_key = f"{verse['gv_chapter_id']}.{verse['gv_verses_id']}"
-        results['special_chars']['verses_with_issues'].append({
-            'verse': verse_key,
-            'issues': issues
-        })
-        results['special_chars']['total_dangerous_chars'] += len(issues)
+verse_scan = char_scanner.scan_column([verse.get('gv_verses', '') for verse in verses])
+verse_issues = char_scanner.issues_by_row(verse_scan)
+verses_with_issues = len(verse_issues)
+for row_idx, issues in verse_issues.items():
+    verse = verses[row_idx]
+    verse_key = f"{verse['gv_chapter_id']}.{verse['gv_verses_id']}"
+    results['special_chars']['verses_with_issues'].append({
+        'verse': verse_key,
+        'issues': issues
+    })
+    results['special_chars']['total_dangerous_chars'] += len(issues)
 
 if verses_with_issues > 0:
     print(f"⚠️  Found dangerous characters in {verses_with_issues} verses")
@@ -95,28 +98,19 @@ print()
 
 # Check 4: Special characters in ALL chapters
 print("🔍 Check 4: Scanning ALL chapters for dangerous characters...")
-chapters_with_issues = 0
-for chapter in chapters:
-    fields = [
-        chapter.get('ch_title', ''),
-        chapter.get('ch_subtitle', ''),
-        chapter.get('ch_summary', ''),
-        chapter.get('ch_theme', '')
-    ]
-
-    chapter_issues = []
-    for field_value in fields:
-        if field_value:
-            issues = char_validator.validate_text(field_value)
-            chapter_issues.extend(issues)
-
-    if chapter_issues:
-        chapters_with_issues += 1
-        results['special_chars']['chapters_with_issues'].append({
-            'chapter_id': chapter['ch_chapter_id'],
-            'issues': chapter_issues
-        })
-        results['special_chars']['total_dangerous_chars'] += len(chapter_issues)
+chapter_fields = ['ch_title', 'ch_subtitle', 'ch_summary', 'ch_theme']
+chapter_scan = char_scanner.scan_rows(
+    [[chapter.get(field, '') for field in chapter_fields] for chapter in chapters],
+    chapter_fields
+)
+chapter_issues_by_row = char_scanner.issues_by_row(chapter_scan)
+chapters_with_issues = len(chapter_issues_by_row)
+for row_idx, chapter_issues in chapter_issues_by_row.items():
+    results['special_chars']['chapters_with_issues'].append({
+        'chapter_id': chapters[row_idx]['ch_chapter_id'],
+        'issues': chapter_issues
+    })
+    results['special_chars']['total_dangerous_chars'] += len(chapter_issues)
 
 if chapters_with_issues > 0:
     print(f"⚠️  Found dangerous characters in {chapters_with_issues} chapters")
@@ -225,32 +219,59 @@ with open(output_file, 'w', encoding='utf-8') as f:
 print(f"📄 Full report saved to: {output_file}")
 print()
 
-# Generate fix script if needed
+# Generate targeted fixes for the rows found above (no rescan)
 if results['special_chars']['total_dangerous_chars'] > 0:
-    fix_script = []
-    fix_script.append("-- Quick Fix Script for Special Characters")
-    fix_script.append(f"-- Generated: {datetime.now().isoformat()}")
-    fix_script.append("")
-    fix_script.append("BEGIN;")
-    fix_script.append("")
-    fix_script.append("-- Remove BOM characters")
-    fix_script.append("UPDATE gita_verses SET gv_verses = REPLACE(gv_verses, E'\\ufeff', '') WHERE gv_verses LIKE '%' || E'\\ufeff' || '%';")
-    fix_script.append("UPDATE chapters SET ch_summary = REPLACE(ch_summary, E'\\ufeff', '') WHERE ch_summary LIKE '%' || E'\\ufeff' || '%';")
-    fix_script.append("")
-    fix_script.append("-- Replace smart quotes")
-    fix_script.append("UPDATE gita_verses SET gv_verses = REPLACE(REPLACE(gv_verses, E'\\u2018', ''''), E'\\u2019', '''') WHERE gv_verses ~ '[\\u2018\\u2019]';")
-    fix_script.append("UPDATE gita_verses SET gv_verses = REPLACE(REPLACE(gv_verses, E'\\u201c', '\"'), E'\\u201d', '\"') WHERE gv_verses ~ '[\\u201c\\u201d]';")
-    fix_script.append("")
-    fix_script.append("-- Remove zero-width spaces")
-    fix_script.append("UPDATE gita_verses SET gv_verses = REPLACE(REPLACE(REPLACE(gv_verses, E'\\u200b', ''), E'\\u200c', ''), E'\\u200d', '') WHERE gv_verses ~ '[\\u200b\\u200c\\u200d]';")
-    fix_script.append("")
-    fix_script.append("COMMIT;")
-
-    fix_file = 'output/quick_fix_script.sql'
-    with open(fix_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(fix_script))
-
-    print(f"🔧 Fix script saved to: {fix_file}")
+    verse_fixes = []
+    for row_idx in verse_issues:
+        verse = verses[row_idx]
+        key = {'gv_chapter_id': verse['gv_chapter_id'], 'gv_verses_id': verse['gv_verses_id']}
+        fix = char_validator.get_row_fix('gita_verses', 'gv_verses', key, verse['gv_verses'])
+        if fix:
+            verse_fixes.append((key, fix))
+
+    chapter_fixes = {field: [] for field in chapter_fields}
+    for row_idx in chapter_issues_by_row:
+        chapter = chapters[row_idx]
+        key = {'ch_chapter_id': chapter['ch_chapter_id']}
+        for field in chapter_fields:
+            fix = char_validator.get_row_fix('chapters', field, key, chapter.get(field) or '')
+            if fix:
+                chapter_fixes[field].append((key, fix))
+
+    fix_count = len(verse_fixes) + sum(len(fixes) for fixes in chapter_fixes.values())
+    if fix_count:
+        fix_file = 'output/quick_fix_script.sql'
+        with open(fix_file, 'w', encoding='utf-8') as f:
+            f.write("-- Quick Fix Script for Special Characters\n")
+            f.write(f"-- Generated: {datetime.now().isoformat()}\n")
+            f.write("-- One targeted update per affected row and field\n")
+            f.write("\nBEGIN;\n\n")
+
+            with BatchedUpdateWriter(f, 'gita_verses', (('gv_chapter_id', 'integer'), ('gv_verses_id', 'integer')),
+                                     {'gv_verses': 'text'}, batch_size) as updates:
+                for key, fix in verse_fixes:
+                    updates.add((key['gv_chapter_id'], key['gv_verses_id']), {'gv_verses': fix['sanitized']},
+                                comment=f"Verse {key['gv_chapter_id']}.{key['gv_verses_id']}: {', '.join(fix['fix_types'])}")
+
+            for field, fixes in chapter_fixes.items():
+                with BatchedUpdateWriter(f, 'chapters', ('ch_chapter_id', 'integer'), {field: 'text'},
+                                         batch_size) as updates:
+                    for key, fix in fixes:
+                        updates.add(key['ch_chapter_id'], {field: fix['sanitized']},
+                                    comment=f"Chapter {key['ch_chapter_id']}: {', '.join(fix['fix_types'])}")
+
+            f.write("COMMIT;\n")
+
+        patches_file = 'output/quick_fix_patches.json'
+        with open(patches_file, 'w', encoding='utf-8') as f:
+            patches = [fix['rest'] for _, fix in verse_fixes]
+            patches += [fix['rest'] for fixes in chapter_fixes.values() for _, fix in fixes]
+            json.dump(patches, f, indent=2, ensure_ascii=False)
+
+        print(f"🔧 Fix script saved to: {fix_file} ({fix_count} row fixes)")
+        print(f"🔧 REST patches saved to: {patches_file}")
+    else:
+        print("ℹ️  Issues found need manual review (nothing to sanitize automatically)")
     print()
 
 print("="*80)
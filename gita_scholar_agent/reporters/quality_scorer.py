@@ -2,7 +2,9 @@
 Quality Scorer - Calculates quality scores for verses and chapters
 """
 
-from typing import Dict
+from typing import Dict, List, Optional
+
+import numpy as np
 
 
 class QualityScorer:
@@ -25,147 +27,213 @@ class QualityScorer:
         'char_safety': 20
     }
 
-    def calculate_verse_score(self, verse_result: Dict, special_chars_data: Dict) -> float:
+    def build_char_index(self, special_chars_data: Dict) -> Dict[str, Dict]:
         """
-        Calculate quality score for a verse (0-100).
+        Index special character scan results by verse key and chapter id.
 
         Args:
-            verse_result: Result from VerseValidator
             special_chars_data: Special character scan results
 
         Returns:
-            Score from 0-100
+            {'verses': {key: [entries, critical_entries]}, 'chapters': {...}}
         """
-        score = 0.0
+        index = {'verses': {}, 'chapters': {}}
+        for section, key_field, target in (
+            ('verses_with_issues', 'verse', index['verses']),
+            ('chapters_with_issues', 'chapter_id', index['chapters']),
+        ):
+            for entry in special_chars_data.get(section, []):
+                counts = target.setdefault(entry[key_field], [0, 0])
+                counts[0] += 1
+                if any(i['severity'] == 'critical' for i in entry['issues']):
+                    counts[1] += 1
+        return index
 
-        # 1. Accuracy Score (40 points) - Based on source agreement
-        if verse_result.get('similarity_scores'):
-            avg_similarity = sum(verse_result['similarity_scores'].values()) / len(verse_result['similarity_scores'])
-            score += (avg_similarity / 100) * self.VERSE_WEIGHTS['accuracy']
-        else:
-            # No sources available, give benefit of doubt
-            score += self.VERSE_WEIGHTS['accuracy'] * 0.7
-
-        # 2. Completeness Score (25 points) - All required fields present
-        has_text = bool(verse_result.get('text'))
-        has_chapter = bool(verse_result.get('chapter_id'))
-        has_verse_num = bool(verse_result.get('verse_id'))
-
-        completeness = (has_text + has_chapter + has_verse_num) / 3
-        score += completeness * self.VERSE_WEIGHTS['completeness']
-
-        # 3. Length Appropriateness (15 points)
-        length = verse_result.get('text_length', 0)
-        if 50 <= length <= 300:
-            score += self.VERSE_WEIGHTS['length']
-        elif 30 <= length < 50 or 300 < length <= 500:
-            score += self.VERSE_WEIGHTS['length'] * 0.7
-        elif length < 30 or length > 500:
-            score += self.VERSE_WEIGHTS['length'] * 0.3
-
-        # 4. Character Safety (10 points)
-        verse_key = verse_result.get('verse_key')
-        has_char_issues = any(
-            v['verse'] == verse_key
-            for v in special_chars_data.get('verses_with_issues', [])
+    @staticmethod
+    def _average(values: Dict) -> float:
+        """Mean of a dict of similarity scores, or NaN when there are none."""
+        if not values:
+            return np.nan
+        return sum(values.values()) / len(values)
+
+    @staticmethod
+    def _total(matrix: np.ndarray) -> List[float]:
+        """Row totals, added column by column and rounded like round(score, 2)."""
+        total = np.zeros(matrix.shape[0])
+        for column in range(matrix.shape[1]):
+            total = total + matrix[:, column]
+        return [round(score, 2) for score in total.tolist()]
+
+    def score_verses(self, verse_results: List[Dict], special_chars_data: Dict,
+                     char_index: Optional[Dict] = None) -> Dict:
+        """
+        Score many verses in one vectorized pass.
+
+        Args:
+            verse_results: Results from VerseValidator
+            special_chars_data: Special character scan results
+            char_index: Prebuilt build_char_index() result (optional)
+
+        Returns:
+            Dictionary with:
+            - scores: one score (0-100) per verse, in input order
+            - matrix: array of points per component, one row per verse
+            - components: column names of the matrix
+        """
+        weights = self.VERSE_WEIGHTS
+        index = (char_index or self.build_char_index(special_chars_data))['verses']
+
+        similarity = np.array([self._average(v.get('similarity_scores')) for v in verse_results], dtype=float)
+        present = np.array([
+            [bool(v.get('text')), bool(v.get('chapter_id')), bool(v.get('verse_id'))]
+            for v in verse_results
+        ], dtype=float).reshape(-1, 3)
+        length = np.array([v.get('text_length', 0) for v in verse_results], dtype=float)
+        char_counts = np.array([
+            index.get(v.get('verse_key'), (0, 0)) for v in verse_results
+        ], dtype=float).reshape(-1, 2)
+        critical = np.array([len(v.get('critical_issues', [])) for v in verse_results], dtype=float)
+
+        # 1. Accuracy - source agreement, benefit of doubt without sources
+        accuracy = np.where(
+            np.isnan(similarity),
+            weights['accuracy'] * 0.7,
+            (similarity / 100) * weights['accuracy']
         )
-        if not has_char_issues:
-            score += self.VERSE_WEIGHTS['char_safety']
-        else:
-            # Partial credit based on severity
-            critical_issues = sum(
-                1 for v in special_chars_data.get('verses_with_issues', [])
-                if v['verse'] == verse_key and any(i['severity'] == 'critical' for i in v['issues'])
-            )
-            if critical_issues == 0:
-                score += self.VERSE_WEIGHTS['char_safety'] * 0.5
-            else:
-                score += self.VERSE_WEIGHTS['char_safety'] * 0.2
-
-        # 5. Consistency (10 points) - No critical validation issues
-        critical_count = len(verse_result.get('critical_issues', []))
-        if critical_count == 0:
-            score += self.VERSE_WEIGHTS['consistency']
-        elif critical_count == 1:
-            score += self.VERSE_WEIGHTS['consistency'] * 0.5
-        else:
-            score += self.VERSE_WEIGHTS['consistency'] * 0.2
 
-        return round(score, 2)
+        # 2. Completeness - all required fields present
+        completeness = ((present[:, 0] + present[:, 1]) + present[:, 2]) / 3 * weights['completeness']
 
-    def calculate_chapter_score(self, chapter_result: Dict, special_chars_data: Dict) -> float:
+        # 3. Length appropriateness
+        length_points = np.select(
+            [(length >= 50) & (length <= 300),
+             ((length >= 30) & (length < 50)) | ((length > 300) & (length <= 500))],
+            [weights['length'], weights['length'] * 0.7],
+            weights['length'] * 0.3
+        )
+
+        # 4. Character safety - partial credit based on severity
+        char_safety = np.select(
+            [char_counts[:, 0] == 0, char_counts[:, 1] == 0],
+            [weights['char_safety'], weights['char_safety'] * 0.5],
+            weights['char_safety'] * 0.2
+        )
+
+        # 5. Consistency - no critical validation issues
+        consistency = np.select(
+            [critical == 0, critical == 1],
+            [weights['consistency'], weights['consistency'] * 0.5],
+            weights['consistency'] * 0.2
+        )
+
+        matrix = np.column_stack([accuracy, completeness, length_points, char_safety, consistency])
+        return {
+            'scores': self._total(matrix),
+            'matrix': matrix,
+            'components': list(weights)
+        }
+
+    def score_chapters(self, chapter_results: List[Dict], special_chars_data: Dict,
+                       char_index: Optional[Dict] = None) -> Dict:
         """
-        Calculate quality score for a chapter (0-100).
+        Score many chapters in one vectorized pass.
 
         Args:
-            chapter_result: Result from ChapterValidator
+            chapter_results: Results from ChapterValidator
             special_chars_data: Special character scan results
+            char_index: Prebuilt build_char_index() result (optional)
 
         Returns:
-            Score from 0-100
+            Dictionary with scores, matrix and components (see score_verses)
         """
-        score = 0.0
+        weights = self.CHAPTER_WEIGHTS
+        index = (char_index or self.build_char_index(special_chars_data))['chapters']
 
-        # 1. Title Accuracy (20 points) - Agreement across sources
-        if chapter_result.get('title_matches'):
-            title_scores = list(chapter_result['title_matches'].values())
-            avg_title_similarity = sum(title_scores) / len(title_scores)
-            score += (avg_title_similarity / 100) * self.CHAPTER_WEIGHTS['title_accuracy']
-        else:
-            # No sources available
-            score += self.CHAPTER_WEIGHTS['title_accuracy'] * 0.7
-
-        # 2. Summary Length (20 points)
-        summary_length = chapter_result.get('summary_length', 0)
-        if 300 <= summary_length <= 1000:
-            score += self.CHAPTER_WEIGHTS['summary_length']
-        elif 200 <= summary_length < 300 or 1000 < summary_length <= 1500:
-            score += self.CHAPTER_WEIGHTS['summary_length'] * 0.8
-        elif 100 <= summary_length < 200 or 1500 < summary_length <= 2000:
-            score += self.CHAPTER_WEIGHTS['summary_length'] * 0.5
-        else:
-            score += self.CHAPTER_WEIGHTS['summary_length'] * 0.3
-
-        # 3. Key Teachings Count (20 points)
-        teachings_count = chapter_result.get('key_teachings_count', 0)
-        if 3 <= teachings_count <= 7:
-            score += self.CHAPTER_WEIGHTS['key_teachings_count']
-        elif 2 <= teachings_count < 3 or 7 < teachings_count <= 10:
-            score += self.CHAPTER_WEIGHTS['key_teachings_count'] * 0.7
-        elif teachings_count == 1 or teachings_count > 10:
-            score += self.CHAPTER_WEIGHTS['key_teachings_count'] * 0.4
-        else:
-            score += self.CHAPTER_WEIGHTS['key_teachings_count'] * 0.1
-
-        # 4. Theme Validation (20 points) - Based on passed checks
-        passed_count = len(chapter_result.get('passed_checks', []))
-        total_checks = passed_count + len(chapter_result.get('warnings', [])) + len(chapter_result.get('critical_issues', []))
-        if total_checks > 0:
-            validation_rate = passed_count / total_checks
-            score += validation_rate * self.CHAPTER_WEIGHTS['theme_validation']
-        else:
-            score += self.CHAPTER_WEIGHTS['theme_validation'] * 0.5
+        similarity = np.array([self._average(c.get('title_matches')) for c in chapter_results], dtype=float)
+        summary_length = np.array([c.get('summary_length', 0) for c in chapter_results], dtype=float)
+        teachings = np.array([c.get('key_teachings_count', 0) for c in chapter_results], dtype=float)
+        passed = np.array([len(c.get('passed_checks', [])) for c in chapter_results], dtype=float)
+        checks = passed + np.array([
+            len(c.get('warnings', [])) + len(c.get('critical_issues', []))
+            for c in chapter_results
+        ], dtype=float)
+        char_counts = np.array([
+            index.get(c.get('chapter_id'), (0, 0)) for c in chapter_results
+        ], dtype=float).reshape(-1, 2)
 
-        # 5. Character Safety (20 points)
-        chapter_id = chapter_result.get('chapter_id')
-        has_char_issues = any(
-            c['chapter_id'] == chapter_id
-            for c in special_chars_data.get('chapters_with_issues', [])
+        # 1. Title accuracy - agreement across sources
+        title_accuracy = np.where(
+            np.isnan(similarity),
+            weights['title_accuracy'] * 0.7,
+            (similarity / 100) * weights['title_accuracy']
         )
-        if not has_char_issues:
-            score += self.CHAPTER_WEIGHTS['char_safety']
-        else:
-            # Partial credit
-            critical_issues = sum(
-                1 for c in special_chars_data.get('chapters_with_issues', [])
-                if c['chapter_id'] == chapter_id and any(i['severity'] == 'critical' for i in c['issues'])
+
+        # 2. Summary length
+        summary_points = np.select(
+            [(summary_length >= 300) & (summary_length <= 1000),
+             ((summary_length >= 200) & (summary_length < 300)) | ((summary_length > 1000) & (summary_length <= 1500)),
+             ((summary_length >= 100) & (summary_length < 200)) | ((summary_length > 1500) & (summary_length <= 2000))],
+            [weights['summary_length'], weights['summary_length'] * 0.8, weights['summary_length'] * 0.5],
+            weights['summary_length'] * 0.3
+        )
+
+        # 3. Key teachings count
+        teachings_points = np.select(
+            [(teachings >= 3) & (teachings <= 7),
+             ((teachings >= 2) & (teachings < 3)) | ((teachings > 7) & (teachings <= 10)),
+             (teachings == 1) | (teachings > 10)],
+            [weights['key_teachings_count'], weights['key_teachings_count'] * 0.7,
+             weights['key_teachings_count'] * 0.4],
+            weights['key_teachings_count'] * 0.1
+        )
+
+        # 4. Theme validation - share of passed checks
+        with np.errstate(divide='ignore', invalid='ignore'):
+            theme_points = np.where(
+                checks > 0,
+                (passed / checks) * weights['theme_validation'],
+                weights['theme_validation'] * 0.5
             )
-            if critical_issues == 0:
-                score += self.CHAPTER_WEIGHTS['char_safety'] * 0.6
-            else:
-                score += self.CHAPTER_WEIGHTS['char_safety'] * 0.3
 
-        return round(score, 2)
+        # 5. Character safety - partial credit
+        char_safety = np.select(
+            [char_counts[:, 0] == 0, char_counts[:, 1] == 0],
+            [weights['char_safety'], weights['char_safety'] * 0.6],
+            weights['char_safety'] * 0.3
+        )
+
+        matrix = np.column_stack([title_accuracy, summary_points, teachings_points, theme_points, char_safety])
+        return {
+            'scores': self._total(matrix),
+            'matrix': matrix,
+            'components': list(weights)
+        }
+
+    def calculate_verse_score(self, verse_result: Dict, special_chars_data: Dict) -> float:
+        """
+        Calculate quality score for a verse (0-100).
+
+        Args:
+            verse_result: Result from VerseValidator
+            special_chars_data: Special character scan results
+
+        Returns:
+            Score from 0-100
+        """
+        return self.score_verses([verse_result], special_chars_data)['scores'][0]
+
+    def calculate_chapter_score(self, chapter_result: Dict, special_chars_data: Dict) -> float:
+        """
+        Calculate quality score for a chapter (0-100).
+
+        Args:
+            chapter_result: Result from ChapterValidator
+            special_chars_data: Special character scan results
+
+        Returns:
+            Score from 0-100
+        """
+        return self.score_chapters([chapter_result], special_chars_data)['scores'][0]
 
     def get_score_grade(self, score: float) -> str:
         """Get letter grade for a score."""
@@ -0,0 +1,379 @@
+"""
+Report Diff - Compares two validation or scenario quality reports item by item
+"""
+
+import heapq
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from reporters.stream_writer import NDJSONReader, NDJSONWriter, decode, encode
+
+# Score changes smaller than this are rounding noise
+SCORE_EPSILON = 0.01
+# Items sorted in memory before spilling a sorted run to disk
+SORT_RUN_SIZE = 50000
+# Every verse and chapter belongs in a validation report: one that drops out is lost coverage
+COVERAGE_KINDS = ('verse', 'chapter')
+
+
+def item_key(kind: str, key) -> Tuple:
+    """Sort key of an item: verses and chapters in natural order, scenarios by id."""
+    if kind == 'verse':
+        chapter, _, verse = str(key).partition('.')
+        return ('verse', int(chapter), int(verse) if verse.isdigit() else 0, str(key))
+    if kind == 'chapter':
+        return ('chapter', int(key))
+    return (kind, str(key))
+
+
+def _lookup(scores: Dict, key) -> Optional[float]:
+    """Score by key whether the report stored keys as ints or strings."""
+    value = scores.get(key)
+    if value is None:
+        value = scores.get(str(key))
+    return value
+
+
+def _validation_item(kind: str, key, result: Dict, scores: Dict) -> Tuple[Tuple, Dict]:
+    issues = [f'critical: {message}' for message in result.get('critical_issues', [])]
+    issues += [f'warning: {message}' for message in result.get('warnings', [])]
+    return item_key(kind, key), {
+        'kind': kind,
+        'key': str(key),
+        'score': _lookup(scores, key),
+        'issues': issues
+    }
+
+
+def _scenario_item(scenario_id, title: str, issues: List[Dict]) -> Tuple[Tuple, Dict]:
+    return item_key('scenario', scenario_id), {
+        'kind': 'scenario',
+        'key': str(scenario_id),
+        'title': title,
+        'score': None,
+        'issues': [
+            f"{issue['severity']}: {issue['issue_type']} @ {issue['field']} {issue['location']}"
+            for issue in issues
+        ]
+    }
+
+
+def read_items(path: Path, totals: Dict) -> Iterator[Tuple[Tuple, Dict]]:
+    """
+    Stream (sort key, item) pairs from any supported report.
+
+    Supports validation_report.json / .ndjson[.gz|.zst] and
+    scenario_quality_report.json, either with embedded issues or pointing
+    to a streamed issues file. NDJSON streams are read record by record;
+    plain JSON documents have to be parsed whole first.
+
+    Args:
+        path: Report file
+        totals: Filled with report-level values (overall score)
+    """
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+
+        if 'issues_file' in report:
+            yield from _scenario_stream(NDJSONReader(path.parent / report['issues_file']))
+        elif 'issues' in report:
+            yield from _scenario_list(report['issues'])
+        else:
+            quality_scores = report.get('quality_scores', {})
+            totals['overall_score'] = quality_scores.get('overall_score')
+            for key, result in report.get('verses', {}).items():
+                yield _validation_item('verse', key, result, quality_scores.get('verse_scores', {}))
+            for key, result in report.get('chapters', {}).items():
+                yield _validation_item('chapter', key, result, quality_scores.get('chapter_scores', {}))
+        return
+
+    reader = NDJSONReader(path)
+    records = iter(reader)
+    first = next(records, None)
+    if first is None:
+        return
+    if first['type'] != 'run':
+        yield from _scenario_stream(reader)
+        return
+
+    quality_scores = first['data'].get('quality_scores', {})
+    totals['overall_score'] = quality_scores.get('overall_score')
+    scores = {'verse': quality_scores.get('verse_scores', {}), 'chapter': quality_scores.get('chapter_scores', {})}
+    for record in records:
+        yield _validation_item(record['type'], record['key'], record['result'], scores[record['type']])
+
+
+def _scenario_list(issues: List[Dict]) -> Iterator[Tuple[Tuple, Dict]]:
+    """Group an issue list (already grouped by scenario when scanned) into items."""
+    group: List[Dict] = []
+    for issue in issues:
+        if group and issue['scenario_id'] != group[0]['scenario_id']:
+            yield _scenario_item(group[0]['scenario_id'], group[0]['scenario_title'], group)
+            group = []
+        group.append(issue)
+    if group:
+        yield _scenario_item(group[0]['scenario_id'], group[0]['scenario_title'], group)
+
+
+def _scenario_stream(reader: NDJSONReader) -> Iterator[Tuple[Tuple, Dict]]:
+    """Items from streamed scenario records (a header followed by its issues)."""
+    scenario = None
+    issues: List[Dict] = []
+    for record in reader:
+        if record['type'] == 'scenario':
+            if scenario:
+                yield _scenario_item(scenario['scenario_id'], scenario['scenario_title'], issues)
+            scenario, issues = record, []
+        else:
+            issues.append(record)
+    if scenario:
+        yield _scenario_item(scenario['scenario_id'], scenario['scenario_title'], issues)
+
+
+def sorted_stream(items: Iterable[Tuple[Tuple, Dict]], run_size: int = SORT_RUN_SIZE) -> Iterator[Tuple[List, Dict]]:
+    """
+    Sort (key, item) pairs by key with bounded memory.
+
+    Inputs that fit in one run are sorted in memory; larger ones are spilled
+    as sorted NDJSON runs to temporary files and merged lazily.
+    """
+    run: List = []
+    run_files: List[str] = []
+    try:
+        for pair in items:
+            run.append([list(pair[0]), pair[1]])
+            if len(run) >= run_size:
+                run_files.append(_spill(run))
+                run = []
+
+        run.sort(key=lambda pair: pair[0])
+        if not run_files:
+            yield from run
+            return
+
+        run_files.append(_spill(run))
+        run = []
+        yield from heapq.merge(*(_read_run(name) for name in run_files), key=lambda pair: pair[0])
+    finally:
+        for name in run_files:
+            os.unlink(name)
+
+
+def _spill(run: List) -> str:
+    run.sort(key=lambda pair: pair[0])
+    with tempfile.NamedTemporaryFile('wb', suffix='.ndjson', delete=False) as f:
+        for pair in run:
+            f.write(encode(pair))
+    return f.name
+
+
+def _read_run(name: str) -> Iterator[List]:
+    with open(name, 'rb') as f:
+        for line in f:
+            yield decode(line)
+
+
+def merge_join(old: Iterator, new: Iterator) -> Iterator[Tuple[List, Optional[Dict], Optional[Dict]]]:
+    """
+    Walk two key-sorted streams together.
+
+    Yields:
+        (key, old item or None, new item or None)
+    """
+    sentinel = object()
+    old_pair = next(old, sentinel)
+    new_pair = next(new, sentinel)
+    while old_pair is not sentinel or new_pair is not sentinel:
+        if new_pair is sentinel or (old_pair is not sentinel and old_pair[0] < new_pair[0]):
+            yield old_pair[0], old_pair[1], None
+            old_pair = next(old, sentinel)
+        elif old_pair is sentinel or new_pair[0] < old_pair[0]:
+            yield new_pair[0], None, new_pair[1]
+            new_pair = next(new, sentinel)
+        else:
+            yield old_pair[0], old_pair[1], new_pair[1]
+            old_pair = next(old, sentinel)
+            new_pair = next(new, sentinel)
+
+
+def diff_item(old: Optional[Dict], new: Optional[Dict]) -> Optional[Dict]:
+    """
+    Change record for one item, or None when nothing changed.
+
+    Status is added / removed / regressed / improved / changed: an item
+    regresses when it gains issues or loses score. A removed verse or
+    chapter resolves none of its issues; it was simply not validated.
+    """
+    if old is None or new is None:
+        item = old or new
+        resolves = new is None and item['kind'] not in COVERAGE_KINDS
+        return {
+            'kind': item['kind'],
+            'key': item['key'],
+            'status': 'added' if old is None else 'removed',
+            'issues_added': item['issues'] if old is None else [],
+            'issues_resolved': item['issues'] if resolves else [],
+            'score_old': None if old is None else old['score'],
+            'score_new': None if new is None else new['score'],
+            'score_delta': None
+        }
+
+    old_issues, new_issues = set(old['issues']), set(new['issues'])
+    added = [issue for issue in new['issues'] if issue not in old_issues]
+    resolved = [issue for issue in old['issues'] if issue not in new_issues]
+    delta = None
+    if old['score'] is not None and new['score'] is not None:
+        delta = round(new['score'] - old['score'], 2)
+        if abs(delta) < SCORE_EPSILON:
+            delta = 0.0
+
+    if not added and not resolved and not delta:
+        return None
+
+    worse = bool(added) or (delta or 0) < 0
+    better = bool(resolved) or (delta or 0) > 0
+    status = 'changed' if worse and better else 'regressed' if worse else 'improved'
+
+    change = {
+        'kind': new['kind'],
+        'key': new['key'],
+        'status': status,
+        'issues_added': added,
+        'issues_resolved': resolved,
+        'score_old': old['score'],
+        'score_new': new['score'],
+        'score_delta': delta
+    }
+    if new.get('title'):
+        change['title'] = new['title']
+    return change
+
+
+def diff_reports(old_path: Path, new_path: Path, changes_path: Optional[Path] = None,
+                 top: int = 20) -> Dict:
+    """
+    Diff two reports of the same kind in one merge-join pass.
+
+    Args:
+        old_path: Baseline report
+        new_path: Report to compare
+        changes_path: Optional NDJSON file for every changed item
+        top: Number of worst regressions / best improvements to keep
+
+    Returns:
+        Dict with summary counts, overall score delta and the top
+        regressions and improvements. Verses and chapters missing from the
+        new report count as items_missing and rank as regressions.
+    """
+    old_totals: Dict = {}
+    new_totals: Dict = {}
+    old_items = sorted_stream(read_items(old_path, old_totals))
+    new_items = sorted_stream(read_items(new_path, new_totals))
+
+    summary = {
+        'items_compared': 0, 'items_added': 0, 'items_removed': 0,
+        'items_regressed': 0, 'items_improved': 0, 'items_changed': 0, 'items_unchanged': 0,
+        'items_added_with_issues': 0, 'items_missing': 0, 'issues_added': 0, 'issues_resolved': 0
+    }
+    # Bounded heaps: (rank, sequence, change); the sequence keeps ties stable
+    worst: List = []
+    best: List = []
+
+    writer = NDJSONWriter(changes_path) if changes_path else None
+    try:
+        for sequence, (_, old, new) in enumerate(merge_join(old_items, new_items)):
+            summary['items_compared'] += 1
+            change = diff_item(old, new)
+            if change is None:
+                summary['items_unchanged'] += 1
+                continue
+
+            summary[f"items_{change['status']}"] += 1
+            if change['status'] == 'added' and change['issues_added']:
+                summary['items_added_with_issues'] += 1
+            summary['issues_added'] += len(change['issues_added'])
+            summary['issues_resolved'] += len(change['issues_resolved'])
+            if writer:
+                writer.write(change, key=f"{change['kind']}:{change['key']}")
+
+            rank = len(change['issues_added']) - len(change['issues_resolved']) - (change['score_delta'] or 0)
+            if change['status'] == 'removed' and change['kind'] in COVERAGE_KINDS:
+                summary['items_missing'] += 1
+                _push(worst, (1, -sequence, change), top)
+            elif change['status'] in ('regressed', 'changed', 'added') and rank > 0:
+                _push(worst, (rank, -sequence, change), top)
+            elif change['status'] in ('improved', 'removed') and rank < 0:
+                _push(best, (-rank, -sequence, change), top)
+    finally:
+        if writer:
+            writer.close()
+
+    overall = {'old': old_totals.get('overall_score'), 'new': new_totals.get('overall_score')}
+    if overall['old'] is not None and overall['new'] is not None:
+        overall['delta'] = round(overall['new'] - overall['old'], 2)
+
+    return {
+        'old_report': str(old_path),
+        'new_report': str(new_path),
+        'summary': summary,
+        'overall_score': overall,
+        'top_regressions': [entry[2] for entry in sorted(worst, key=lambda e: (-e[0], -e[1]))],
+        'top_improvements': [entry[2] for entry in sorted(best, key=lambda e: (-e[0], -e[1]))]
+    }
+
+
+def _push(heap: List, entry: Tuple, limit: int):
+    if len(heap) < limit:
+        heapq.heappush(heap, entry)
+    elif entry[:2] > heap[0][:2]:
+        heapq.heapreplace(heap, entry)
+
+
+def render_diff(diff: Dict) -> str:
+    """Compact plain-text regression report."""
+    summary = diff['summary']
+    lines = [
+        "=" * 80,
+        "REPORT DIFF",
+        "=" * 80,
+        f"Old: {diff['old_report']}",
+        f"New: {diff['new_report']}",
+        ""
+    ]
+
+    overall = diff['overall_score']
+    if 'delta' in overall:
+        lines.append(f"Overall score: {overall['old']:.2f} -> {overall['new']:.2f} ({overall['delta']:+.2f})")
+    lines.append(
+        f"Items: {summary['items_compared']} compared, {summary['items_regressed']} regressed, "
+        f"{summary['items_improved']} improved, {summary['items_changed']} mixed, "
+        f"{summary['items_added']} added, {summary['items_removed']} removed"
+        + (f" ({summary['items_missing']} verses/chapters missing)" if summary['items_missing'] else "")
+    )
+    lines.append(f"Issues: +{summary['issues_added']} new, -{summary['issues_resolved']} resolved")
+
+    for title, changes in (('TOP REGRESSIONS', diff['top_regressions']),
+                           ('TOP IMPROVEMENTS', diff['top_improvements'])):
+        if not changes:
+            continue
+        lines.append("")
+        lines.append(title)
+        lines.append("-" * 80)
+        for change in changes:
+            label = f"{change['kind']} {change['key']}"
+            if change.get('title'):
+                label += f" ({change['title'][:50]})"
+            if change['score_delta']:
+                label += f"  score {change['score_old']:.2f} -> {change['score_new']:.2f}"
+            lines.append(f"{change['status'].upper():<10} {label}")
+            for issue in change['issues_added'][:5]:
+                lines.append(f"    + {issue[:100]}")
+            for issue in change['issues_resolved'][:5]:
+                lines.append(f"    - {issue[:100]}")
+
+    return "\n".join(lines)
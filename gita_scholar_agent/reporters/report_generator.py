@@ -2,8 +2,18 @@
 Report Generator - Generates SQL fix scripts and HTML dashboards
 """
 
-from typing import Dict
+import json
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from jinja2 import Environment, FileSystemLoader, ModuleLoader, select_autoescape
+
+TEMPLATE_DIR = Path(__file__).parent / 'templates'
+COMPILED_DIR = TEMPLATE_DIR / '__pycache__'
+DETAIL_CHUNK_SIZE = 2000
+DETAIL_PAGE_SIZE = 50
 
 
 class ReportGenerator:
@@ -149,12 +159,17 @@ class ReportGenerator:
 
         return '\n'.join(sql_lines)
 
-    def generate_html_dashboard(self, validation_results: Dict) -> str:
+    def generate_html_dashboard(self, validation_results: Dict, tables: Optional[Dict] = None) -> str:
         """
         Generate HTML quality dashboard.
 
+        Only the summary is rendered into the page. Detail tables are listed
+        by `tables` (see write_detail_chunks) and loaded by the browser when
+        opened, with client-side filtering and pagination.
+
         Args:
             validation_results: Full validation results
+            tables: Optional detail table manifest
 
         Returns:
             HTML content as string
@@ -174,246 +189,137 @@ class ReportGenerator:
             status_color = '#F44336'  # Red
             status_text = 'NEEDS IMPROVEMENT'
 
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Gita Scholar Validation Report</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }}
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }}
-        .header p {{
-            font-size: 1.1em;
-            opacity: 0.9;
-        }}
-        .overall-score {{
-            background: {status_color};
-            color: white;
-            padding: 40px;
-            text-align: center;
-        }}
-        .score-number {{
-            font-size: 4em;
-            font-weight: bold;
-            margin: 20px 0;
-        }}
-        .score-status {{
-            font-size: 1.5em;
-            letter-spacing: 3px;
-        }}
-        .metrics {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            padding: 30px;
-        }}
-        .metric-card {{
-            background: #f8f9fa;
-            border-radius: 10px;
-            padding: 20px;
-            border-left: 4px solid #667eea;
-        }}
-        .metric-card h3 {{
-            color: #333;
-            margin-bottom: 10px;
-            font-size: 0.9em;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        .metric-card .value {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #667eea;
-        }}
-        .issues-section {{
-            padding: 30px;
-            background: #fff3cd;
-            border-top: 3px solid #ffc107;
-        }}
-        .issues-section.critical {{
-            background: #f8d7da;
-            border-top: 3px solid #f44336;
-        }}
-        .issues-section.success {{
-            background: #d4edda;
-            border-top: 3px solid #4CAF50;
-        }}
-        .issues-section h2 {{
-            margin-bottom: 15px;
-            color: #333;
-        }}
-        .issue-list {{
-            list-style: none;
-        }}
-        .issue-list li {{
-            padding: 10px;
-            margin: 5px 0;
-            background: white;
-            border-radius: 5px;
-            border-left: 3px solid #667eea;
-        }}
-        .breakdown {{
-            padding: 30px;
-            background: #f8f9fa;
-        }}
-        .breakdown h2 {{
-            margin-bottom: 20px;
-            color: #333;
-        }}
-        .breakdown-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-        }}
-        .breakdown-item {{
-            background: white;
-            padding: 15px;
-            border-radius: 8px;
-            border: 1px solid #ddd;
-        }}
-        .breakdown-item strong {{
-            display: block;
-            margin-bottom: 5px;
-            color: #667eea;
-        }}
-        .footer {{
-            padding: 20px;
-            text-align: center;
-            background: #f8f9fa;
-            color: #666;
-            font-size: 0.9em;
-        }}
-        .progress-bar {{
-            background: #e0e0e0;
-            border-radius: 10px;
-            height: 20px;
-            overflow: hidden;
-            margin-top: 10px;
-        }}
-        .progress-fill {{
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            height: 100%;
-            transition: width 0.3s ease;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🕉️ Gita Scholar Validation Report</h1>
-            <p>Comprehensive Quality Analysis of Bhagavad Gita Database</p>
-            <p style="font-size: 0.9em; opacity: 0.8; margin-top: 10px;">
-                Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}
-            </p>
-        </div>
-
-        <div class="overall-score">
-            <div class="score-status">{status_text}</div>
-            <div class="score-number">{overall_score:.1f}/100</div>
-            <div class="progress-bar">
-                <div class="progress-fill" style="width: {overall_score}%"></div>
-            </div>
-        </div>
-
-        <div class="metrics">
-            <div class="metric-card">
-                <h3>Verses Analyzed</h3>
-                <div class="value">{summary.get('total_verses_analyzed', 0)}</div>
-                <p style="margin-top: 5px; color: #666;">Expected: 700</p>
-            </div>
-            <div class="metric-card">
-                <h3>Chapters Analyzed</h3>
-                <div class="value">{summary.get('total_chapters_analyzed', 0)}</div>
-                <p style="margin-top: 5px; color: #666;">Expected: 18</p>
-            </div>
-            <div class="metric-card">
-                <h3>Critical Issues</h3>
-                <div class="value" style="color: {'#f44336' if summary.get('critical_issues_count', 0) > 0 else '#4CAF50'};">
-                    {summary.get('critical_issues_count', 0)}
-                </div>
-            </div>
-            <div class="metric-card">
-                <h3>Warnings</h3>
-                <div class="value" style="color: {'#FFC107' if summary.get('warnings_count', 0) > 0 else '#4CAF50'};">
-                    {summary.get('warnings_count', 0)}
-                </div>
-            </div>
-            <div class="metric-card">
-                <h3>Dangerous Characters</h3>
-                <div class="value" style="color: {'#f44336' if summary.get('dangerous_chars_found', 0) > 0 else '#4CAF50'};">
-                    {summary.get('dangerous_chars_found', 0)}
-                </div>
-            </div>
-            <div class="metric-card">
-                <h3>Validation Sources</h3>
-                <div class="value">{len(validation_results.get('sources_used', []))}</div>
-                <p style="margin-top: 5px; color: #666;">Authoritative</p>
-            </div>
-        </div>
-
-        <div class="breakdown">
-            <h2>Score Breakdown</h2>
-            <div class="breakdown-grid">
-                <div class="breakdown-item">
-                    <strong>Average Verse Score</strong>
-                    {quality_scores.get('breakdown', {}).get('avg_verse_score', 0):.2f}/100
-                </div>
-                <div class="breakdown-item">
-                    <strong>Average Chapter Score</strong>
-                    {quality_scores.get('breakdown', {}).get('avg_chapter_score', 0):.2f}/100
-                </div>
-                <div class="breakdown-item">
-                    <strong>Lowest Verse Score</strong>
-                    {quality_scores.get('breakdown', {}).get('min_verse_score', 0):.2f}/100
-                </div>
-                <div class="breakdown-item">
-                    <strong>Highest Verse Score</strong>
-                    {quality_scores.get('breakdown', {}).get('max_verse_score', 0):.2f}/100
-                </div>
-            </div>
-        </div>
-
-        <div class="issues-section {'critical' if summary.get('critical_issues_count', 0) > 0 else 'success' if summary.get('warnings_count', 0) == 0 else ''}">
-            <h2>{'⚠️ Critical Issues' if summary.get('critical_issues_count', 0) > 0 else '✅ Validation Status'}</h2>
-            <ul class="issue-list">
-                {'<li>All critical checks passed!</li>' if summary.get('critical_issues_count', 0) == 0 else ''}
-                {'<li>Verse count verified: 700 verses ✓</li>' if summary.get('verse_count_correct') else '<li style="color: #f44336;">❌ Verse count mismatch - Expected 700, found ' + str(summary.get('total_verses_analyzed', 0)) + '</li>'}
-                {'<li>No dangerous characters found ✓</li>' if summary.get('dangerous_chars_found', 0) == 0 else '<li style="color: #f44336;">❌ ' + str(summary.get('dangerous_chars_found', 0)) + ' dangerous characters found</li>'}
-                {'<li>All chapters validated ✓</li>' if summary.get('total_chapters_analyzed', 0) == 18 else ''}
-            </ul>
-        </div>
-
-        <div class="footer">
-            <p><strong>Gita Scholar Agent v1.0</strong></p>
-            <p>Validation Sources: {', '.join(validation_results.get('sources_used', []))}</p>
-            <p style="margin-top: 10px;">For detailed results, see validation_report.json</p>
-        </div>
-    </div>
-</body>
-</html>"""
-
-        return html
+        template = _template_environment().get_template('dashboard.html.j2')
+        return template.render(
+            generated=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+            status_color=status_color,
+            status_text=status_text,
+            overall_score=overall_score,
+            summary=summary,
+            breakdown=quality_scores.get('breakdown', {}),
+            critical_count=summary.get('critical_issues_count', 0),
+            warnings_count=summary.get('warnings_count', 0),
+            dangerous_chars=summary.get('dangerous_chars_found', 0),
+            sources_used=validation_results.get('sources_used', []),
+            tables=tables or {},
+            page_size=DETAIL_PAGE_SIZE
+        )
+
+    def detail_tables(self, validation_results: Dict) -> Dict[str, Dict]:
+        """
+        Rows of the dashboard's detail tables.
+
+        Returns:
+            Dict of table name -> title, columns and rows (lists of cells)
+        """
+        quality_scores = validation_results.get('quality_scores', {})
+        verse_scores = quality_scores.get('verse_scores', {})
+        chapter_scores = quality_scores.get('chapter_scores', {})
+
+        def score(scores: Dict, key) -> str:
+            value = scores.get(key, scores.get(str(key)))
+            return '' if value is None else f'{value:.2f}'
+
+        def item_row(key, result: Dict, scores: Dict) -> List:
+            critical = result.get('critical_issues', [])
+            warnings = result.get('warnings', [])
+            return [str(key), score(scores, key), len(critical), len(warnings), '; '.join(critical + warnings)]
+
+        special_chars = validation_results.get('special_chars', {})
+        char_rows = []
+        for entry in special_chars.get('verses_with_issues', []):
+            for issue in entry['issues']:
+                char_rows.append([f"verse {entry['verse']}", issue['type'], issue.get('position', ''), issue['severity']])
+        for entry in special_chars.get('chapters_with_issues', []):
+            for issue in entry['issues']:
+                location = f"chapter {entry['chapter_id']}"
+                if issue.get('field'):
+                    location += f" {issue['field']}"
+                char_rows.append([location, issue['type'], issue.get('position', ''), issue['severity']])
+
+        item_columns = ['Item', 'Score', 'Critical', 'Warnings', 'Issues']
+        return {
+            'verses': {
+                'title': 'Verses',
+                'columns': item_columns,
+                'rows': [item_row(key, result, verse_scores)
+                         for key, result in validation_results.get('verses', {}).items()]
+            },
+            'chapters': {
+                'title': 'Chapters',
+                'columns': item_columns,
+                'rows': [item_row(key, result, chapter_scores)
+                         for key, result in validation_results.get('chapters', {}).items()]
+            },
+            'special_chars': {
+                'title': 'Special Characters',
+                'columns': ['Location', 'Type', 'Position', 'Severity'],
+                'rows': char_rows
+            }
+        }
+
+    def write_detail_chunks(self, validation_results: Dict, data_dir: Path,
+                            chunk_size: int = DETAIL_CHUNK_SIZE) -> Dict[str, Dict]:
+        """
+        Write detail table rows as chunk scripts for the dashboard.
+
+        Each chunk is a JSON array wrapped in a dashboardChunk() call, so the
+        page can load it with a script tag even when opened from disk.
+
+        Args:
+            validation_results: Full validation results
+            data_dir: Directory next to the dashboard for the chunk files
+            chunk_size: Rows per chunk
+
+        Returns:
+            Table manifest for generate_html_dashboard
+        """
+        data_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {}
+
+        for name, table in self.detail_tables(validation_results).items():
+            for stale in data_dir.glob(f'{name}_*.js'):
+                stale.unlink()
+
+            rows = table['rows']
+            chunks = []
+            for index, start in enumerate(range(0, len(rows), chunk_size)):
+                chunk_file = data_dir / f'{name}_{index:04d}.js'
+                with open(chunk_file, 'w', encoding='utf-8') as f:
+                    f.write(f'dashboardChunk({json.dumps(name)}, {index}, ')
+                    json.dump(rows[start:start + chunk_size], f, separators=(',', ':'))
+                    f.write(');\n')
+                chunks.append(f'{data_dir.name}/{chunk_file.name}')
+
+            manifest[name] = {
+                'title': table['title'],
+                'columns': table['columns'],
+                'rows': len(rows),
+                'chunks': chunks
+            }
+
+        return manifest
+
+
+@lru_cache(maxsize=1)
+def _template_environment() -> Environment:
+    """
+    Jinja2 environment over precompiled templates.
+
+    Templates are compiled to Python modules in templates/__pycache__ when
+    missing or older than their sources; if that directory is not writable
+    they are compiled in memory instead.
+    """
+    sources = list(TEMPLATE_DIR.glob('*.j2'))
+    stamp = COMPILED_DIR / '.compiled'
+    source_env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)), autoescape=select_autoescape(['html', 'j2']))
+
+    try:
+        if not stamp.exists() or any(src.stat().st_mtime > stamp.stat().st_mtime for src in sources):
+            COMPILED_DIR.mkdir(exist_ok=True)
+            source_env.compile_templates(str(COMPILED_DIR), zip=None, ignore_errors=False)
+            stamp.touch()
+    except OSError:
+        return source_env
+
+    return Environment(loader=ModuleLoader(str(COMPILED_DIR)), autoescape=select_autoescape(['html', 'j2']))
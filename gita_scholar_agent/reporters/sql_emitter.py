@@ -0,0 +1,204 @@
+"""
+SQL Emitter - Writes batched, set-based UPDATE scripts with safe literal escaping
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+
+DEFAULT_BATCH_SIZE = 500
+
+# scenarios.sc_action_steps is TEXT[] (see SUPABASE_DATABASE_DOCUMENTATION.md)
+ACTION_STEPS_COLUMNS = {'sc_action_steps': 'text[]'}
+
+
+def quote_literal(value: str) -> str:
+    """
+    Quote a string as a standard SQL literal.
+
+    Assumes standard_conforming_strings = on (the Postgres default), so
+    only single quotes need doubling and backslashes are literal.
+    """
+    if '\x00' in value:
+        raise ValueError('Postgres text cannot contain NUL characters')
+    return "'" + value.replace("'", "''") + "'"
+
+
+def sql_literal(value, sql_type: str) -> str:
+    """
+    Render a Python value as a typed SQL literal.
+
+    Supported types: text, integer, bigint, uuid, jsonb, text[].
+    None becomes a typed NULL.
+    """
+    if value is None:
+        return f'NULL::{sql_type}'
+    if sql_type in ('integer', 'bigint'):
+        if isinstance(value, bool) or not isinstance(value, int):
+            value = int(str(value).strip())
+        return str(value)
+    if sql_type == 'text':
+        return quote_literal(str(value))
+    if sql_type == 'uuid':
+        return quote_literal(str(value)) + '::uuid'
+    if sql_type == 'jsonb':
+        return quote_literal(json.dumps(value, ensure_ascii=False)) + '::jsonb'
+    if sql_type == 'text[]':
+        if isinstance(value, str):
+            raise TypeError('text[] values must be a list of strings, not a string')
+        items = ', '.join('NULL' if item is None else quote_literal(str(item)) for item in value)
+        return f'ARRAY[{items}]::text[]'
+    raise ValueError(f"Unsupported SQL type '{sql_type}'")
+
+
+def batch_size_from_argv(default: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Read --batch-size from sys.argv, for scripts without an argument
+    parser. The option is removed from sys.argv.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--batch-size', type=int, default=default)
+    args, remaining = parser.parse_known_args(sys.argv[1:])
+    sys.argv[1:] = remaining
+    return max(1, args.batch_size)
+
+
+class BatchedUpdateWriter:
+    """
+    Streams rows into UPDATE ... FROM (VALUES ...) statements.
+
+    Each statement updates up to `batch_size` rows in one pass instead of
+    one UPDATE per row. Rows are written as soon as a batch fills, so
+    memory stays bounded by the batch size (plus the keys seen, for the
+    row count). If a key is added twice in one batch, the later values
+    win; `rows` counts each key once.
+
+    Usage:
+        with BatchedUpdateWriter(f, 'scenarios', ('scenario_id', 'integer'),
+                                 ACTION_STEPS_COLUMNS) as updates:
+            updates.add(361, {'sc_action_steps': steps}, comment='Scenario 361')
+    """
+
+    def __init__(self, out: TextIO, table: str, key, columns: Dict[str, str],
+                 batch_size: int = DEFAULT_BATCH_SIZE, extra_set: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            out: Open text file to write to
+            table: Table to update
+            key: (key column, SQL type) used to match rows, or a tuple of
+                such pairs for a composite key
+            columns: Column name -> SQL type of the updated columns
+            batch_size: Rows per UPDATE statement
+            extra_set: Column -> SQL expression applied to every updated
+                row (e.g. {'updated_at': 'NOW()'})
+        """
+        self.out = out
+        self.table = table
+        self.keys: Tuple[Tuple[str, str], ...] = (key,) if isinstance(key[0], str) else tuple(key)
+        self.columns = columns
+        self.batch_size = max(1, batch_size)
+        self.extra_set = extra_set or {}
+        self.rows = 0
+        self.statements = 0
+        self._keys_seen = set()
+        self._batch: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def add(self, key, values: Dict, comment: Optional[str] = None):
+        """
+        Queue one row update; values must cover every configured column.
+        For a composite key, `key` is a tuple of values in key order.
+        """
+        missing = [column for column in self.columns if column not in values]
+        if missing:
+            raise KeyError(f"Missing values for {', '.join(missing)}")
+
+        key_values = key if len(self.keys) > 1 else (key,)
+        if len(key_values) != len(self.keys):
+            raise ValueError(f"Expected {len(self.keys)} key values, got {len(key_values)}")
+        key_literal = ', '.join(sql_literal(value, sql_type) for value, (_, sql_type) in zip(key_values, self.keys))
+        cells = [key_literal] + [sql_literal(values[column], sql_type) for column, sql_type in self.columns.items()]
+        if key_literal not in self._keys_seen:
+            self._keys_seen.add(key_literal)
+            self.rows += 1
+        self._batch[key_literal] = ('(' + ', '.join(cells) + ')', comment)
+
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def comment(self, text: str):
+        """Write a comment line between statements."""
+        for line in str(text).splitlines() or ['']:
+            self.out.write(f'-- {line}\n')
+
+    def flush(self):
+        """Write the queued rows as one statement."""
+        if not self._batch:
+            return
+
+        rows: List[Tuple[str, Optional[str]]] = list(self._batch.values())
+        self._batch = {}
+
+        assignments = [f'{column} = v.{column}' for column in self.columns]
+        assignments += [f'{column} = {expression}' for column, expression in self.extra_set.items()]
+        key_columns = [column for column, _ in self.keys]
+        value_columns = ', '.join(key_columns + list(self.columns))
+
+        self.out.write(f'UPDATE {self.table} AS t\n')
+        self.out.write('SET ' + ',\n    '.join(assignments) + '\n')
+        self.out.write('FROM (VALUES\n')
+        for idx, (row, comment) in enumerate(rows):
+            separator = ',' if idx < len(rows) - 1 else ''
+            note = f'  -- {_one_line(comment)}' if comment else ''
+            self.out.write(f'    {row}{separator}{note}\n')
+        self.out.write(f') AS v({value_columns})\n')
+        self.out.write('WHERE ' + ' AND '.join(f't.{column} = v.{column}' for column in key_columns) + ';\n\n')
+        self.statements += 1
+
+    def close(self):
+        """Flush the last batch."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _one_line(text: str) -> str:
+    """Comment text that cannot break out of its line."""
+    return ' '.join(str(text).split())
+
+
+def write_update_script(path: str, header: Sequence[str], table: str, key: Tuple[str, str],
+                        columns: Dict[str, str], rows, batch_size: int = DEFAULT_BATCH_SIZE,
+                        footer: Sequence[str] = ()) -> BatchedUpdateWriter:
+    """
+    Write a complete transaction: header comments, batched updates, COMMIT.
+
+    Args:
+        path: Output .sql file
+        header: Comment lines (without the leading '-- ')
+        table, key, columns, batch_size: See BatchedUpdateWriter
+        rows: Iterable of (key, values, comment)
+        footer: Comment lines written after COMMIT; '{rows}' is replaced
+            with the number of updated rows
+
+    Returns:
+        The (closed) writer, for its row and statement counts
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in header:
+            f.write(f'-- {line}'.rstrip() + '\n')
+        f.write('\nBEGIN;\n\n')
+
+        with BatchedUpdateWriter(f, table, key, columns, batch_size) as updates:
+            for row_key, values, comment in rows:
+                updates.add(row_key, values, comment)
+
+        f.write('COMMIT;\n')
+        for line in footer:
+            f.write(f'-- {line}'.replace('{rows}', str(updates.rows)).rstrip() + '\n')
+
+    return updates
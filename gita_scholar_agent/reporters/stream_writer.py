@@ -0,0 +1,217 @@
+"""
+Stream Writer - Writes reports as NDJSON records with an index for random access
+"""
+
+import bisect
+import gzip
+import json
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+SUFFIXES = {'none': '.ndjson', 'gzip': '.ndjson.gz', 'zstd': '.ndjson.zst'}
+
+
+def encode(record: Dict) -> bytes:
+    """One compact JSON line (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) + b'\n'
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=_default) + '\n').encode('utf-8')
+
+
+def decode(line: bytes) -> Dict:
+    """Parse one JSON line."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _default(value):
+    """Encode numpy scalars and arrays without importing numpy here."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def check_compression(compression: str):
+    """Raise ValueError for unknown or unavailable compressions."""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}' (expected one of {', '.join(COMPRESSIONS)})")
+    if compression == 'zstd' and zstandard is None:
+        raise ValueError("zstd compression needs the 'zstandard' package")
+
+
+def stream_path(base: Union[str, Path], compression: str = 'none') -> Path:
+    """Output path for a report base name (without extension)."""
+    return Path(f'{base}{SUFFIXES[compression]}')
+
+
+def index_path(path: Union[str, Path]) -> Path:
+    """Index file written next to a stream."""
+    return Path(f'{path}.idx.json')
+
+
+class NDJSONWriter:
+    """
+    Appends records one line at a time.
+
+    Records are grouped in blocks of `block_size`. Compressed streams start
+    a new gzip member / zstd frame per block, so any record can be read back
+    by decompressing one block only. The index records each block's byte
+    offset and, for keyed records, which record numbers belong to each key.
+
+    Usage:
+        with NDJSONWriter(stream_path('output/report', 'gzip'), 'gzip') as writer:
+            writer.write({'type': 'issue', ...}, key=scenario_id)
+    """
+
+    def __init__(self, path: Union[str, Path], compression: str = 'none', block_size: int = 1000):
+        check_compression(compression)
+        self.path = Path(path)
+        self.compression = compression
+        self.block_size = block_size
+        self.records = 0
+        self.blocks: List[List[int]] = []  # [byte offset, first record number]
+        self.keys: Dict[str, List[int]] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'wb')
+        self._pending: List[bytes] = []
+        self._compressor = zstandard.ZstdCompressor() if compression == 'zstd' else None
+
+    def write(self, record: Dict, key: Optional[object] = None) -> int:
+        """Write one record and return its record number."""
+        number = self.records
+        if number % self.block_size == 0:
+            self._flush_block()
+            self.blocks.append([self._file.tell(), number])
+
+        line = encode(record)
+        if self.compression == 'none':
+            self._file.write(line)
+        else:
+            self._pending.append(line)
+
+        if key is not None:
+            self.keys.setdefault(str(key), []).append(number)
+        self.records += 1
+        return number
+
+    def _flush_block(self):
+        """Compress the buffered lines as one independent member/frame."""
+        if not self._pending:
+            return
+        data = b''.join(self._pending)
+        self._pending = []
+        if self.compression == 'gzip':
+            self._file.write(gzip.compress(data, compresslevel=6))
+        else:
+            self._file.write(self._compressor.compress(data))
+
+    def close(self) -> Path:
+        """Flush the last block and write the index file."""
+        if self._file.closed:
+            return index_path(self.path)
+
+        self._flush_block()
+        self._file.close()
+
+        idx = index_path(self.path)
+        with open(idx, 'w', encoding='utf-8') as f:
+            json.dump({
+                'stream': self.path.name,
+                'compression': self.compression,
+                'records': self.records,
+                'block_size': self.block_size,
+                'blocks': self.blocks,
+                'keys': self.keys
+            }, f, separators=(',', ':'))
+        return idx
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NDJSONReader:
+    """Reads a stream sequentially, or single records/keys through its index."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(index_path(self.path), 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.compression = self.index['compression']
+        self._block_starts = [first for _, first in self.index['blocks']]
+        self._cache = (None, [])  # last decoded block
+
+    def __len__(self) -> int:
+        return self.index['records']
+
+    def __iter__(self) -> Iterator[Dict]:
+        """All records in order, one block in memory at a time."""
+        for block in range(len(self.index['blocks'])):
+            for line in self._block_lines(block):
+                yield decode(line)
+
+    def get(self, number: int) -> Dict:
+        """Record by record number."""
+        if not 0 <= number < len(self):
+            raise IndexError(f'record {number} out of range')
+        block = bisect.bisect_right(self._block_starts, number) - 1
+        return decode(self._block_lines(block)[number - self._block_starts[block]])
+
+    def lookup(self, key: object) -> List[Dict]:
+        """All records written with a key, in write order."""
+        return [self.get(number) for number in self.index['keys'].get(str(key), [])]
+
+    def keys(self) -> List[str]:
+        """Keys in first-written order."""
+        return list(self.index['keys'])
+
+    def _block_lines(self, block: int) -> List[bytes]:
+        """Decoded lines of one block (the last block read is cached)."""
+        if self._cache[0] == block:
+            return self._cache[1]
+
+        offset = self.index['blocks'][block][0]
+        count = min(self.index['block_size'], len(self) - self.index['blocks'][block][1])
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            if self.compression == 'none':
+                lines = [f.readline() for _ in range(count)]
+            else:
+                lines = self._decompress_block(f).splitlines(keepends=True)
+
+        self._cache = (block, lines)
+        return lines
+
+    def _decompress_block(self, f) -> bytes:
+        """Decompress one gzip member / zstd frame starting at the current position."""
+        if self.compression == 'gzip':
+            decompressor = zlib.decompressobj(wbits=31)
+        else:
+            if zstandard is None:
+                raise ValueError("Reading zstd streams needs the 'zstandard' package")
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+        chunks = []
+        while not decompressor.eof:
+            chunk = f.read(65536)
+            if not chunk:
+                break
+            chunks.append(decompressor.decompress(chunk))
+        return b''.join(chunks)
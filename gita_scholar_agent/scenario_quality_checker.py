@@ -5,10 +5,16 @@ Scans all scenarios and identifies quality issues across all fields.
 """
 
 from supabase import create_client, Client
+import argparse
 import json
-import re
 from datetime import datetime
-from typing import List, Dict, Tuple
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from validators.scenario_rules import ScenarioRuleEngine
+from validators.phrase_matcher import PhraseMatcher
+from pipeline.profiling import Profiler, add_profile_argument
+from reporters.stream_writer import COMPRESSIONS, NDJSONReader, NDJSONWriter, check_compression, stream_path
 
 # Supabase credentials
 SUPABASE_URL = "https://wlfwdtdtiedlcczfoslt.supabase.co"
@@ -18,9 +24,14 @@ SUPABASE_KEY = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJ
 class ScenarioQualityChecker:
     """Check scenarios for quality issues."""
 
-    def __init__(self):
+    def __init__(self, stream_file: Optional[str] = None, compression: str = 'none'):
         self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.rule_engine = ScenarioRuleEngine()
+        self.phrase_matcher = PhraseMatcher.default()
         self.issues = []
+        # Streaming mode: issues go straight to an NDJSON file instead of self.issues
+        self.writer = NDJSONWriter(stream_file, compression) if stream_file else None
+        self.scenario_issue_counts: Dict[str, List] = {}  # scenario_id -> [title, issues]
         self.stats = {
             'total_scenarios': 0,
             'scenarios_with_issues': 0,
@@ -43,74 +54,24 @@ class ScenarioQualityChecker:
             if not stripped:
                 continue
 
-            # Check for incomplete sentences ending with etc
-            if re.search(r'\betc\b[.]?$', stripped):
-                issues.append({
-                    'scenario_id': scenario_id,
-                    'scenario_title': scenario_title,
-                    'field': field_name,
-                    'issue_type': 'incomplete_sentence_etc',
-                    'severity': 'high',
-                    'location': f'line {line_num}',
-                    'content': stripped[:100],
-                    'full_content': stripped
-                })
+            for rule in self.rule_engine.evaluate(stripped, 'scenario_text'):
+                issues.append(self._build_issue(
+                    rule, scenario_id, scenario_title, field_name, f'line {line_num}', stripped
+                ))
 
-            # Check for sentences ending with open parenthesis
-            if stripped.endswith('('):
-                issues.append({
-                    'scenario_id': scenario_id,
-                    'scenario_title': scenario_title,
-                    'field': field_name,
-                    'issue_type': 'unclosed_parenthesis',
-                    'severity': 'high',
-                    'location': f'line {line_num}',
-                    'content': stripped[-50:],
-                    'full_content': stripped
-                })
-
-            # Check for sentences ending with comma or 'and'
-            if re.search(r'[,]\s*$', stripped) or re.search(r'\band\s*$', stripped, re.IGNORECASE):
+            # Check for placeholder text
+            for _ in self.phrase_matcher.ordered_labels(stripped, 'placeholder'):
                 issues.append({
                     'scenario_id': scenario_id,
                     'scenario_title': scenario_title,
                     'field': field_name,
-                    'issue_type': 'incomplete_sentence_ending',
-                    'severity': 'medium',
+                    'issue_type': 'placeholder_text',
+                    'severity': 'critical',
                     'location': f'line {line_num}',
-                    'content': stripped[-50:],
+                    'content': stripped[:100],
                     'full_content': stripped
                 })
 
-            # Check for very short lines (< 15 chars) that don't look like proper bullets
-            if len(stripped) < 15 and not stripped.endswith(('.', ':', '!', '?')):
-                if not re.match(r'^\d+\.', stripped):  # Not a numbered list
-                    issues.append({
-                        'scenario_id': scenario_id,
-                        'scenario_title': scenario_title,
-                        'field': field_name,
-                        'issue_type': 'very_short_line',
-                        'severity': 'medium',
-                        'location': f'line {line_num}',
-                        'content': stripped,
-                        'full_content': stripped
-                    })
-
-            # Check for placeholder text
-            placeholders = ['TODO', 'TBD', 'FIXME', 'XXX', '[insert', '[add']
-            for placeholder in placeholders:
-                if placeholder.lower() in stripped.lower():
-                    issues.append({
-                        'scenario_id': scenario_id,
-                        'scenario_title': scenario_title,
-                        'field': field_name,
-                        'issue_type': 'placeholder_text',
-                        'severity': 'critical',
-                        'location': f'line {line_num}',
-                        'content': stripped[:100],
-                        'full_content': stripped
-                    })
-
         return issues
 
     def check_action_steps(self, action_steps: List, scenario_id: str, scenario_title: str) -> List[Dict]:
@@ -126,53 +87,10 @@ class ScenarioQualityChecker:
 
             stripped = step.strip()
 
-            # Check for very short steps (< 10 chars)
-            if len(stripped) < 10:
-                issues.append({
-                    'scenario_id': scenario_id,
-                    'scenario_title': scenario_title,
-                    'field': 'sc_action_steps',
-                    'issue_type': 'very_short_action_step',
-                    'severity': 'high',
-                    'location': f'step {idx}',
-                    'content': stripped,
-                    'full_content': stripped
-                })
-
-            # Check for fragments that look like they're part of previous step
-            fragment_patterns = [
-                r'^etc[.]?\)?\s*$',  # "etc.)" or "etc"
-                r'^[a-z]+\)$',  # single word with closing paren like "kindness)"
-                r'^[a-z]{3,10}$',  # single short word
-                r'^\([a-z]+$',  # starts with open paren
-            ]
-
-            for pattern in fragment_patterns:
-                if re.match(pattern, stripped):
-                    issues.append({
-                        'scenario_id': scenario_id,
-                        'scenario_title': scenario_title,
-                        'field': 'sc_action_steps',
-                        'issue_type': 'fragment_action_step',
-                        'severity': 'critical',
-                        'location': f'step {idx}',
-                        'content': stripped,
-                        'full_content': stripped,
-                        'note': 'Likely a fragment from previous step'
-                    })
-
-            # Check for incomplete sentences in steps
-            if re.search(r'\betc\b[.]?$', stripped):
-                issues.append({
-                    'scenario_id': scenario_id,
-                    'scenario_title': scenario_title,
-                    'field': 'sc_action_steps',
-                    'issue_type': 'incomplete_action_step',
-                    'severity': 'high',
-                    'location': f'step {idx}',
-                    'content': stripped,
-                    'full_content': stripped
-                })
+            for rule in self.rule_engine.evaluate(stripped, 'action_step'):
+                issues.append(self._build_issue(
+                    rule, scenario_id, scenario_title, 'sc_action_steps', f'step {idx}', stripped
+                ))
 
             # Check for unclosed parentheses
             open_count = stripped.count('(')
@@ -192,6 +110,23 @@ class ScenarioQualityChecker:
 
         return issues
 
+    def _build_issue(self, rule: Dict, scenario_id: str, scenario_title: str,
+                     field_name: str, location: str, text: str) -> Dict:
+        """Build an issue record for a matched rule."""
+        issue = {
+            'scenario_id': scenario_id,
+            'scenario_title': scenario_title,
+            'field': field_name,
+            'issue_type': rule.get('issue_type', rule['id']),
+            'severity': rule['severity'],
+            'location': location,
+            'content': self.rule_engine.quote(rule, text),
+            'full_content': text
+        }
+        if rule.get('note'):
+            issue['note'] = rule['note']
+        return issue
+
     def check_scenario(self, scenario: Dict) -> List[Dict]:
         """Check a single scenario for all quality issues."""
         all_issues = []
@@ -237,6 +172,72 @@ class ScenarioQualityChecker:
                 self.stats['issues_by_field'][field] = \
                     self.stats['issues_by_field'].get(field, 0) + 1
 
+    def record_issues(self, scenario: Dict, issues: List[Dict]):
+        """Keep a scenario's issues, or stream them when a writer is attached."""
+        if self.writer is None:
+            self.issues.extend(issues)
+            return
+
+        scenario_id = issues[0]['scenario_id']
+        scenario_title = issues[0]['scenario_title']
+        self.scenario_issue_counts[scenario_id] = [scenario_title, len(issues)]
+
+        # The title is written once per scenario; each line's text once per location
+        self.writer.write({'type': 'scenario', 'scenario_id': scenario_id, 'scenario_title': scenario_title},
+                          key=scenario_id)
+        seen_locations = set()
+        for issue in issues:
+            record = {k: v for k, v in issue.items() if k not in ('scenario_id', 'scenario_title')}
+            record['type'] = 'issue'
+            location = (issue['field'], issue['location'])
+            if location in seen_locations:
+                del record['full_content']
+            seen_locations.add(location)
+            if issue['content'] == issue['full_content']:
+                del record['content']
+            self.writer.write(record, key=scenario_id)
+
+    @staticmethod
+    def expand_records(records: List[Dict]) -> List[Dict]:
+        """Rebuild full issue dicts from one scenario's streamed records."""
+        issues = []
+        texts = {}
+        scenario_id = scenario_title = None
+        for record in records:
+            if record['type'] == 'scenario':
+                scenario_id, scenario_title = record['scenario_id'], record['scenario_title']
+                continue
+
+            location = (record['field'], record['location'])
+            full_content = record.get('full_content', texts.get(location))
+            texts[location] = full_content
+
+            issue = {'scenario_id': scenario_id, 'scenario_title': scenario_title}
+            issue.update({k: v for k, v in record.items() if k != 'type'})
+            issue['content'] = record.get('content', full_content)
+            issue['full_content'] = full_content
+            issues.append(issue)
+        return issues
+
+    def _issues_by_scenario(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """(scenario_id, issues) pairs, most issues first."""
+        if self.writer is not None:
+            reader = NDJSONReader(self.writer.path)
+            ranked = sorted(self.scenario_issue_counts.items(), key=lambda x: x[1][1], reverse=True)
+            for scenario_id, _ in ranked:
+                yield scenario_id, self.expand_records(reader.lookup(scenario_id))
+            return
+
+        issues_by_scenario = {}
+        for issue in self.issues:
+            scenario_id = issue['scenario_id']
+            if scenario_id not in issues_by_scenario:
+                issues_by_scenario[scenario_id] = []
+            issues_by_scenario[scenario_id].append(issue)
+
+        # Sort by number of issues
+        yield from sorted(issues_by_scenario.items(), key=lambda x: len(x[1]), reverse=True)
+
     def scan_all_scenarios(self, batch_size: int = 100):
         """Scan all scenarios in the database."""
         print("Starting database scan...")
@@ -264,7 +265,7 @@ class ScenarioQualityChecker:
                     issues = self.check_scenario(scenario)
 
                     if issues:
-                        self.issues.extend(issues)
+                        self.record_issues(scenario, issues)
                         self.update_stats(issues)
 
                 if batch_size_actual < batch_size:
@@ -281,64 +282,55 @@ class ScenarioQualityChecker:
 
     def generate_report(self) -> str:
         """Generate quality report."""
-        report_lines = []
+        return "\n".join(self.report_lines())
 
+    def report_lines(self) -> Iterator[str]:
+        """Quality report, one line at a time."""
         # Header
-        report_lines.append("=" * 80)
-        report_lines.append("SCENARIO QUALITY REPORT")
-        report_lines.append("=" * 80)
-        report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report_lines.append("")
+        yield "=" * 80
+        yield "SCENARIO QUALITY REPORT"
+        yield "=" * 80
+        yield f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield ""
 
         # Summary statistics
-        report_lines.append("SUMMARY STATISTICS")
-        report_lines.append("-" * 80)
-        report_lines.append(f"Total Scenarios Scanned: {self.stats['total_scenarios']}")
-        report_lines.append(f"Scenarios with Issues: {self.stats['scenarios_with_issues']}")
-        report_lines.append(f"Total Issues Found: {self.stats['total_issues']}")
-        report_lines.append(f"Issue Rate: {(self.stats['scenarios_with_issues'] / max(self.stats['total_scenarios'], 1) * 100):.1f}%")
-        report_lines.append("")
+        yield "SUMMARY STATISTICS"
+        yield "-" * 80
+        yield f"Total Scenarios Scanned: {self.stats['total_scenarios']}"
+        yield f"Scenarios with Issues: {self.stats['scenarios_with_issues']}"
+        yield f"Total Issues Found: {self.stats['total_issues']}"
+        yield f"Issue Rate: {(self.stats['scenarios_with_issues'] / max(self.stats['total_scenarios'], 1) * 100):.1f}%"
+        yield ""
 
         # Issues by type
         if self.stats['issues_by_type']:
-            report_lines.append("ISSUES BY TYPE")
-            report_lines.append("-" * 80)
+            yield "ISSUES BY TYPE"
+            yield "-" * 80
             sorted_types = sorted(self.stats['issues_by_type'].items(), key=lambda x: x[1], reverse=True)
             for issue_type, count in sorted_types:
-                report_lines.append(f"  {issue_type}: {count}")
-            report_lines.append("")
+                yield f"  {issue_type}: {count}"
+            yield ""
 
         # Issues by field
         if self.stats['issues_by_field']:
-            report_lines.append("ISSUES BY FIELD")
-            report_lines.append("-" * 80)
+            yield "ISSUES BY FIELD"
+            yield "-" * 80
             sorted_fields = sorted(self.stats['issues_by_field'].items(), key=lambda x: x[1], reverse=True)
             for field, count in sorted_fields:
-                report_lines.append(f"  {field}: {count}")
-            report_lines.append("")
+                yield f"  {field}: {count}"
+            yield ""
 
         # Detailed issues
-        if self.issues:
-            report_lines.append("DETAILED ISSUES")
-            report_lines.append("=" * 80)
-
-            # Group by scenario
-            issues_by_scenario = {}
-            for issue in self.issues:
-                scenario_id = issue['scenario_id']
-                if scenario_id not in issues_by_scenario:
-                    issues_by_scenario[scenario_id] = []
-                issues_by_scenario[scenario_id].append(issue)
-
-            # Sort by number of issues
-            sorted_scenarios = sorted(issues_by_scenario.items(), key=lambda x: len(x[1]), reverse=True)
-
-            for idx, (scenario_id, scenario_issues) in enumerate(sorted_scenarios, 1):
+        if self.issues or self.scenario_issue_counts:
+            yield "DETAILED ISSUES"
+            yield "=" * 80
+
+            for idx, (scenario_id, scenario_issues) in enumerate(self._issues_by_scenario(), 1):
                 first_issue = scenario_issues[0]
-                report_lines.append(f"\n{idx}. Scenario: {first_issue['scenario_title']}")
-                report_lines.append(f"   ID: {scenario_id}")
-                report_lines.append(f"   Issues: {len(scenario_issues)}")
-                report_lines.append("")
+                yield f"\n{idx}. Scenario: {first_issue['scenario_title']}"
+                yield f"   ID: {scenario_id}"
+                yield f"   Issues: {len(scenario_issues)}"
+                yield ""
 
                 for issue in scenario_issues:
                     severity_emoji = {
@@ -348,39 +340,60 @@ class ScenarioQualityChecker:
                         'low': '🟢'
                     }.get(issue['severity'], '⚪')
 
-                    report_lines.append(f"   {severity_emoji} [{issue['severity'].upper()}] {issue['issue_type']}")
-                    report_lines.append(f"      Field: {issue['field']}")
-                    report_lines.append(f"      Location: {issue['location']}")
-                    report_lines.append(f"      Content: {issue['content']}")
+                    yield f"   {severity_emoji} [{issue['severity'].upper()}] {issue['issue_type']}"
+                    yield f"      Field: {issue['field']}"
+                    yield f"      Location: {issue['location']}"
+                    yield f"      Content: {issue['content']}"
                     if issue.get('note'):
-                        report_lines.append(f"      Note: {issue['note']}")
-                    report_lines.append("")
+                        yield f"      Note: {issue['note']}"
+                    yield ""
 
-        return "\n".join(report_lines)
 
     def save_report(self, filename: str = "output/scenario_quality_report.txt"):
-        """Save report to file."""
-        report = self.generate_report()
+        """
+        Save report to file.
+
+        Returns the report text, or None when streaming (the report is then
+        written line by line and never held in memory).
+        """
+        streaming = self.writer is not None
+        if streaming:
+            index_file = self.writer.close()
 
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write(report)
+            for line in self.report_lines():
+                f.write(line + "\n")
 
         print(f"\n✅ Report saved to: {filename}")
 
         # Also save JSON for programmatic access
         json_filename = filename.replace('.txt', '.json')
         with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'stats': self.stats,
-                'issues': self.issues
-            }, f, indent=2, ensure_ascii=False)
+            if streaming:
+                json.dump({
+                    'stats': self.stats,
+                    'issues_file': self.writer.path.name,
+                    'index_file': index_file.name
+                }, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump({
+                    'stats': self.stats,
+                    'issues': self.issues
+                }, f, indent=2, ensure_ascii=False)
 
         print(f"✅ JSON data saved to: {json_filename}")
+        if streaming:
+            print(f"✅ Issues streamed to: {self.writer.path}")
+            return None
 
-        return report
+        return self.generate_report()
 
     def get_top_issues(self, limit: int = 10) -> List[Tuple[str, str, int]]:
         """Get top N scenarios with most issues."""
+        if self.writer is not None:
+            ranked = sorted(self.scenario_issue_counts.items(), key=lambda x: x[1][1], reverse=True)
+            return [(sid, title, count) for sid, (title, count) in ranked[:limit]]
+
         issues_by_scenario = {}
 
         for issue in self.issues:
@@ -410,13 +423,32 @@ def main():
     print("Scenario Quality Checker")
     print("=" * 80)
 
-    checker = ScenarioQualityChecker()
+    parser = argparse.ArgumentParser(description='Scan all scenarios for quality issues')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream issues to an indexed NDJSON file instead of one JSON document')
+    parser.add_argument('--compress', choices=COMPRESSIONS, default='none',
+                        help='Compression of the streamed issues (zstd needs the zstandard package)')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    try:
+        check_compression(args.compress)
+    except ValueError as e:
+        parser.error(str(e))
+
+    profiler = Profiler(args.profile, 'scenario_quality_checker')
+    stream_file = None
+    if args.stream:
+        stream_file = stream_path(Path('output') / 'scenario_quality_issues', args.compress)
+    checker = ScenarioQualityChecker(stream_file, args.compress)
 
     # Scan all scenarios
-    checker.scan_all_scenarios()
+    with profiler.phase('scan'):
+        checker.scan_all_scenarios()
 
     # Generate and save report
-    report = checker.save_report()
+    with profiler.phase('save_report'):
+        report = checker.save_report()
 
     # Print summary
     print("\n" + "=" * 80)
@@ -16,6 +16,9 @@ import random
 # Import sources
 from sources.vedabase_source import VedabaseSource
 from sources.holy_bhagavad_gita_source import HolyBhagavadGitaSource
+from pipeline.profiling import Profiler
+
+profiler = Profiler.from_argv('semantic_validator')
 
 # Load environment
 load_dotenv()
@@ -39,6 +42,7 @@ print("   ✓ Holy-Bhagavad-Gita.org (Mukundananda)")
 print()
 
 # Fetch data
+profiler.start('fetch')
 print("📊 Fetching data from Supabase...")
 verses_response = client.table('gita_verses').select('*').order('gv_chapter_id, gv_verses_id').execute()
 chapters_response = client.table('chapters').select('*').order('ch_chapter_id').execute()
@@ -49,6 +53,7 @@ chapters = chapters_response.data
 print(f"✓ Fetched {len(verses)} verses")
 print(f"✓ Fetched {len(chapters)} chapters")
 print()
+profiler.stop('fetch')
 
 # Results
 results = {
@@ -174,13 +179,15 @@ async def validate_all_verses():
         await asyncio.sleep(0.5)
 
 # Run validation
-asyncio.run(validate_all_verses())
+with profiler.phase('verses'):
+    asyncio.run(validate_all_verses())
 
 print()
 print("🔍 Semantic Validation of Chapters")
 print("="*80)
 
 # Validate chapter titles and themes
+profiler.start('chapters')
 for chapter in chapters:
     ch_id = chapter['ch_chapter_id']
     title = chapter.get('ch_title', '')
@@ -252,6 +259,8 @@ for chapter in chapters:
         for issue in chapter_result['issues']:
             print(f"      {issue}")
 
+profiler.stop('chapters')
+
 print()
 print("="*80)
 print("SEMANTIC VALIDATION SUMMARY")
@@ -301,7 +310,7 @@ print()
 # Save results
 os.makedirs('output', exist_ok=True)
 output_file = 'output/semantic_validation_report.json'
-with open(output_file, 'w', encoding='utf-8') as f:
+with profiler.phase('save_report'), open(output_file, 'w', encoding='utf-8') as f:
     json.dump(results, f, indent=2, ensure_ascii=False)
 
 print(f"📄 Full semantic report saved to: {output_file}")
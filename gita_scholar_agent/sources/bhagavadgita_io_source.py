@@ -13,6 +13,7 @@ class BhagavadGitaIOSource:
     def __init__(self, config: Dict):
         self.name = "BhagavadGita.io API"
         self.base_url = "https://bhagavadgita.io/api/v1"
+        self.http = requests
         self.client_id = config.get('bhagavadgita_io_client_id')
         self.client_secret = config.get('bhagavadgita_io_client_secret')
         self.access_token = None
@@ -26,7 +27,7 @@ class BhagavadGitaIOSource:
         """Authenticate with OAuth2 to get access token."""
         try:
             auth_url = f"{self.base_url}/auth/oauth/token"
-            response = requests.post(
+            response = self.http.post(
                 auth_url,
                 data={
                     'client_id': self.client_id,
@@ -68,7 +69,7 @@ class BhagavadGitaIOSource:
         """
         try:
             url = f"{self.base_url}/chapters/{chapter_num}/verses/{verse_num}"
-            response = requests.get(url, headers=self._get_headers(), timeout=10)
+            response = self.http.get(url, headers=self._get_headers(), timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -98,7 +99,7 @@ class BhagavadGitaIOSource:
         """
         try:
             url = f"{self.base_url}/chapters/{chapter_num}"
-            response = requests.get(url, headers=self._get_headers(), timeout=10)
+            response = self.http.get(url, headers=self._get_headers(), timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
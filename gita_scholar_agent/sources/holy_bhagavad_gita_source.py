@@ -13,6 +13,7 @@ class HolyBhagavadGitaSource:
     def __init__(self):
         self.name = "Holy-Bhagavad-Gita.org (Mukundananda)"
         self.base_url = "https://www.holy-bhagavad-gita.org"
+        self.http = requests
 
     async def fetch_verse(self, chapter_num: int, verse_num: int) -> Optional[Dict]:
         """
@@ -29,7 +30,7 @@ class HolyBhagavadGitaSource:
             # URL structure: /chapter/{chapter}/verse/{verse}
             url = f"{self.base_url}/chapter/{chapter_num}/verse/{verse_num}"
 
-            response = requests.get(url, timeout=15)
+            response = self.http.get(url, timeout=15)
             if response.status_code != 200:
                 return None
 
@@ -93,7 +94,7 @@ class HolyBhagavadGitaSource:
         try:
             url = f"{self.base_url}/chapter/{chapter_num}/"
 
-            response = requests.get(url, timeout=15)
+            response = self.http.get(url, timeout=15)
             if response.status_code != 200:
                 return None
 
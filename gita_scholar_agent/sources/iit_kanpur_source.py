@@ -14,6 +14,7 @@ class IITKanpurSource:
     def __init__(self):
         self.name = "IIT Kanpur Gita Supersite"
         self.base_url = "https://www.gitasupersite.iitk.ac.in"
+        self.http = requests
 
     async def fetch_verse(self, chapter_num: int, verse_num: int) -> Optional[Dict]:
         """
@@ -30,7 +31,7 @@ class IITKanpurSource:
             # IIT Kanpur URL structure: /srimad?language=dv&field_chapter_value={chapter}&field_nsutra_value={verse}
             url = f"{self.base_url}/srimad?language=dv&field_chapter_value={chapter_num}&field_nsutra_value={verse_num}"
 
-            response = requests.get(url, timeout=15)
+            response = self.http.get(url, timeout=15)
             if response.status_code != 200:
                 return None
 
@@ -47,7 +48,7 @@ class IITKanpurSource:
             roman_link = soup.find('a', string='Roman')
             if roman_link:
                 roman_url = self.base_url + roman_link['href']
-                roman_response = requests.get(roman_url, timeout=10)
+                roman_response = self.http.get(roman_url, timeout=10)
                 if roman_response.status_code == 200:
                     roman_soup = BeautifulSoup(roman_response.content, 'html.parser')
                     roman_content = roman_soup.find('div', class_='field-item')
@@ -79,7 +80,7 @@ class IITKanpurSource:
         try:
             url = f"{self.base_url}/srimad?language=dv&field_chapter_value={chapter_num}"
 
-            response = requests.get(url, timeout=15)
+            response = self.http.get(url, timeout=15)
             if response.status_code != 200:
                 return None
 
@@ -13,6 +13,7 @@ class VedabaseSource:
     def __init__(self):
         self.name = "ISKCON Vedabase (Prabhupada)"
         self.base_url = "https://vedabase.io/en/library/bg"
+        self.http = requests
 
     async def fetch_verse(self, chapter_num: int, verse_num: int) -> Optional[Dict]:
         """
@@ -29,7 +30,7 @@ class VedabaseSource:
             # Vedabase URL structure: /bg/{chapter}/{verse}
             url = f"{self.base_url}/{chapter_num}/{verse_num}"
 
-            response = requests.get(url, timeout=15)
+            response = self.http.get(url, timeout=15)
             if response.status_code != 200:
                 return None
 
@@ -93,7 +94,7 @@ class VedabaseSource:
         try:
             url = f"{self.base_url}/{chapter_num}"
 
-            response = requests.get(url, timeout=15)
+            response = self.http.get(url, timeout=15)
             if response.status_code != 200:
                 return None
 
@@ -0,0 +1,286 @@
+"""
+Batch Character Scanner - Scans whole text columns for dangerous characters in one pass
+"""
+
+import re
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from validators.special_char_validator import SpecialCharValidator
+
+# Planes that can hold combining marks, spaces or controls: BMP through plane 3
+# and the supplementary special-purpose plane (variation selectors). Planes 4-13
+# are unassigned and 15-16 are private use, so they are not scanned.
+_SCANNED_RANGES = ((0, 0x40000), (0xE0000, 0xE1000))
+
+
+def _category_classes(*categories: str) -> Dict[str, str]:
+    """Regex character class (without brackets) for each Unicode general category."""
+    ranges: Dict[str, List[str]] = {category: [] for category in categories}
+    for low, high in _SCANNED_RANGES:
+        high = min(high, sys.maxunicode + 1)
+        current, start = None, low
+        for code in range(low, high + 1):
+            category = unicodedata.category(chr(code)) if code < high else None
+            if category != current:
+                if current in ranges:
+                    end = code - 1
+                    ranges[current].append(re.escape(chr(start)) if start == end
+                                           else f'{re.escape(chr(start))}-{re.escape(chr(end))}')
+                current, start = category, code
+    return {category: ''.join(parts) for category, parts in ranges.items()}
+
+
+_CLASSES = _category_classes('Mn', 'Zs', 'Cc')
+# Nonspacing marks, and the characters after which a mark counts as standalone
+MN_CLASS = _CLASSES['Mn']
+STANDALONE_BEFORE_CLASS = _CLASSES['Zs'] + _CLASSES['Cc']
+# No nonspacing mark lies below U+0300; a cheap range test in front of the large
+# Mn class lets ASCII and Latin-1 text skip it
+MN_FIRST = '\u0300'
+
+
+class BatchCharScanner:
+    """
+    Scans many texts at once by joining them into a single buffer.
+
+    Texts are joined with a sentinel separator and scanned with two plain
+    regex passes: one character class for the dangerous characters, smart
+    quotes and backslashes, and one for standalone combining marks. Match
+    offsets are mapped back to (row, field, position) through a prefix-sum
+    offset array, and results are kept columnar instead of as one dict per
+    issue.
+    """
+
+    # Record separator, also put in front of the first text: a control character
+    # (category Cc) so that a combining mark at the start of a text still counts
+    # as standalone, and never part of any pattern below.
+    SENTINEL = '\x1e'
+
+    def __init__(self, validator: Optional[SpecialCharValidator] = None):
+        self.validator = validator or SpecialCharValidator()
+
+        single_chars = {}
+        multi_chars = {}
+        for char, char_type in self.validator.DANGEROUS_CHARS.items():
+            target = single_chars if len(char) == 1 else multi_chars
+            target[char] = (char_type, 'critical')
+        for char, char_type in self.validator.SMART_QUOTES.items():
+            single_chars[char] = (char_type, 'warning')
+
+        # Kind table: index -> (char, type, severity). Kinds are ordered the
+        # way validate_text() reports them so per-row issue lists come out in
+        # the same order.
+        ordered_chars = list(self.validator.DANGEROUS_CHARS) + list(self.validator.SMART_QUOTES)
+        self.kinds = [
+            (char, *(single_chars.get(char) or multi_chars[char]))
+            for char in ordered_chars
+        ]
+        self.kinds.append((None, 'standalone_combining_mark', 'warning'))
+        self.kinds.append(('\\', 'unescaped_backslash', 'warning'))
+        self._kind_index = {char: idx for idx, (char, _, _) in enumerate(self.kinds)}
+        self._mn_kind = len(self.kinds) - 2
+        self._backslash_kind = len(self.kinds) - 1
+
+        # Multi-character sequences are found from their first character, so
+        # overlapping occurrences are all reported (as validate_text() does)
+        self._single_kinds = {char: self._kind_index[char] for char in single_chars}
+        self._multi_by_first: Dict[str, List[Tuple[str, int]]] = {}
+        for char in multi_chars:
+            self._multi_by_first.setdefault(char[0], []).append((char, self._kind_index[char]))
+        first_chars = set(single_chars) | set(self._multi_by_first) | {'\\'}
+        self._char_pattern = re.compile(f"[{''.join(re.escape(char) for char in sorted(first_chars))}]")
+        self._mark_pattern = re.compile(f'[{STANDALONE_BEFORE_CLASS}](?=[{MN_FIRST}-\U000E0FFF])[{MN_CLASS}]')
+
+    def scan_column(self, texts: Sequence[Optional[str]]) -> Dict:
+        """
+        Scan a single column of texts.
+
+        Args:
+            texts: Texts to scan (None/empty entries are skipped)
+
+        Returns:
+            Columnar results (see scan_rows)
+        """
+        return self.scan_rows([(text,) for text in texts], ['text'])
+
+    def scan_rows(self, rows: Sequence[Sequence[Optional[str]]], fields: List[str]) -> Dict:
+        """
+        Scan several fields of many rows in a single pass.
+
+        Args:
+            rows: One sequence of field values per row, aligned with fields
+            fields: Field names
+
+        Returns:
+            Dictionary of parallel columns:
+            - row / field / position: array('l') of row index, field index
+              and character offset within that field
+            - kind: array('l') of indices into 'kinds'
+            - code: array('l') of the code point found at each position
+            - kinds: list of (char, type, severity) tuples
+            - fields: the field names
+            - row_count: number of rows scanned
+        """
+        parts = []
+        starts = array('l')
+        cells = []
+        offset = 1
+        sentinel = self.SENTINEL
+
+        for row_idx, row in enumerate(rows):
+            for field_idx, value in enumerate(row):
+                if not value:
+                    continue
+                if sentinel in value:
+                    raise ValueError(f"Row {row_idx} field {fields[field_idx]} contains the scan sentinel")
+                parts.append(value)
+                starts.append(offset)
+                cells.append((row_idx, field_idx))
+                offset += len(value) + 1
+
+        result = {
+            'row': array('l'),
+            'field': array('l'),
+            'position': array('l'),
+            'kind': array('l'),
+            'code': array('l'),
+            'kinds': self.kinds,
+            'fields': list(fields),
+            'row_count': len(rows),
+        }
+        if not parts:
+            return result
+        buffer = sentinel + sentinel.join(parts)
+
+        def add(pos: int, kind: int):
+            cell = bisect_right(starts, pos) - 1
+            row_idx, field_idx = cells[cell]
+            result['row'].append(row_idx)
+            result['field'].append(field_idx)
+            result['position'].append(pos - starts[cell])
+            result['kind'].append(kind)
+            result['code'].append(ord(buffer[pos]))
+
+        single_kinds = self._single_kinds
+        multi_by_first = self._multi_by_first
+        for match in self._char_pattern.finditer(buffer):
+            pos = match.start()
+            char = match.group()
+            if char == '\\':
+                # Only the first backslash of a run is unescaped
+                if buffer[pos - 1] != '\\':
+                    add(pos, self._backslash_kind)
+                continue
+            if char in single_kinds:
+                add(pos, single_kinds[char])
+            for sequence, kind in multi_by_first.get(char, ()):
+                if buffer.startswith(sequence, pos):
+                    add(pos, kind)
+
+        for match in self._mark_pattern.finditer(buffer):
+            add(match.start() + 1, self._mn_kind)
+
+        return result
+
+    def scan_content(self, verses_data: List[Dict], chapters_data: List[Dict]) -> Dict:
+        """
+        Scan verse texts and chapter metadata for dangerous characters.
+
+        Args:
+            verses_data: Verse rows from Supabase
+            chapters_data: Chapter rows from Supabase
+
+        Returns:
+            Dictionary with verses_with_issues, chapters_with_issues,
+            total_dangerous_chars and char_types
+        """
+        results = {
+            'verses_with_issues': [],
+            'chapters_with_issues': [],
+            'total_dangerous_chars': 0,
+            'char_types': {}
+        }
+
+        # Scan verses (one pass over the whole column)
+        verse_scan = self.scan_column([verse['gv_verses'] for verse in verses_data])
+        for row_idx, issues in self.issues_by_row(verse_scan).items():
+            verse = verses_data[row_idx]
+            verse_key = f"{verse['gv_chapter_id']}.{verse['gv_verses_id']}"
+            results['verses_with_issues'].append({
+                'verse': verse_key,
+                'issues': issues
+            })
+            results['total_dangerous_chars'] += len(issues)
+        results['char_types'] = self.count_by_type(verse_scan)
+
+        # Scan chapters (all metadata fields in the same pass)
+        chapter_fields = ['ch_title', 'ch_subtitle', 'ch_summary', 'ch_theme']
+        chapter_scan = self.scan_rows(
+            [[chapter.get(field, '') for field in chapter_fields] for chapter in chapters_data],
+            chapter_fields
+        )
+        for row_idx, chapter_issues in self.issues_by_row(chapter_scan, with_field=True).items():
+            results['chapters_with_issues'].append({
+                'chapter_id': chapters_data[row_idx]['ch_chapter_id'],
+                'issues': chapter_issues
+            })
+            results['total_dangerous_chars'] += len(chapter_issues)
+
+        return results
+
+    def issues_by_row(self, scan: Dict, with_field: bool = False) -> Dict[int, List[Dict]]:
+        """
+        Expand columnar results into validate_text()-style issue dicts.
+
+        Args:
+            scan: Result of scan_rows / scan_column
+            with_field: Add the field name to every issue
+
+        Returns:
+            Mapping of row index -> list of issues, only for rows with
+            issues, in row order
+        """
+        grouped: Dict[int, List] = {}
+        for i in range(len(scan['row'])):
+            grouped.setdefault(scan['row'][i], []).append(i)
+
+        fields = scan['fields']
+        kinds = scan['kinds']
+        issues_by_row = {}
+        for row_idx, indices in sorted(grouped.items()):
+            # Fields in declared order, then validate_text() ordering
+            indices.sort(key=lambda i: (scan['field'][i], scan['kind'][i], scan['position'][i]))
+            issues = []
+            for i in indices:
+                char, char_type, severity = kinds[scan['kind'][i]]
+                if char is None:
+                    char = chr(scan['code'][i])
+                issue = {
+                    'char': char,
+                    'type': char_type,
+                    'position': scan['position'][i],
+                    'unicode_code': ' '.join(f'U+{ord(c):04X}' for c in char),
+                    'severity': severity
+                }
+                if with_field:
+                    issue['field'] = fields[scan['field'][i]]
+                issues.append(issue)
+            issues_by_row[row_idx] = issues
+        return issues_by_row
+
+    def count_by_type(self, scan: Dict) -> Dict[str, int]:
+        """Count issues per character type."""
+        counts = [0] * len(scan['kinds'])
+        for kind in scan['kind']:
+            counts[kind] += 1
+        # Several kinds can share a type (e.g. U+FFFE and U+FFFF are both invalid_unicode)
+        by_type: Dict[str, int] = {}
+        for kind, count in enumerate(counts):
+            if count:
+                name = scan['kinds'][kind][1]
+                by_type[name] = by_type.get(name, 0) + count
+        return by_type
@@ -0,0 +1,182 @@
+"""
+Phrase Matcher - Aho-Corasick automaton for finding many phrases in one pass
+"""
+
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_PHRASE_FILE = Path(__file__).parent / 'data' / 'phrase_dictionary.json'
+# Phrases exported by mine_template_phrases.py --export
+MINED_PHRASE_FILE = Path(__file__).parent.parent / 'output' / 'mined_phrases.json'
+
+
+class PhraseMatcher:
+    """
+    Case-insensitive multi-phrase matcher.
+
+    Phrases are grouped as category -> label -> [phrases]. The automaton is
+    built once; every call scans the text a single time regardless of how
+    many phrases the dictionary holds.
+    """
+
+    _default: Optional['PhraseMatcher'] = None
+
+    def __init__(self, dictionary: Dict[str, Dict[str, List[str]]]):
+        self.dictionary = dictionary
+        # Per phrase id: (category, label, phrase)
+        self.phrases: List[Tuple[str, str, str]] = []
+        self._lengths: List[int] = []
+
+        # Trie: goto transitions, failure links and output phrase ids per node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for category, labels in dictionary.items():
+            for label, phrases in labels.items():
+                for phrase in phrases:
+                    lowered = phrase.lower()
+                    self._add(lowered, len(self.phrases))
+                    self.phrases.append((category, label, phrase))
+                    self._lengths.append(len(lowered))
+
+        self._build_failure_links()
+
+        # Texts without any phrase (the usual case) are ruled out by one regex search
+        self._screen = None
+        if self.phrases:
+            self._screen = re.compile('|'.join(sorted({re.escape(phrase.lower()) for _, _, phrase in self.phrases})))
+
+    @classmethod
+    def from_file(cls, path) -> 'PhraseMatcher':
+        """
+        Load a phrase dictionary from a JSON file.
+
+        Args:
+            path: JSON file of {category: {label: [phrases]}}
+
+        Returns:
+            PhraseMatcher for the dictionary
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def default(cls) -> 'PhraseMatcher':
+        """
+        Shared matcher for the bundled phrase dictionary plus any mined
+        phrases exported to output/. Bundled labels win over mined ones.
+        """
+        if cls._default is None:
+            with open(DEFAULT_PHRASE_FILE, 'r', encoding='utf-8') as f:
+                dictionary = json.load(f)
+            if MINED_PHRASE_FILE.exists():
+                with open(MINED_PHRASE_FILE, 'r', encoding='utf-8') as f:
+                    for category, labels in json.load(f).items():
+                        entries = dictionary.setdefault(category, {})
+                        for label, phrases in labels.items():
+                            entries.setdefault(label, phrases)
+            cls._default = cls(dictionary)
+        return cls._default
+
+    def _add(self, phrase: str, phrase_id: int):
+        """Insert a phrase into the trie."""
+        node = 0
+        for char in phrase:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append(phrase_id)
+
+    def _build_failure_links(self):
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _lower(self, text: str) -> str:
+        """Lowercase text while keeping character offsets stable."""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        return ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Find every phrase occurrence.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of (start, end, phrase_id) in order of end position
+        """
+        if not text or self._screen is None:
+            return []
+
+        lowered = self._lower(text)
+        if not self._screen.search(lowered):
+            return []
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        lengths = self._lengths
+        matches = []
+        node = 0
+
+        for pos, char in enumerate(lowered):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for phrase_id in out[node]:
+                matches.append((pos + 1 - lengths[phrase_id], pos + 1, phrase_id))
+
+        return matches
+
+    def labels(self, text: str, category: Optional[str] = None) -> Set[str]:
+        """Labels with at least one phrase in the text, optionally for one category."""
+        return {
+            self.phrases[phrase_id][1]
+            for _, _, phrase_id in self.find_all(text)
+            if category is None or self.phrases[phrase_id][0] == category
+        }
+
+    def ordered_labels(self, text: str, category: str) -> List[str]:
+        """Matched labels of a category, in dictionary order."""
+        found = self.labels(text, category)
+        return [label for label in self.dictionary.get(category, {}) if label in found]
+
+    def spans(self, text: str, label: str) -> List[Tuple[int, int]]:
+        """Character spans of every occurrence of a label's phrases."""
+        return [
+            (start, end)
+            for start, end, phrase_id in self.find_all(text)
+            if self.phrases[phrase_id][1] == label
+        ]
+
+    def count_labels(self, texts: Iterable[str], category: Optional[str] = None) -> Dict[str, int]:
+        """Count, per label, how many texts contain it."""
+        counts: Dict[str, int] = {}
+        for text in texts:
+            if not isinstance(text, str):
+                continue
+            for label in self.labels(text, category):
+                counts[label] = counts.get(label, 0) + 1
+        return counts
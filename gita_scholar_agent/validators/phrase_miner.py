@@ -0,0 +1,219 @@
+"""
+Phrase Miner - Finds over-represented boilerplate phrases in action steps
+"""
+
+import heapq
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from validators.phrase_matcher import PhraseMatcher
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters summary (Metwally et al.).
+
+    Tracks at most `capacity` keys. Any key whose true count exceeds
+    total / capacity is guaranteed to be tracked, and every estimate
+    over-counts by at most its recorded error.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+        # Lazy min-heap of (count, key); stale entries are skipped on pop
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, key: str, weight: int = 1):
+        """Count one occurrence of a key."""
+        self.total += weight
+        counts = self.counts
+
+        if key in counts:
+            counts[key] += weight
+        elif len(counts) < self.capacity:
+            counts[key] = weight
+            self.errors[key] = 0
+        else:
+            # Evict the current minimum and inherit its count as error
+            while True:
+                count, victim = heapq.heappop(self._heap)
+                if counts.get(victim) == count:
+                    break
+            del counts[victim]
+            del self.errors[victim]
+            counts[key] = count + weight
+            self.errors[key] = count
+
+        heapq.heappush(self._heap, (counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, k) for k, count in counts.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """Tracked keys as (key, estimated count, max error), highest first."""
+        ranked = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+
+class TemplatePhraseMiner:
+    """Streams action steps and mines frequent word n-grams with bounded memory."""
+
+    WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+    def __init__(self, min_n: int = 3, max_n: int = 8, capacity: int = 20000):
+        self.min_n = min_n
+        self.max_n = max_n
+        # Total occurrences, and number of scenarios containing each n-gram
+        self.occurrences = SpaceSaving(capacity)
+        self.scenario_presence = SpaceSaving(capacity)
+        self.scenarios_seen = 0
+        self.steps_seen = 0
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercase word tokens of a step."""
+        return self.WORD_PATTERN.findall(text.lower())
+
+    def ngrams(self, tokens: List[str]) -> Iterable[str]:
+        """All word n-grams of the configured sizes."""
+        for n in range(self.min_n, min(self.max_n, len(tokens)) + 1):
+            for start in range(len(tokens) - n + 1):
+                yield ' '.join(tokens[start:start + n])
+
+    def add_scenario(self, action_steps: List):
+        """Count the n-grams of one scenario's action steps."""
+        self.scenarios_seen += 1
+        seen_in_scenario = set()
+
+        for step in action_steps or []:
+            if not isinstance(step, str):
+                continue
+            self.steps_seen += 1
+            for gram in self.ngrams(self.tokenize(step)):
+                self.occurrences.add(gram)
+                seen_in_scenario.add(gram)
+
+        for gram in seen_in_scenario:
+            self.scenario_presence.add(gram)
+
+    def threshold(self, min_scenarios: int = 5, min_share: float = 0.01) -> float:
+        """Minimum number of scenarios for a phrase to count as boilerplate."""
+        return max(min_scenarios, min_share * max(self.scenarios_seen, 1))
+
+    def candidates(self, min_scenarios: int = 5, min_share: float = 0.01,
+                   limit: int = 50) -> List[Dict]:
+        """
+        Phrases that appear in suspiciously many scenarios.
+
+        Shorter n-grams are dropped when a longer candidate containing them
+        covers at least 90% of their scenarios, so each template is reported
+        once at its longest form.
+
+        Args:
+            min_scenarios: Minimum (estimated) number of scenarios
+            min_share: Minimum share of all scenarios (0-1)
+            limit: Maximum number of phrases to return
+
+        Returns:
+            List of candidate dicts sorted by scenario count
+        """
+        threshold = self.threshold(min_scenarios, min_share)
+        occurrence_counts = self.occurrences.counts
+
+        selected = []
+        for phrase, scenarios, error in self.scenario_presence.top():
+            if scenarios < threshold:
+                break
+            selected.append({
+                'phrase': phrase,
+                'words': phrase.count(' ') + 1,
+                'scenario_count': scenarios,
+                'scenario_count_error': error,
+                'scenario_share': round(scenarios / max(self.scenarios_seen, 1), 4),
+                'occurrences': occurrence_counts.get(phrase, scenarios),
+            })
+
+        # Longest first so superstrings are kept before their substrings
+        selected.sort(key=lambda c: (-c['words'], -c['scenario_count'], c['phrase']))
+        kept: List[Dict] = []
+        for candidate in selected:
+            padded = f" {candidate['phrase']} "
+            subsumed = any(
+                padded in f" {longer['phrase']} " and longer['scenario_count'] >= 0.9 * candidate['scenario_count']
+                for longer in kept
+            )
+            if not subsumed:
+                kept.append(candidate)
+
+        kept.sort(key=lambda c: (-c['scenario_count'], -c['words'], c['phrase']))
+        return kept[:limit]
+
+    def count_per_scenario(self, candidates: List[Dict],
+                           scenarios: Iterable[Tuple[object, List]],
+                           min_scenarios: float = 0) -> List[Dict]:
+        """
+        Exact per-scenario occurrence counts for mined candidates.
+
+        Runs a second streaming pass with an Aho-Corasick matcher built from
+        the candidates only.
+
+        Args:
+            candidates: Output of candidates()
+            scenarios: Iterable of (scenario_id, action_steps)
+            min_scenarios: Drop candidates whose exact scenario count is lower
+                (estimates from the first pass can over-count)
+
+        Returns:
+            The candidates with exact 'scenario_count', 'occurrences' and a
+            'per_scenario' mapping of scenario_id -> occurrences
+        """
+        matcher = PhraseMatcher({'mined': {c['phrase']: [c['phrase']] for c in candidates}})
+        per_scenario: Dict[str, Dict] = {c['phrase']: {} for c in candidates}
+
+        for scenario_id, action_steps in scenarios:
+            for step in action_steps or []:
+                if not isinstance(step, str):
+                    continue
+                normalized = ' '.join(self.tokenize(step))
+                for _, _, phrase_id in self.find_word_matches(matcher, normalized):
+                    phrase = matcher.phrases[phrase_id][1]
+                    counts = per_scenario[phrase]
+                    counts[scenario_id] = counts.get(scenario_id, 0) + 1
+
+        results = []
+        for candidate in candidates:
+            counts = per_scenario[candidate['phrase']]
+            if len(counts) < min_scenarios:
+                continue
+            results.append({
+                **candidate,
+                'scenario_count': len(counts),
+                'scenario_count_error': 0,
+                'scenario_share': round(len(counts) / max(self.scenarios_seen, 1), 4),
+                'occurrences': sum(counts.values()),
+                'per_scenario': counts,
+            })
+        results.sort(key=lambda c: (-c['scenario_count'], -c['words'], c['phrase']))
+        return results
+
+    @staticmethod
+    def find_word_matches(matcher: PhraseMatcher, normalized: str) -> List[Tuple[int, int, int]]:
+        """Matches that start and end on word boundaries of a normalized step."""
+        return [
+            (start, end, phrase_id)
+            for start, end, phrase_id in matcher.find_all(normalized)
+            if (start == 0 or normalized[start - 1] == ' ')
+            and (end == len(normalized) or normalized[end] == ' ')
+        ]
+
+    @staticmethod
+    def to_dictionary_entries(candidates: List[Dict]) -> Dict[str, List[str]]:
+        """Candidates as {label: [phrase]} for the phrase dictionary."""
+        return {
+            re.sub(r'[^a-z0-9]+', '_', candidate['phrase']).strip('_'): [candidate['phrase']]
+            for candidate in candidates
+        }
@@ -0,0 +1,234 @@
+"""
+Scenario Rules - Declarative text checks for scenario fields, compiled once per rule
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+
+class ScenarioRuleEngine:
+    """
+    Evaluates all scenario text rules for a field scope with precompiled regexes.
+
+    Every rule is a plain dict:
+    - id: Unique rule id
+    - scope: Which kind of text the rule applies to
+        scenario_text   - one stripped line of a scenario text field
+        action_step     - one stripped sc_action_steps entry
+        redundancy_step - one raw action step (analyze_redundancy.py)
+        review_step     - one raw action step (review_action_steps.py)
+        generated_step  - one model-generated action step (ActionStepValidator)
+    - pattern: Regex with re.search semantics (use ^ to anchor at the start);
+      . also matches newlines, so .{0,19} counts every character
+    - contains: Optional substring the text must contain for the pattern to
+      match; checked first so most texts skip the regex
+    - severity: critical / high / medium / low
+    - issue_type: Reported issue type (defaults to id)
+    - content: How much of the text to quote - head, tail or full
+    - note: Optional note added to the issue
+
+    Plain phrase lookups (placeholders, template phrases) live in the phrase
+    dictionary used by PhraseMatcher instead.
+    """
+
+    RULES = [
+        # Scenario text fields (ScenarioQualityChecker.check_text_quality)
+        {
+            'id': 'incomplete_sentence_etc',
+            'scope': 'scenario_text',
+            'pattern': r'\betc\b[.]?$',
+            'contains': 'etc',
+            'severity': 'high',
+            'content': 'head',
+        },
+        {
+            'id': 'unclosed_parenthesis',
+            'scope': 'scenario_text',
+            'pattern': r'\(\Z',
+            'severity': 'high',
+            'content': 'tail',
+        },
+        {
+            'id': 'incomplete_sentence_ending',
+            'scope': 'scenario_text',
+            'pattern': r'[,]\s*$|(?i:\band\s*$)',
+            'severity': 'medium',
+            'content': 'tail',
+        },
+        {
+            # Under 15 chars, no terminal punctuation, not a numbered list item
+            'id': 'very_short_line',
+            'scope': 'scenario_text',
+            'pattern': r'^(?!\d+\.).{0,13}[^.:!?]\Z',
+            'severity': 'medium',
+            'content': 'full',
+        },
+
+        # Action steps (ScenarioQualityChecker.check_action_steps)
+        {
+            'id': 'very_short_action_step',
+            'scope': 'action_step',
+            'pattern': r'^.{0,9}\Z',
+            'severity': 'high',
+            'content': 'full',
+        },
+        {
+            'id': 'fragment_etc',
+            'scope': 'action_step',
+            'pattern': r'^etc[.]?\)?\s*$',
+            'severity': 'critical',
+            'issue_type': 'fragment_action_step',
+            'content': 'full',
+            'note': 'Likely a fragment from previous step',
+        },
+        {
+            'id': 'fragment_closing_paren',
+            'scope': 'action_step',
+            'pattern': r'^[a-z]+\)$',
+            'severity': 'critical',
+            'issue_type': 'fragment_action_step',
+            'content': 'full',
+            'note': 'Likely a fragment from previous step',
+        },
+        {
+            'id': 'fragment_single_word',
+            'scope': 'action_step',
+            'pattern': r'^[a-z]{3,10}$',
+            'severity': 'critical',
+            'issue_type': 'fragment_action_step',
+            'content': 'full',
+            'note': 'Likely a fragment from previous step',
+        },
+        {
+            'id': 'fragment_open_paren',
+            'scope': 'action_step',
+            'pattern': r'^\([a-z]+$',
+            'severity': 'critical',
+            'issue_type': 'fragment_action_step',
+            'content': 'full',
+            'note': 'Likely a fragment from previous step',
+        },
+        {
+            'id': 'incomplete_action_step',
+            'scope': 'action_step',
+            'pattern': r'\betc\b[.]?$',
+            'contains': 'etc',
+            'severity': 'high',
+            'content': 'full',
+        },
+
+        # Redundancy analysis (analyze_redundancy.analyze_action_steps)
+        {
+            'id': 'take_time_to',
+            'scope': 'redundancy_step',
+            'pattern': r'^Take time to',
+            'severity': 'medium',
+        },
+        {
+            'id': 'research_thoroughly',
+            'scope': 'redundancy_step',
+            'pattern': r'(?i:^(?=.*?research).*?thoroughly)',
+            'severity': 'medium',
+        },
+        {
+            'id': 'very_short_step',
+            'scope': 'redundancy_step',
+            'pattern': r'^.{0,19}\Z',
+            'severity': 'low',
+        },
+        {
+            'id': 'overly_complex_step',
+            'scope': 'redundancy_step',
+            'pattern': r'^.{201}|^(?:[^,]*,){5}',
+            'severity': 'low',
+        },
+
+        # AI review pre-filter (review_action_steps.detect_action_step_issues)
+        {
+            'id': 'generic_ensuring',
+            'scope': 'review_step',
+            'pattern': r'ensuring you understand the full context and implications',
+            'severity': 'medium',
+        },
+        {
+            'id': 'take_time',
+            'scope': 'review_step',
+            'pattern': r'Take time to',
+            'severity': 'medium',
+        },
+        {
+            'id': 'too_short',
+            'scope': 'review_step',
+            'pattern': r'^.{0,19}\Z',
+            'severity': 'low',
+        },
+        {
+            'id': 'run_on',
+            'scope': 'review_step',
+            'pattern': r'^(?:[^,]*,){4}',
+            'severity': 'low',
+        },
+
+        # Generated step checks (ActionStepValidator) - the prompts' "avoid" examples
+        {
+            'id': 'take_time_template',
+            'scope': 'generated_step',
+            'pattern': r'(?i:\btake time to\b)',
+            'severity': 'high',
+        },
+        {
+            'id': 'research_thoroughly_template',
+            'scope': 'generated_step',
+            'pattern': r'(?i:\bresearch\b.*?\bthoroughly\b)',
+            'severity': 'high',
+        },
+        {
+            'id': 'reflect_on_values_template',
+            'scope': 'generated_step',
+            'pattern': r'(?i:^reflect on your values\W*$)',
+            'severity': 'high',
+        },
+    ]
+
+    def __init__(self, rules: Optional[List[Dict]] = None):
+        self.rules = rules if rules is not None else self.RULES
+        # scope -> [(rule, required substring, compiled pattern)] in registry order
+        self._compiled: Dict[str, List[Tuple[Dict, str, Pattern]]] = {}
+
+        for rule in self.rules:
+            self._compiled.setdefault(rule['scope'], []).append(
+                (rule, rule.get('contains', ''), re.compile(rule['pattern'], re.DOTALL))
+            )
+
+    def evaluate(self, text: str, scope: str) -> List[Dict]:
+        """
+        Evaluate every rule of a scope against one piece of text.
+
+        Args:
+            text: Text to check (a line or an action step)
+            scope: Rule scope
+
+        Returns:
+            Matching rules in registry order
+        """
+        if scope not in self._compiled:
+            return []
+
+        return [
+            rule for rule, contains, pattern in self._compiled[scope]
+            if contains in text and pattern.search(text)
+        ]
+
+    def matched_ids(self, text: str, scope: str) -> List[str]:
+        """Ids of the rules of a scope that match the text."""
+        return [rule['id'] for rule in self.evaluate(text, scope)]
+
+    @staticmethod
+    def quote(rule: Dict, text: str) -> str:
+        """Excerpt of the text to report for a rule."""
+        content = rule.get('content', 'full')
+        if content == 'head':
+            return text[:100]
+        if content == 'tail':
+            return text[-50:]
+        return text
@@ -2,8 +2,9 @@
 Special Character Validator - Detects dangerous characters that could cause runtime errors
 """
 
+import re
 import unicodedata
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 
 class SpecialCharValidator:
@@ -33,8 +34,41 @@ class SpecialCharValidator:
         '\u201e': 'double_low_quote',  # „
     }
 
+    # Single-character replacements applied by sanitize_text()
+    SANITIZE_MAP = {
+        # Null bytes and invalid Unicode
+        '\x00': '',
+        '\ufffe': '',
+        '\uffff': '',
+        # BOM
+        '\ufeff': '',
+        # Zero-width spaces
+        '\u200b': '',
+        '\u200c': '',
+        '\u200d': '',
+        # Line/paragraph separators
+        '\u2028': '\n',
+        '\u2029': '\n\n',
+        # Smart quotes
+        '\u2018': "'",
+        '\u2019': "'",
+        '\u201c': '"',
+        '\u201d': '"',
+        '\u201a': "'",
+        '\u201e': '"',
+    }
+
+    _SANITIZE_TABLE = str.maketrans(SANITIZE_MAP)
+
+    # Characters removed outright; a double carriage return may be split by
+    # them and still collapses to a single newline once they are gone.
+    _REMOVED_CHARS = ''.join(re.escape(c) for c, r in SANITIZE_MAP.items() if not r)
+    _SANITIZE_PATTERN = re.compile(
+        f'\r[{_REMOVED_CHARS}]*\r|[{"".join(re.escape(c) for c in SANITIZE_MAP)}]'
+    )
+
     def __init__(self):
-        pass
+        self._char_types = {**self.DANGEROUS_CHARS, **self.SMART_QUOTES}
 
     def validate_text(self, text: str) -> List[Dict]:
         """
@@ -123,40 +157,91 @@ class SpecialCharValidator:
         if not text:
             return text
 
-        sanitized = text
+        sanitized = text.translate(self._SANITIZE_TABLE)
 
-        # Remove null bytes and invalid Unicode
-        sanitized = sanitized.replace('\x00', '')
-        sanitized = sanitized.replace('\ufffe', '')
-        sanitized = sanitized.replace('\uffff', '')
+        # Fix double carriage returns
+        if '\r\r' in sanitized:
+            sanitized = sanitized.replace('\r\r', '\n')
 
-        # Remove BOM
-        sanitized = sanitized.replace('\ufeff', '')
+        # Normalize Unicode (NFC normalization)
+        if not unicodedata.is_normalized('NFC', sanitized):
+            sanitized = unicodedata.normalize('NFC', sanitized)
 
-        # Remove zero-width spaces
-        sanitized = sanitized.replace('\u200b', '')
-        sanitized = sanitized.replace('\u200c', '')
-        sanitized = sanitized.replace('\u200d', '')
+        return sanitized
 
-        # Replace line/paragraph separators with standard newlines
-        sanitized = sanitized.replace('\u2028', '\n')
-        sanitized = sanitized.replace('\u2029', '\n\n')
+    def sanitize_with_edits(self, text: str) -> Tuple[str, List[Tuple[int, int, Optional[str], str]]]:
+        """
+        Sanitize text and report exactly what changed.
 
-        # Fix double carriage returns
-        sanitized = sanitized.replace('\r\r', '\n')
+        Produces the same output as sanitize_text() in a single scan.
 
-        # Replace smart quotes with standard ASCII quotes
-        sanitized = sanitized.replace('\u2018', "'")  # '
-        sanitized = sanitized.replace('\u2019', "'")  # '
-        sanitized = sanitized.replace('\u201c', '"')  # "
-        sanitized = sanitized.replace('\u201d', '"')  # "
-        sanitized = sanitized.replace('\u201a', "'")  # ‚
-        sanitized = sanitized.replace('\u201e', '"')  # „
+        Args:
+            text: Text to sanitize
 
-        # Normalize Unicode (NFC normalization)
-        sanitized = unicodedata.normalize('NFC', sanitized)
+        Returns:
+            Tuple of (sanitized text, edits). Each edit is
+            (start, end, replacement, type) in original-text offsets. A final
+            (0, len(text), None, 'nfc_normalization') edit is added when the
+            result also needed NFC normalization.
+        """
+        if not text:
+            return text, []
+
+        edits = []
+        parts = []
+        last = 0
+        for match in self._SANITIZE_PATTERN.finditer(text):
+            start, end = match.span()
+            matched = match.group()
+            if len(matched) == 1:
+                replacement = self.SANITIZE_MAP[matched]
+                char_type = self._char_types[matched]
+            else:
+                replacement = '\n'
+                char_type = self.DANGEROUS_CHARS['\r\r']
+            parts.append(text[last:start])
+            parts.append(replacement)
+            edits.append((start, end, replacement, char_type))
+            last = end
+
+        sanitized = ''.join(parts) + text[last:] if edits else text
+
+        if not unicodedata.is_normalized('NFC', sanitized):
+            sanitized = unicodedata.normalize('NFC', sanitized)
+            edits.append((0, len(text), None, 'nfc_normalization'))
+
+        return sanitized, edits
+
+    def get_row_fix(self, table: str, field: str, key: Dict, text: str) -> Optional[Dict]:
+        """
+        Build a targeted fix for one row from a single sanitization pass.
 
-        return sanitized
+        Args:
+            table: Table name
+            field: Field name
+            key: Column -> value identifying the row
+            text: Current field value
+
+        Returns:
+            Dictionary with the sanitized value, edits, fix types and a REST
+            (PostgREST) patch payload, or None if nothing changes. The
+            sanitized value feeds reporters.sql_emitter.BatchedUpdateWriter
+            for the SQL form of the fix.
+        """
+        sanitized, edits = self.sanitize_with_edits(text)
+        if not edits:
+            return None
+
+        return {
+            'sanitized': sanitized,
+            'edits': edits,
+            'fix_types': sorted(set(edit[3] for edit in edits)),
+            'rest': {
+                'table': table,
+                'filter': {column: f'eq.{value}' for column, value in key.items()},
+                'body': {field: sanitized}
+            }
+        }
 
     def get_sanitization_sql(self, table: str, field: str, issues: List[Dict]) -> str:
         """
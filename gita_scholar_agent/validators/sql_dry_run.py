@@ -0,0 +1,364 @@
+"""
+SQL Dry Run - Executes a generated SQL script against table snapshots and rolls it back
+"""
+
+import re
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import Json, execute_values
+
+from reporters.stream_writer import NDJSONWriter
+from validators.sql_validator import split_statements
+
+# Statements the dry run skips: it owns the transaction itself
+TRANSACTION_CONTROL = {'BEGIN', 'START', 'COMMIT', 'END', 'ROLLBACK', 'ABORT'}
+DATA_CHANGES = {'UPDATE', 'DELETE', 'INSERT'}
+
+DEFAULT_SLOW_MS = 100.0
+
+_UUID = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+_TIMESTAMP = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?([+-]\d{2}(:?\d{2})?|Z)?$')
+
+
+def changed_tables(lines: Iterable[str]) -> List[str]:
+    """Tables a script updates, deletes from or inserts into, in first-seen order."""
+    tables = {}
+    for statement in split_statements(lines):
+        if statement.table:
+            tables.setdefault(statement.table, None)
+    return list(tables)
+
+
+def infer_column_types(rows: List[Dict]) -> Dict[str, str]:
+    """
+    Postgres column types for snapshot rows (as returned by the REST API).
+
+    A column gets the narrowest type that fits every non-null value:
+    bigint, double precision, boolean, uuid, timestamptz, text[], jsonb
+    or text. Columns that are always null become text.
+    """
+    columns: Dict[str, Set[str]] = {}
+    for row in rows:
+        for column, value in row.items():
+            kinds = columns.setdefault(column, set())
+            if value is not None:
+                kinds.add(_value_type(value))
+
+    types = {}
+    for column, kinds in columns.items():
+        if kinds <= {'bigint'}:
+            types[column] = 'bigint' if kinds else 'text'
+        elif kinds <= {'bigint', 'double precision'}:
+            types[column] = 'double precision'
+        elif len(kinds) == 1 and kinds <= {'boolean', 'uuid', 'timestamptz', 'text[]', 'jsonb'}:
+            types[column] = next(iter(kinds))
+        elif kinds <= {'text', 'uuid', 'timestamptz'}:
+            types[column] = 'text'
+        else:
+            types[column] = 'jsonb'
+    return types
+
+
+def _value_type(value) -> str:
+    """Postgres type of one JSON value."""
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'bigint'
+    if isinstance(value, float):
+        return 'double precision'
+    if isinstance(value, str):
+        if _UUID.match(value):
+            return 'uuid'
+        if _TIMESTAMP.match(value):
+            return 'timestamptz'
+        return 'text'
+    if isinstance(value, list) and all(isinstance(item, str) or item is None for item in value):
+        return 'text[]'
+    return 'jsonb'
+
+
+class EphemeralPostgres:
+    """
+    Throwaway Postgres cluster in a temporary directory.
+
+    The server listens on a Unix socket only, runs with fsync off and is
+    deleted on exit. Postgres binaries are looked up in `bin_dir`, then via
+    pg_config, then on PATH.
+
+    Usage:
+        with EphemeralPostgres() as dsn:
+            conn = psycopg2.connect(dsn)
+    """
+
+    def __init__(self, bin_dir: Optional[str] = None):
+        self.bin_dir = Path(bin_dir) if bin_dir else self._find_bin_dir()
+        self.root: Optional[Path] = None
+
+    @staticmethod
+    def _find_bin_dir() -> Path:
+        pg_config = shutil.which('pg_config')
+        if pg_config:
+            output = subprocess.run([pg_config, '--bindir'], capture_output=True, text=True)
+            if output.returncode == 0 and (Path(output.stdout.strip()) / 'initdb').exists():
+                return Path(output.stdout.strip())
+        initdb = shutil.which('initdb')
+        if initdb:
+            return Path(initdb).parent
+        raise RuntimeError('Postgres binaries (initdb, pg_ctl) not found; pass --pg-bin or --dsn')
+
+    def start(self) -> str:
+        """Create and start the cluster; returns its DSN."""
+        self.root = Path(tempfile.mkdtemp(prefix='dry_run_pg_'))
+        data_dir = self.root / 'data'
+
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+
+        self._run('initdb', '-D', str(data_dir), '-U', 'postgres', '-A', 'trust', '-E', 'UTF8', '--no-sync')
+        self._run('pg_ctl', '-D', str(data_dir), '-l', str(self.root / 'postgres.log'), '-w', 'start',
+                  '-o', f"-p {port} -k {self.root} -c listen_addresses='' -c fsync=off")
+        return f'host={self.root} port={port} user=postgres dbname=postgres'
+
+    def stop(self):
+        """Stop the server and delete the cluster."""
+        if self.root is None:
+            return
+        subprocess.run([str(self.bin_dir / 'pg_ctl'), '-D', str(self.root / 'data'), '-m', 'immediate', 'stop'],
+                       capture_output=True)
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.root = None
+
+    def _run(self, program: str, *args: str):
+        result = subprocess.run([str(self.bin_dir / program), *args], capture_output=True, text=True)
+        if result.returncode != 0:
+            self.stop()
+            raise RuntimeError(f'{program} failed: {(result.stderr or result.stdout).strip()}')
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class SQLDryRun:
+    """
+    Runs a SQL script inside one transaction that is always rolled back.
+
+    Each target table is loaded from its snapshot into a TEMP table of the
+    same name, which shadows any real table for unqualified names. Every
+    statement runs under a savepoint so a failing statement is recorded
+    and the rest of the script still runs. Transaction control statements
+    in the script (BEGIN/COMMIT) are skipped.
+    """
+
+    def __init__(self, dsn: str, snapshots: Dict[str, List[Dict]], key: str = 'id',
+                 slow_ms: float = DEFAULT_SLOW_MS):
+        """
+        Args:
+            dsn: libpq connection string
+            snapshots: Table name -> rows (list of column dicts)
+            key: Column identifying rows in the before/after diff
+            slow_ms: Statements at least this slow are flagged
+        """
+        self.dsn = dsn
+        self.snapshots = snapshots
+        self.key = key
+        self.slow_ms = slow_ms
+
+    def run(self, sql_path: Union[str, Path], changes_path: Optional[Path] = None) -> Dict:
+        """
+        Execute the script and roll it back.
+
+        Args:
+            sql_path: Script to run
+            changes_path: Optional NDJSON file for every changed column,
+                keyed by table:key
+
+        Returns:
+            {'statements', 'summary', 'tables'} - per-statement results,
+            totals and per-table diff summaries
+        """
+        conn = psycopg2.connect(self.dsn)
+        try:
+            with conn.cursor() as cur:
+                before = {}
+                for table, rows in self.snapshots.items():
+                    self._load_table(cur, table, rows)
+                    before[table] = self._table_rows(cur, table)
+
+                with open(sql_path, 'r', encoding='utf-8') as f:
+                    statements = [self._execute(cur, number, statement)
+                                  for number, statement in enumerate(split_statements(f), 1)]
+
+                writer = NDJSONWriter(changes_path) if changes_path else None
+                try:
+                    tables = {
+                        table: self._diff_table(table, before[table], self._table_rows(cur, table), writer)
+                        for table in self.snapshots
+                    }
+                finally:
+                    if writer:
+                        writer.close()
+        finally:
+            conn.rollback()
+            conn.close()
+
+        executed = [s for s in statements if s['status'] != 'skipped']
+        return {
+            'statements': statements,
+            'summary': {
+                'statements': len(statements),
+                'executed': len(executed),
+                'failed': sum(1 for s in executed if s['status'] == 'error'),
+                'zero_rows': sum(1 for s in executed if 'zero_rows' in s['flags']),
+                'partial_match': sum(1 for s in executed if 'partial_match' in s['flags']),
+                'slow': sum(1 for s in executed if 'slow' in s['flags']),
+                'rows_affected': sum(s['rows'] or 0 for s in executed),
+                'total_ms': round(sum(s['ms'] for s in executed), 3)
+            },
+            'tables': tables
+        }
+
+    def _load_table(self, cur, table: str, rows: List[Dict]):
+        """Create a TEMP copy of a table from its snapshot."""
+        types = infer_column_types(rows)
+        if not types:
+            raise ValueError(f"Snapshot for '{table}' is empty")
+
+        name = sql.Identifier(table.split('.')[-1])
+        cur.execute(sql.SQL('CREATE TEMP TABLE {} ({})').format(
+            name,
+            sql.SQL(', ').join(
+                sql.SQL('{} {}').format(sql.Identifier(column), sql.SQL(sql_type))
+                for column, sql_type in types.items()
+            )
+        ))
+
+        columns = list(types)
+        wrap = [Json if types[column] == 'jsonb' else None for column in columns]
+        values = [
+            tuple(w(row.get(column)) if w and row.get(column) is not None else row.get(column)
+                  for column, w in zip(columns, wrap))
+            for row in rows
+        ]
+        execute_values(cur, sql.SQL('INSERT INTO {} ({}) VALUES %s').format(
+            name, sql.SQL(', ').join(map(sql.Identifier, columns))
+        ).as_string(cur), values, page_size=500)
+
+        if self.key in types:
+            cur.execute(sql.SQL('CREATE INDEX ON {} ({})').format(name, sql.Identifier(self.key)))
+        cur.execute(sql.SQL('ANALYZE {}').format(name))
+
+    def _table_rows(self, cur, table: str) -> Dict[str, Dict]:
+        """Current rows of a loaded table by key, as JSON-compatible dicts."""
+        cur.execute(sql.SQL('SELECT row_to_json(t) FROM {} AS t').format(sql.Identifier(table.split('.')[-1])))
+        rows = {}
+        for number, (row,) in enumerate(cur.fetchall()):
+            rows[str(row.get(self.key, f'#{number}'))] = row
+        return rows
+
+    def _execute(self, cur, number: int, statement) -> Dict:
+        """Run one statement under a savepoint and record the outcome."""
+        result = {
+            'number': number,
+            'line': statement.line,
+            'keyword': statement.keyword,
+            'table': statement.table,
+            'status': 'ok',
+            'rows': None,
+            'values_rows': statement.values_rows,
+            'ms': 0.0,
+            'flags': [],
+            'sql': ' '.join(statement.text.split())[:120]
+        }
+        if statement.keyword in TRANSACTION_CONTROL:
+            result['status'] = 'skipped'
+            return result
+
+        cur.execute('SAVEPOINT dry_run_statement')
+        started = time.perf_counter()
+        try:
+            cur.execute(statement.text)
+        except psycopg2.Error as e:
+            result['ms'] = round((time.perf_counter() - started) * 1000, 3)
+            cur.execute('ROLLBACK TO SAVEPOINT dry_run_statement')
+            result['status'] = 'error'
+            result['error'] = (e.diag.message_primary or str(e)).strip()
+            result['error_line'], result['error_column'] = self._error_position(statement, e)
+            return result
+
+        result['ms'] = round((time.perf_counter() - started) * 1000, 3)
+        result['rows'] = cur.rowcount if cur.rowcount >= 0 else None
+        cur.execute('RELEASE SAVEPOINT dry_run_statement')
+
+        if statement.keyword in DATA_CHANGES and result['rows'] == 0:
+            result['flags'].append('zero_rows')
+        elif (statement.keyword in DATA_CHANGES and result['rows'] is not None
+              and statement.values_rows and result['rows'] < statement.values_rows):
+            # Some keys of a batched UPDATE ... FROM (VALUES ...) matched no row
+            result['flags'].append('partial_match')
+        if result['ms'] >= self.slow_ms:
+            result['flags'].append('slow')
+        return result
+
+    @staticmethod
+    def _error_position(statement, error: psycopg2.Error):
+        """File line and column of a statement error (the statement start if unknown)."""
+        position = error.diag.statement_position
+        if not position:
+            return statement.line, statement.column
+        prefix = statement.text[:int(position) - 1]
+        newlines = prefix.count('\n')
+        if not newlines:
+            return statement.line, statement.column + len(prefix)
+        return statement.line + newlines, len(prefix) - prefix.rfind('\n')
+
+    def _diff_table(self, table: str, before: Dict[str, Dict], after: Dict[str, Dict],
+                    writer: Optional[NDJSONWriter]) -> Dict:
+        """Summarize row changes and stream each changed column."""
+        summary = {
+            'rows_before': len(before),
+            'rows_after': len(after),
+            'rows_changed': 0,
+            'rows_inserted': 0,
+            'rows_deleted': 0,
+            'columns_changed': {}
+        }
+
+        for key in before.keys() | after.keys():
+            old, new = before.get(key), after.get(key)
+            if old is None:
+                summary['rows_inserted'] += 1
+                changed = {column: (None, value) for column, value in new.items()}
+            elif new is None:
+                summary['rows_deleted'] += 1
+                changed = {column: (value, None) for column, value in old.items()}
+            else:
+                changed = {
+                    column: (old.get(column), value)
+                    for column, value in new.items()
+                    if old.get(column) != value
+                }
+                if not changed:
+                    continue
+                summary['rows_changed'] += 1
+                for column in changed:
+                    summary['columns_changed'][column] = summary['columns_changed'].get(column, 0) + 1
+
+            if writer:
+                for column, (old_value, new_value) in changed.items():
+                    writer.write({'table': table, 'key': key, 'column': column,
+                                  'before': old_value, 'after': new_value}, key=f'{table}:{key}')
+
+        return summary
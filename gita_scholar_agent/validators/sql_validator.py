@@ -0,0 +1,491 @@
+"""
+SQL Validator - Streaming lexer and structural checks for generated fix scripts
+"""
+
+import json
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Stop collecting issues after this many; the rest are only counted
+MAX_ISSUES = 200
+
+
+class Token(NamedTuple):
+    """
+    One lexical token. For string literals `text` is the decoded value;
+    line and column are 1-based and point at the first character.
+    """
+    kind: str
+    text: str
+    line: int
+    column: int
+
+
+_NORMAL = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<line_comment>--[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<estring>[eE]')
+  | (?P<string>')
+  | (?P<dollar>\$(?:[^\W\d]\w*)?\$)
+  | (?P<param>\$\d+)
+  | (?P<quoted_ident>")
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<word>[^\W\d][\w$]*)
+  | (?P<cast>::)
+  | (?P<punct>.)
+""", re.VERBOSE)
+
+# Bodies of quoted tokens, matched from the current position up to (not
+# including) the closing quote or the end of the line.
+_STRING_BODY = re.compile(r"(?:[^']|'')*")
+_ESTRING_BODY = re.compile(r"(?:[^'\\]|\\.|'')*", re.DOTALL)
+_IDENT_BODY = re.compile(r'(?:[^"]|"")*')
+_COMMENT_MARK = re.compile(r'/\*|\*/')
+
+_E_ESCAPES = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_E_ESCAPE = re.compile(r"\\(?:([0-7]{1,3})|x([0-9A-Fa-f]{1,2})|u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))|''",
+                       re.DOTALL)
+
+
+def _decode_escape_string(body: str) -> str:
+    """Value of an E'...' literal body."""
+    def replace(match):
+        if match.group(0) == "''":
+            return "'"
+        octal, hex_code, short_unicode, long_unicode, char = match.groups()
+        if octal:
+            return chr(int(octal, 8))
+        if hex_code or short_unicode or long_unicode:
+            return chr(int(hex_code or short_unicode or long_unicode, 16))
+        return _E_ESCAPES.get(char, char)
+    return _E_ESCAPE.sub(replace, body)
+
+
+class LexError(Exception):
+    """Unterminated token at end of input."""
+
+    def __init__(self, message: str, line: int, column: int):
+        super().__init__(message)
+        self.line = line
+        self.column = column
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """
+    Tokenize SQL one line at a time.
+
+    Understands standard '' strings (standard_conforming_strings = on),
+    E'' strings with backslash escapes, $tag$ dollar quotes, quoted
+    identifiers, -- comments and nested /* */ comments. Comments and
+    whitespace are dropped. Only the token being read spans lines, so
+    memory is bounded by the longest token, not the file.
+
+    Raises:
+        LexError: when input ends inside a string, identifier or comment
+    """
+    # State of a token that continues on the next line:
+    # (kind, start line, start column, collected parts, dollar tag / comment depth)
+    pending: Optional[Tuple[str, int, int, List[str], object]] = None
+
+    line_no = 0
+    for line_no, line in enumerate(lines, 1):
+        pos = 0
+        end = len(line)
+
+        while pos < end:
+            if pending is not None:
+                kind, start_line, start_col, parts, extra = pending
+
+                if kind == 'block_comment':
+                    depth = extra
+                    while depth:
+                        match = _COMMENT_MARK.search(line, pos)
+                        if not match:
+                            pos = end
+                            break
+                        depth += 1 if match.group(0) == '/*' else -1
+                        pos = match.end()
+                    if depth:
+                        pending = (kind, start_line, start_col, parts, depth)
+                    else:
+                        pending = None
+                    continue
+
+                if kind == 'dollar':
+                    close = line.find(extra, pos)
+                    if close < 0:
+                        parts.append(line[pos:])
+                        pos = end
+                        continue
+                    parts.append(line[pos:close])
+                    pos = close + len(extra)
+                    pending = None
+                    yield Token('string', ''.join(parts), start_line, start_col)
+                    continue
+
+                body = {'string': _STRING_BODY, 'estring': _ESTRING_BODY, 'quoted_ident': _IDENT_BODY}[kind]
+                quote = '"' if kind == 'quoted_ident' else "'"
+                match = body.match(line, pos)
+                parts.append(match.group(0))
+                pos = match.end()
+                if pos >= end or line[pos] != quote:
+                    # Continues on the next line (or ends in a lone backslash)
+                    parts.append(line[pos:])
+                    pos = end
+                    continue
+                pos += 1
+                pending = None
+                text = ''.join(parts)
+                if kind == 'quoted_ident':
+                    yield Token('ident', text.replace('""', '"'), start_line, start_col)
+                elif kind == 'estring':
+                    yield Token('string', _decode_escape_string(text), start_line, start_col)
+                else:
+                    yield Token('string', text.replace("''", "'"), start_line, start_col)
+                continue
+
+            match = _NORMAL.match(line, pos)
+            kind = match.lastgroup
+            column = pos + 1
+            pos = match.end()
+
+            if kind in ('space', 'line_comment'):
+                continue
+            if kind == 'block_comment':
+                pending = (kind, line_no, column, [], 1)
+            elif kind in ('string', 'estring', 'quoted_ident'):
+                pending = (kind, line_no, column, [], None)
+            elif kind == 'dollar':
+                pending = (kind, line_no, column, [], match.group(0))
+            elif kind == 'word':
+                yield Token('word', match.group(0), line_no, column)
+            else:
+                yield Token(kind, match.group(0), line_no, column)
+
+    if pending is not None:
+        kind, start_line, start_col, _, extra = pending
+        what = {
+            'block_comment': 'block comment',
+            'dollar': f'dollar-quoted string ({extra})',
+            'quoted_ident': 'quoted identifier'
+        }.get(kind, 'string literal')
+        raise LexError(f'Unterminated {what}', start_line, start_col)
+
+
+class Statement(NamedTuple):
+    """
+    One statement of a script, without its terminating ';'. `table` is the
+    target of UPDATE, DELETE FROM and INSERT INTO statements; `values_rows`
+    is the number of rows in its VALUES lists (None without one).
+    """
+    text: str
+    line: int
+    column: int
+    keyword: str
+    table: Optional[str]
+    values_rows: Optional[int] = None
+
+
+# Tokens after the keyword that come before the target table
+_TARGET_OFFSET = {'UPDATE': 1, 'DELETE': 2, 'INSERT': 2}
+
+
+def split_statements(lines: Iterable[str]) -> Iterator[Statement]:
+    """
+    Split a script into statements, reading one line at a time.
+
+    Statement text runs from the first token to the terminating ';', so
+    comments between statements are dropped while comments inside one are
+    kept. Only the lines of the current statement are buffered.
+
+    Raises:
+        LexError: when input ends inside a string, identifier or comment
+    """
+    buffer: List[str] = []
+    base = [1]  # line number of buffer[0]
+
+    def read():
+        for line in lines:
+            buffer.append(line)
+            yield line
+
+    start: Optional[Token] = None
+    head: List[Token] = []
+    # VALUES rows are the parenthesized tuples at the depth of the keyword
+    depth = 0
+    values_depth: Optional[int] = None
+    values_rows: Optional[int] = None
+    for token in tokenize(read()):
+        is_end = token.kind == 'punct' and token.text == ';'
+        if start is None:
+            if is_end:
+                continue
+            start = token
+            head = []
+            depth, values_depth, values_rows = 0, None, None
+        if not is_end:
+            if len(head) < 6:
+                head.append(token)
+            if token.kind == 'punct':
+                if token.text == '(':
+                    if depth == values_depth:
+                        values_rows += 1
+                    depth += 1
+                elif token.text == ')':
+                    depth -= 1
+                    if values_depth is not None and depth < values_depth:
+                        values_depth = None
+            elif token.kind == 'word' and values_depth is None and token.text.upper() == 'VALUES':
+                values_depth = depth
+                values_rows = values_rows or 0
+            continue
+
+        yield _statement(buffer, base[0], start, token.line, token.column - 1, head, values_rows)
+        del buffer[:token.line - base[0]]
+        base[0] = token.line
+        start = None
+
+    if start is not None:
+        yield _statement(buffer, base[0], start, base[0] + len(buffer) - 1, len(buffer[-1]), head, values_rows)
+
+
+def _statement(buffer: List[str], base: int, start: Token, end_line: int, end_column: int,
+               head: List[Token], values_rows: Optional[int] = None) -> Statement:
+    """Cut a statement out of the buffered lines and find its target table."""
+    first, last = start.line - base, end_line - base
+    if first == last:
+        text = buffer[first][start.column - 1:end_column]
+    else:
+        text = buffer[first][start.column - 1:] + ''.join(buffer[first + 1:last]) + buffer[last][:end_column]
+
+    keyword = start.text.upper() if start.kind == 'word' else ''
+    table = None
+    idx = _TARGET_OFFSET.get(keyword)
+    if idx is not None:
+        if idx < len(head) and head[idx].text.upper() == 'ONLY':
+            idx += 1
+        parts = []
+        while idx < len(head) and head[idx].kind in ('word', 'ident'):
+            # Unquoted names fold to lower case, as in Postgres
+            parts.append(head[idx].text.lower() if head[idx].kind == 'word' else head[idx].text)
+            if idx + 1 < len(head) and head[idx + 1].text == '.':
+                idx += 2
+            else:
+                break
+        table = '.'.join(parts) or None
+
+    return Statement(text.rstrip(), start.line, start.column, keyword, table, values_rows)
+
+
+class SQLValidator:
+    """
+    Validates the structure of a SQL script in one streaming pass.
+
+    Checks:
+    - every string, identifier and comment is terminated
+    - brackets and parentheses balance within each statement
+    - each statement ends with ';'
+    - BEGIN/COMMIT pair up and data changes run inside a transaction
+    - UPDATE has SET and a top-level WHERE; DELETE has a WHERE
+    - JSON literals ('...'::jsonb, CAST('...' AS jsonb), jsonb '...') parse
+
+    Issues are dicts with severity, line, column and message.
+    """
+
+    TRANSACTION_START = {'BEGIN', 'START'}
+    TRANSACTION_END = {'COMMIT', 'END', 'ROLLBACK'}
+    DATA_CHANGES = {'UPDATE', 'DELETE', 'INSERT'}
+    JSON_TYPES = {'json', 'jsonb'}
+
+    def __init__(self, max_issues: int = MAX_ISSUES):
+        self.max_issues = max_issues
+
+    def validate_file(self, filepath) -> Dict:
+        """Validate a SQL file without reading it into memory."""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return self.validate(f)
+
+    def validate(self, lines: Iterable[str]) -> Dict:
+        """
+        Validate SQL given as an iterable of lines.
+
+        Returns:
+            {'valid', 'errors', 'warnings', 'issues_suppressed', 'stats'}
+        """
+        self._issues = {'error': [], 'warning': []}
+        self._suppressed = 0
+        stats = {
+            'statements': 0,
+            'updates': 0,
+            'where_clauses': 0,
+            'arrays': 0,
+            'json_literals': 0,
+            'transactions': 0
+        }
+
+        transaction: Optional[Token] = None
+        statement: Optional[Dict] = None
+        recent = deque(maxlen=3)  # for JSON literal detection
+
+        try:
+            for token in tokenize(lines):
+                if token.kind == 'punct' and token.text == ';':
+                    if statement is not None:
+                        transaction = self._end_statement(statement, transaction, stats)
+                    statement = None
+                    recent.clear()
+                    continue
+
+                if statement is None:
+                    statement = {
+                        'start': token,
+                        'keyword': token.text.upper() if token.kind == 'word' else '',
+                        'second': None,
+                        'brackets': [],
+                        'has_set': False,
+                        'where': None,
+                        'in_transaction': transaction is not None
+                    }
+                elif statement['second'] is None and token.kind == 'word':
+                    statement['second'] = token.text.upper()
+
+                self._check_token(token, statement, recent, stats)
+                recent.append(token)
+        except LexError as e:
+            self._add('error', e.line, e.column, str(e))
+        else:
+            if statement is not None:
+                start = statement['start']
+                self._add('error', start.line, start.column,
+                          f"{statement['keyword'] or 'Statement'} is not terminated with ';'")
+            if transaction is not None:
+                self._add('error', transaction.line, transaction.column,
+                          'Transaction is never committed (missing COMMIT)')
+
+        errors = self._issues['error']
+        return {
+            'valid': not errors,
+            'errors': errors,
+            'warnings': self._issues['warning'],
+            'issues_suppressed': self._suppressed,
+            'stats': stats
+        }
+
+    def _check_token(self, token: Token, statement: Dict, recent: deque, stats: Dict):
+        """Bracket, clause and JSON literal checks for one token."""
+        brackets = statement['brackets']
+
+        if token.kind == 'punct':
+            if token.text in '([':
+                brackets.append(token)
+            elif token.text in ')]':
+                expected = '(' if token.text == ')' else '['
+                if not brackets:
+                    self._add('error', token.line, token.column, f"Unmatched '{token.text}'")
+                elif brackets[-1].text != expected:
+                    opener = brackets.pop()
+                    self._add('error', token.line, token.column,
+                              f"'{token.text}' closes '{opener.text}' opened at line {opener.line}, "
+                              f"column {opener.column}")
+                else:
+                    brackets.pop()
+            return
+
+        if token.kind == 'string':
+            # jsonb '...'
+            if recent and recent[-1].kind == 'word' and recent[-1].text.lower() in self.JSON_TYPES \
+                    and not (len(recent) > 1 and recent[-2].kind == 'cast'):
+                self._check_json(token, token, stats)
+            return
+
+        if token.kind != 'word':
+            return
+
+        word = token.text.upper()
+        if word == 'ARRAY':
+            stats['arrays'] += 1
+        elif token.text.lower() in self.JSON_TYPES and len(recent) >= 2:
+            # '...'::jsonb and CAST('...' AS jsonb)
+            marker, literal = recent[-1], recent[-2]
+            if literal.kind == 'string' and (marker.kind == 'cast' or marker.text.upper() == 'AS'):
+                self._check_json(literal, token, stats)
+        elif not brackets and statement['keyword'] in ('UPDATE', 'DELETE'):
+            if word == 'SET':
+                statement['has_set'] = True
+            elif word == 'WHERE' and statement['where'] is None:
+                statement['where'] = token
+
+    def _check_json(self, literal: Token, type_token: Token, stats: Dict):
+        """Parse a JSON literal and report errors at their position in the file."""
+        stats['json_literals'] += 1
+        try:
+            json.loads(literal.text)
+        except json.JSONDecodeError as e:
+            # Position of the error inside the file; the literal starts one
+            # character after its opening quote.
+            line = literal.line + e.lineno - 1
+            column = literal.column + e.colno if e.lineno == 1 else e.colno
+            self._add('error', line, column, f'Invalid {type_token.text.lower()} literal: {e.msg}')
+
+    def _end_statement(self, statement: Dict, transaction: Optional[Token], stats: Dict) -> Optional[Token]:
+        """Checks that need the whole statement; returns the open transaction."""
+        start = statement['start']
+        keyword = statement['keyword']
+        stats['statements'] += 1
+
+        for opener in statement['brackets']:
+            closer = ')' if opener.text == '(' else ']'
+            self._add('error', opener.line, opener.column, f"'{opener.text}' is never closed with '{closer}'")
+
+        if keyword in self.TRANSACTION_START:
+            if transaction is not None:
+                self._add('error', start.line, start.column,
+                          f'{keyword} inside the transaction started at line {transaction.line}')
+                return transaction
+            stats['transactions'] += 1
+            return start
+
+        if keyword in self.TRANSACTION_END and not (keyword == 'ROLLBACK' and statement['second'] == 'TO'):
+            if transaction is None:
+                self._add('error', start.line, start.column, f'{keyword} without a matching BEGIN')
+            elif keyword == 'ROLLBACK':
+                self._add('warning', start.line, start.column, 'Transaction is rolled back; no changes will be kept')
+            return None
+
+        if keyword in self.DATA_CHANGES and not statement['in_transaction']:
+            self._add('error', start.line, start.column, f'{keyword} runs outside BEGIN/COMMIT')
+
+        if keyword == 'UPDATE':
+            stats['updates'] += 1
+            if not statement['has_set']:
+                self._add('error', start.line, start.column, 'UPDATE has no SET clause')
+            if statement['where'] is None:
+                self._add('error', start.line, start.column, 'UPDATE has no WHERE clause and would change every row')
+            else:
+                stats['where_clauses'] += 1
+        elif keyword == 'DELETE' and statement['where'] is None:
+            self._add('error', start.line, start.column, 'DELETE has no WHERE clause and would remove every row')
+
+        return transaction
+
+    def _add(self, severity: str, line: int, column: int, message: str):
+        """Record an issue, up to max_issues in total."""
+        if len(self._issues['error']) + len(self._issues['warning']) >= self.max_issues:
+            self._suppressed += 1
+            return
+        self._issues[severity].append({
+            'severity': severity,
+            'line': line,
+            'column': column,
+            'message': message
+        })
+
+
+def format_issue(issue: Dict, filepath: Optional[str] = None) -> str:
+    """Render an issue as 'file:line:column: severity: message'."""
+    location = f"{issue['line']}:{issue['column']}"
+    if filepath:
+        location = f'{filepath}:{location}'
+    return f"{location}: {issue['severity']}: {issue['message']}"
@@ -0,0 +1,61 @@
+"""
+Step Validator - Checks model-generated action steps before they are accepted
+"""
+
+from typing import List, Optional
+
+from validators.phrase_matcher import PhraseMatcher
+from validators.scenario_rules import ScenarioRuleEngine
+
+
+class ActionStepValidator:
+    """
+    Validates one scenario's generated action steps.
+
+    Problems reported:
+    - wrong number of steps
+    - steps that are not strings, or shorter / longer than allowed
+    - repeated steps
+    - banned template phrases: 'generated_step' rules and the phrase
+      dictionary's redundant_template category
+    """
+
+    def __init__(self, min_steps: int = 5, max_steps: int = 5, min_chars: int = 50, max_chars: int = 150,
+                 rules: Optional[ScenarioRuleEngine] = None, phrases: Optional[PhraseMatcher] = None):
+        self.min_steps = min_steps
+        self.max_steps = max_steps
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.rules = rules or ScenarioRuleEngine()
+        self.phrases = phrases or PhraseMatcher.default()
+
+    def problems(self, steps) -> List[str]:
+        """Human-readable problems with a list of steps; empty when valid."""
+        if not isinstance(steps, list):
+            return [f'expected a JSON array of steps, got {type(steps).__name__}']
+
+        problems = []
+        if not self.min_steps <= len(steps) <= self.max_steps:
+            expected = (str(self.min_steps) if self.min_steps == self.max_steps
+                        else f'{self.min_steps}-{self.max_steps}')
+            problems.append(f'expected {expected} steps, got {len(steps)}')
+
+        seen = set()
+        for number, step in enumerate(steps, 1):
+            if not isinstance(step, str):
+                problems.append(f'step {number} is not a string')
+                continue
+            text = step.strip()
+            if not self.min_chars <= len(text) <= self.max_chars:
+                problems.append(f'step {number} has {len(text)} characters '
+                                f'(allowed {self.min_chars}-{self.max_chars})')
+            if text.lower() in seen:
+                problems.append(f'step {number} repeats an earlier step')
+            seen.add(text.lower())
+
+            banned = self.rules.matched_ids(text, 'generated_step')
+            banned += self.phrases.ordered_labels(text, 'redundant_template')
+            if banned:
+                problems.append(f"step {number} uses banned template phrasing ({', '.join(banned)})")
+
+        return problems